@@ -0,0 +1,133 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlmodel import select, update
+
+from Database.database import get_session, get_read_session
+from Models.comment_model import Comment
+from Schemas.comment_schemas import COMMENT_FIELDS, comment_payloads
+from Models.makepost_model import Post
+from Controllers.counter_controller import bump_counter, log_change
+from utils import post_cache
+from utils.event_hub import publish
+
+def _touch_post(post_id: int, comments_delta: int = 0):
+    """댓글 변경을 게시글 버전/카운터에 반영하는 UPDATE 문"""
+    return (
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            comments_count=Post.comments_count + comments_delta,
+            version=Post.version + 1,
+            updated_at=datetime.utcnow(),
+        )
+    )
+
+def list_comments_from_db(post_id: int) -> list:
+    """
+    Comments of one post, oldest first (ix_comments_post_id 인덱스 사용)
+    ORM 객체 대신 COMMENT_FIELDS 순서의 컬럼 튜플을 반환합니다 - comment_payloads() 로 바로 응답 dict 변환
+    """
+    with get_read_session() as session:
+        statement = (
+            select(*(getattr(Comment, name) for name in COMMENT_FIELDS))
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.id)
+        )
+        return session.exec(statement).all()
+
+DEFAULT_COMMENT_PAGE_SIZE = 20
+MAX_COMMENT_PAGE_SIZE = 100
+
+def encode_comment_cursor(comment_id: int) -> str:
+    """마지막으로 받은 댓글 id 를 불투명한 문자열로 (댓글은 id 순 = 작성 순)"""
+    return base64.urlsafe_b64encode(f"c{comment_id}".encode()).decode().rstrip("=")
+
+def decode_comment_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded).decode()
+        if not raw.startswith("c"):
+            raise ValueError(raw)
+        return int(raw[1:])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def list_comments_page_in_db(post_id: int, cursor: Optional[str] = None,
+                             limit: int = DEFAULT_COMMENT_PAGE_SIZE) -> Tuple[List[dict], Optional[str]]:
+    """
+    Keyset pagination over comments of one post, oldest first: WHERE post_id = ? AND id > cursor ORDER BY id.
+    Returns (comment payloads, next_cursor); next_cursor is None on the last page.
+    SQLite 의 ix_comments_post_id 는 (post_id, rowid) 순서라 id 정렬까지 인덱스 범위 스캔으로 끝납니다.
+    """
+    limit = max(1, min(limit, MAX_COMMENT_PAGE_SIZE))
+    with get_read_session() as session:
+        rows = session.exec(comment_page_statement(post_id, cursor, limit)).all()
+    return split_comment_page(rows, limit)
+
+def comment_page_statement(post_id: int, cursor: Optional[str], limit: int):
+    """다음 페이지 존재 여부를 알기 위해 한 행 더 조회 (다른 조회와 같은 세션에서 실행할 때도 사용)"""
+    statement = (
+        select(*(getattr(Comment, name) for name in COMMENT_FIELDS))
+        .where(Comment.post_id == post_id)
+        .order_by(Comment.id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        statement = statement.where(Comment.id > decode_comment_cursor(cursor))
+    return statement
+
+def split_comment_page(rows: list, limit: int) -> Tuple[List[dict], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_comment_cursor(rows[-1].id)
+    return comment_payloads(rows), next_cursor
+
+def add_comment_in_db(post_id: int, content: str) -> Comment:
+    """
+    댓글 INSERT 와 posts.comments_count 증가를 한 트랜잭션에서 처리합니다.
+    """
+    with get_session() as session:
+        result = session.exec(_touch_post(post_id, comments_delta=1))
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Post not found")
+        session.exec(bump_counter())
+        session.exec(log_change(post_id))
+        comment = Comment(post_id=post_id, content=content)
+        session.add(comment)
+        session.commit()
+        session.refresh(comment)
+    post_cache.invalidate(post_id)
+    publish("comment", {"post_id": post_id, "comment": comment.model_dump(mode="json")})
+    return comment
+
+def update_comment_in_db(comment_id: int, content: str) -> Comment:
+    with get_session() as session:
+        comment = session.get(Comment, comment_id)
+        if not comment:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        comment.content = content
+        comment.updated_at = datetime.utcnow()
+        session.add(comment)
+        session.exec(_touch_post(comment.post_id))
+        session.exec(log_change(comment.post_id))
+        session.commit()
+        session.refresh(comment)
+    post_cache.invalidate(comment.post_id)
+    return comment
+
+def delete_comment_in_db(comment_id: int):
+    with get_session() as session:
+        comment = session.get(Comment, comment_id)
+        if not comment:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        session.exec(_touch_post(comment.post_id, comments_delta=-1))
+        session.exec(bump_counter())
+        session.exec(log_change(comment.post_id))
+        post_id = comment.post_id
+        session.delete(comment)
+        session.commit()
+    post_cache.invalidate(post_id)
+    return {"message": "Comment deleted"}
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from sqlmodel import select, update, insert, delete, func
+
+from Database.database import get_session, get_read_session, get_async_read_session
+from Models.counter_model import Counter
+from Models.changelog_model import ChangeLog
+
+# 피드(게시글 목록)에 보이는 내용이 바뀔 때마다 올라가는 전역 변경 카운터
+FEED_COUNTER = "posts"
+# 조회수 flush(utils.view_counter) 마다 +1 - 피드 ETag 의 조회수 epoch (요청마다가 아니라 flush 주기마다 바뀜)
+VIEWS_COUNTER = "views"
+
+def ensure_counters():
+    """init_db 에서 호출 - 카운터 행이 없으면 만듭니다."""
+    with get_session() as session:
+        for name in (FEED_COUNTER, VIEWS_COUNTER):
+            if not session.get(Counter, name):
+                session.add(Counter(name=name))
+        session.commit()
+
+def bump_counter(name: str = FEED_COUNTER):
+    """
+    카운터 +1 UPDATE 문. 변경을 일으킨 트랜잭션 안에서 실행합니다:
+    session.exec(bump_counter())  /  await session.exec(bump_counter())
+    """
+    return update(Counter).where(Counter.name == name).values(value=Counter.value + 1, updated_at=datetime.utcnow())
+
+async def get_feed_version_async() -> Tuple[int, int, datetime]:
+    """
+    (피드 버전, 조회수 epoch, 둘 중 늦은 updated_at) - 카운터 두 행을 한 번에 조회합니다
+    """
+    async with get_async_read_session() as session:
+        rows = (await session.exec(
+            select(Counter.name, Counter.value, Counter.updated_at).where(Counter.name.in_((FEED_COUNTER, VIEWS_COUNTER)))
+        )).all()
+    values = {name: (value, updated_at) for name, value, updated_at in rows}
+    epoch = datetime.utcfromtimestamp(0)
+    feed_version, feed_updated = values.get(FEED_COUNTER, (0, epoch))
+    views_epoch, views_updated = values.get(VIEWS_COUNTER, (0, epoch))
+    return feed_version, views_epoch, max(feed_updated, views_updated)
+
+# ==========================
+# 변경 로그 (워커 간 캐시 무효화용)
+# ==========================
+def log_change(entity_id: int, entity: str = "post"):
+    """
+    변경 로그 INSERT 문. 변경을 일으킨 트랜잭션 안에서 실행합니다:
+    session.exec(log_change(post_id))  /  await session.exec(log_change(post_id))
+    """
+    return insert(ChangeLog).values(entity=entity, entity_id=entity_id, created_at=datetime.utcnow())
+
+def latest_change_id() -> int:
+    with get_read_session() as session:
+        return session.exec(select(func.coalesce(func.max(ChangeLog.id), 0))).one()
+
+def changes_since(last_id: int, limit: int = 1000) -> List[Tuple[int, str, int]]:
+    with get_read_session() as session:
+        statement = (
+            select(ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id)
+            .where(ChangeLog.id > last_id)
+            .order_by(ChangeLog.id)
+            .limit(limit)
+        )
+        return session.exec(statement).all()
+
+def prune_changes(older_than_seconds: int):
+    cutoff = datetime.utcnow() - timedelta(seconds=older_than_seconds)
+    with get_session() as session:
+        session.exec(delete(ChangeLog).where(ChangeLog.created_at < cutoff))
+        session.commit()
@@ -1,14 +1,11 @@
 import re
 from datetime import datetime
-from passlib.context import CryptContext
-from sqlmodel import select
-from Database.database import get_session
+from fastapi import HTTPException
+from Database.database import get_async_session
 from Models.signin_model import User
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+from Controllers.counter_controller import log_change
+from utils.password_hasher import hash_password_async
+from utils.session_tokens import issue_token, forget_user
 
 def validate_password(password: str):
     """비밀번호 유효성 검사"""
@@ -26,8 +23,11 @@ def validate_password(password: str):
         return False, "비밀번호에 최소 하나의 특수문자가 포함되어야 합니다"
     return True, ""
 
-def change_password(email: str, password: str, password_confirm: str):
-    """비밀번호 변경 로직 - 실제로 DB를 업데이트합니다"""
+async def change_password(user_id: int, password: str, password_confirm: str):
+    """
+    비밀번호 변경 로직 - 실제로 DB를 업데이트합니다
+    token_version 을 올려 기존 세션 토큰을 모두 폐기하고, 이 요청에는 새 토큰을 돌려줍니다.
+    """
     valid, message = validate_password(password)
     if not valid:
         return {"success": False, "message": message}
@@ -40,20 +40,30 @@ def change_password(email: str, password: str, password_confirm: str):
 
     # Find user and update password in database
     try:
-        with get_session() as session:
-            statement = select(User).where(User.email == email)
-            user = session.exec(statement).first()
+        # 해싱은 세션을 열기 전에 워커 풀에서 처리
+        hashed = await hash_password_async(password)
+        async with get_async_session() as session:
+            user = await session.get(User, user_id)
             
             if not user:
                 return {"success": False, "message": "사용자를 찾을 수 없습니다."}
             
             # Update password
-            user.hashed_password = hash_password(password)
+            user.hashed_password = hashed
             user.updated_at = datetime.utcnow()
+            user.token_version += 1
             session.add(user)
-            session.commit()
-            
-            return {"success": True, "message": "비밀번호가 성공적으로 변경되었습니다."}
+            await session.exec(log_change(user.id, entity="user"))
+            await session.commit()
+        forget_user(user_id)
+
+        return {
+            "success": True,
+            "message": "비밀번호가 성공적으로 변경되었습니다.",
+            "token": issue_token(user.id, user.email, user.token_version),
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
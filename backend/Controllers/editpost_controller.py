@@ -1,14 +1,10 @@
 from fastapi import HTTPException, UploadFile
-from pathlib import Path
-import shutil
 from datetime import datetime
 
 from Models.editpost_model import Post
 from Schemas.editpost_schemas import PostCreate, PostRead
 from Database.database import get_session
-
-UPLOAD_DIR = Path("uploaded_images")
-UPLOAD_DIR.mkdir(exist_ok=True)
+from utils.uploads import UPLOAD_DIR, save_upload
 
 class PostController:
 
@@ -20,15 +16,11 @@ class PostController:
 
     @staticmethod
     async def save_image(file: UploadFile) -> str | None:
-        if not file:
+        # 클라이언트 파일명 대신 내용 해시 경로(ab/cd/<sha256>.<ext>)로 스트리밍 저장 (형식/크기 검사 포함, 같은 이미지는 한 번만)
+        filename = await save_upload(file)
+        if not filename:
             return None
-        if file.content_type not in ["image/png", "image/jpeg", "image/jpg", "image/gif"]:
-            raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
-        # (주의) 파일명 충돌을 피하려면 실제로는 uuid 등으로 파일명 변경 권장
-        file_path = UPLOAD_DIR / file.filename
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        return str(file_path)
+        return str(UPLOAD_DIR / filename)
 
     @staticmethod
     def create_post_in_db(post_in: PostCreate) -> Post:
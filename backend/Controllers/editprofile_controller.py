@@ -1,24 +1,45 @@
 from fastapi import HTTPException
 from sqlmodel import select
-from Database.database import get_session
+from Database.database import get_async_session
 from Models.signin_model import User
+from Controllers.counter_controller import bump_counter, log_change
+from Controllers.like_controller import unlike_user_posts_statement, user_liked_post_ids_statement, delete_user_likes_statement
+from utils import post_cache
+from utils.blob_store import release_blob_async
+from utils.session_tokens import forget_user
 
 # 회원 탈퇴 - Use database instead of fake_users
-def delete_user(email: str):
+async def delete_user_async(email: str):
     """
     Delete user from database by email
     """
     try:
-        with get_session() as session:
+        async with get_async_session() as session:
             statement = select(User).where(User.email == email)
-            user = session.exec(statement).first()
-            
+            user = (await session.exec(statement)).first()
+
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
-            
-            session.delete(user)
-            session.commit()
-            return {"message": "회원 탈퇴가 완료되었습니다.", "success": True}
+
+            profile_image = user.profile_image
+            user_id = user.id
+            # 이 사용자의 좋아요를 지우고 좋아요 수를 되돌립니다 (같은 트랜잭션)
+            await session.exec(unlike_user_posts_statement(user_id))
+            liked_post_ids = (await session.exec(user_liked_post_ids_statement(user_id))).all()
+            for post_id in liked_post_ids:
+                await session.exec(log_change(post_id))
+            if liked_post_ids:
+                await session.exec(bump_counter())
+            await session.exec(delete_user_likes_statement(user_id))
+            await session.delete(user)
+            # 다른 워커의 세션 캐시도 지워 이 사용자의 토큰을 거절하게 합니다
+            await session.exec(log_change(user_id, entity="user"))
+            await session.commit()
+        forget_user(user_id)
+        for post_id in liked_post_ids:
+            post_cache.invalidate(post_id)
+        await release_blob_async(profile_image)  # 프로필 이미지 참조 반환
+        return {"message": "회원 탈퇴가 완료되었습니다.", "success": True}
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Iterable, Set, Tuple
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select, update, delete, insert
+
+from Database.database import get_session, get_read_session, get_async_read_session
+from Models.like_model import Like
+from Models.makepost_model import Post
+from Controllers.counter_controller import bump_counter, log_change
+from utils import post_cache
+from utils.event_hub import publish
+
+# ==========================
+# 좋아요 (사용자별 행 + posts.likes 카운터)
+# ==========================
+# likes 의 유니크 인덱스 (post_id, user_id) 가 "한 사용자당 한 번" 을 보장합니다.
+# - set_like_in_db : INSERT 가 유니크 위반이면 이미 좋아요 상태 -> 아무것도 바꾸지 않음 (재시도/동시 요청에 안전)
+# - unset_like_in_db : DELETE 한 행이 없으면 이미 취소 상태
+# 카운터 증감은 행이 실제로 추가/삭제된 경우에만, 같은 트랜잭션에서 likes = likes ± 1 로 합니다.
+# Python 쪽 잠금 없이 DB 가 동시 요청을 직렬화합니다.
+# 좋아요는 모두 로그인 사용자 것입니다 - 비로그인 좋아요(게시글당 user_id NULL 행 하나)는 모든 방문자가 공유하는
+# 전역 토글이라 없앴고, 남아 있던 행은 마이그레이션 0004 가 지웁니다.
+
+def is_liked_in_db(post_id: int, user_id: int) -> bool:
+    with get_read_session() as session:
+        statement = select(Like.id).where(Like.post_id == post_id, Like.user_id == user_id)
+        return session.exec(statement).first() is not None
+
+async def liked_post_ids_async(user_id: int, post_ids: Iterable[int]) -> Set[int]:
+    """post_ids 중 user_id 가 좋아요한 게시글 id (피드 한 페이지를 쿼리 한 번으로)"""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return set()
+    async with get_async_read_session() as session:
+        statement = select(Like.post_id).where(Like.user_id == user_id, Like.post_id.in_(post_ids))
+        return set((await session.exec(statement)).all())
+
+def _apply_like_delta(session, post_id: int, delta: int) -> int:
+    """좋아요 행 변경과 같은 트랜잭션에서 카운터/버전/변경 로그를 갱신하고 커밋합니다. 최신 좋아요 수 반환."""
+    result = session.exec(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(likes=Post.likes + delta, version=Post.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Post not found")
+    session.exec(bump_counter())
+    session.exec(log_change(post_id))
+    session.commit()
+    likes = session.exec(select(Post.likes).where(Post.id == post_id)).one()
+    post_cache.invalidate(post_id)
+    publish("like", {"post_id": post_id, "likes": likes})
+    return likes
+
+def _current_likes(session, post_id: int) -> int:
+    likes = session.exec(select(Post.likes).where(Post.id == post_id)).first()
+    if likes is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return likes
+
+def set_like_in_db(post_id: int, user_id: int) -> Tuple[int, bool]:
+    """
+    PUT /posts/{id}/like - 좋아요 상태로 만듭니다 (멱등). (좋아요 수, 이번 요청으로 바뀌었는지) 반환
+    """
+    with get_session() as session:
+        try:
+            session.exec(insert(Like).values(post_id=post_id, user_id=user_id, created_at=datetime.utcnow()))
+        except IntegrityError:
+            # 이미 좋아요한 상태 - INSERT 가 첫 문장이라 롤백해도 잃는 것이 없습니다
+            session.rollback()
+            return _current_likes(session, post_id), False
+        return _apply_like_delta(session, post_id, 1), True
+
+def unset_like_in_db(post_id: int, user_id: int) -> Tuple[int, bool]:
+    """
+    DELETE /posts/{id}/like - 좋아요를 취소합니다 (멱등). (좋아요 수, 이번 요청으로 바뀌었는지) 반환
+    """
+    with get_session() as session:
+        removed = session.exec(delete(Like).where(Like.post_id == post_id, Like.user_id == user_id)).rowcount
+        if not removed:
+            session.rollback()
+            return _current_likes(session, post_id), False
+        return _apply_like_delta(session, post_id, -1), True
+
+def toggle_like_in_db(post_id: int, user_id: int) -> int:
+    """
+    POST /posts/{id}/like (하위 호환 토글) - 현재 상태에 따라 set/unset 으로 처리합니다.
+    """
+    if is_liked_in_db(post_id, user_id):
+        return unset_like_in_db(post_id, user_id)[0]
+    return set_like_in_db(post_id, user_id)[0]
+
+# ==========================
+# 회원 탈퇴 - 사용자의 좋아요를 지우고 게시글 카운터를 같은 트랜잭션에서 줄입니다 (editprofile_controller)
+# ==========================
+# 카운터 UPDATE 를 먼저 실행해 쓰기 락을 잡은 뒤 post_id 를 읽고 행을 지우므로 그 사이에 새 좋아요가 끼어들지 않습니다.
+def unlike_user_posts_statement(user_id: int):
+    liked = select(Like.post_id).where(Like.user_id == user_id)
+    return (
+        update(Post)
+        .where(Post.id.in_(liked))
+        .values(likes=Post.likes - 1, version=Post.version + 1, updated_at=datetime.utcnow())
+    )
+
+def user_liked_post_ids_statement(user_id: int):
+    return select(Like.post_id).where(Like.user_id == user_id)
+
+def delete_user_likes_statement(user_id: int):
+    return delete(Like).where(Like.user_id == user_id)
@@ -1,12 +1,17 @@
 from fastapi import HTTPException
+import asyncio
+import os
 import re
-from passlib.context import CryptContext
+import secrets
+from typing import Optional
 from sqlmodel import select
 
-from Database.database import get_session
+from Database.database import get_async_read_session
 from Models.signin_model import User
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from utils.password_hasher import hash_password_async, verify_password_async, schedule_rehash
+from utils.rate_limiter import TokenBucketLimiter, RATE_LIMIT_STORE
+from utils.session_tokens import issue_token, SESSION_TTL
+from utils.image_variants import variant_urls
 
 # ==========================
 # 이메일 유효성 검사
@@ -32,35 +37,122 @@ def validate_password(password: str):
         raise HTTPException(status_code=400, detail="비밀번호 형식을 확인해주세요.")
 
 
+# ==========================
+# 로그인 시도 제한 (credential stuffing 방어)
+# ==========================
+# bcrypt 검증 한 번이 수백 ms 의 CPU 이므로, 해시를 돌리기 전에 IP / 이메일별 토큰 버킷으로 거릅니다.
+# - IP 버킷   : 한 곳에서 여러 계정을 두드리는 경우
+# - 이메일 버킷 : 여러 IP 에서 한 계정을 두드리는 경우
+ip_limiter = TokenBucketLimiter(
+    "login-ip",
+    burst=int(os.getenv("LOGIN_RATE_IP_BURST", "20")),
+    per_minute=float(os.getenv("LOGIN_RATE_IP_PER_MINUTE", "10")),
+)
+email_limiter = TokenBucketLimiter(
+    "login-email",
+    burst=int(os.getenv("LOGIN_RATE_EMAIL_BURST", "5")),
+    per_minute=float(os.getenv("LOGIN_RATE_EMAIL_PER_MINUTE", "2")),
+)
+
+_login_stats = {
+    "attempts": 0,
+    "rejected_ip": 0,
+    "rejected_email": 0,
+    "verified_success": 0,
+    "verified_failure": 0,
+    "unknown_user": 0,
+}
+
+# 없는 계정도 같은 비용의 bcrypt 검증을 거치게 해서 응답 시간으로 계정 존재 여부를 알 수 없게 합니다
+_dummy_hash: Optional[str] = None
+_dummy_hash_lock = asyncio.Lock()
+
+
+async def _get_dummy_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        async with _dummy_hash_lock:
+            if _dummy_hash is None:
+                _dummy_hash = await hash_password_async(secrets.token_urlsafe(16))
+    return _dummy_hash
+
+
+_warm_up_task: Optional[asyncio.Task] = None
+
+
+def warm_up_login():
+    """lifespan 에서 호출 - 첫 '없는 계정' 로그인만 느려지지 않도록 더미 해시를 미리 만듭니다."""
+    global _warm_up_task
+    _warm_up_task = asyncio.create_task(_get_dummy_hash())
+
+
+def _too_many_attempts(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def check_login_rate(email: str, client_ip: Optional[str]):
+    """한도를 넘으면 429 (Retry-After). 해시 검증보다 먼저 호출합니다."""
+    _login_stats["attempts"] += 1
+    if client_ip:
+        allowed, retry_after = await ip_limiter.hit_async(client_ip)
+        if not allowed:
+            _login_stats["rejected_ip"] += 1
+            raise _too_many_attempts(retry_after)
+    allowed, retry_after = await email_limiter.hit_async(email.strip().lower())
+    if not allowed:
+        _login_stats["rejected_email"] += 1
+        raise _too_many_attempts(retry_after)
+
+
+def login_stats() -> dict:
+    return {**_login_stats, "store": RATE_LIMIT_STORE}
+
+
 # ==========================
 # 로그인 처리
 # ==========================
-def login_user(email: str, password: str):
+async def login_user(email: str, password: str, client_ip: Optional[str] = None):
     validate_email(email)
     # Don't validate password format for login - just check if it exists
     if not password:
         raise HTTPException(status_code=400, detail="비밀번호를 입력해주세요.")
 
+    await check_login_rate(email, client_ip)
+
     # Check database for user
-    with get_session() as session:
+    async with get_async_read_session() as session:
         statement = select(User).where(User.email == email)
-        user = session.exec(statement).first()
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="아이디 또는 비밀번호를 확인해주세요.")
-        
-        # Verify password using bcrypt
-        if not pwd_context.verify(password, user.hashed_password):
-            raise HTTPException(status_code=401, detail="아이디 또는 비밀번호를 확인해주세요.")
+        user = (await session.exec(statement)).first()
+
+    # Verify password using bcrypt (worker pool, not the event loop)
+    # 계정이 없어도 더미 해시로 같은 비용의 검증을 수행
+    hashed_password = user.hashed_password if user else await _get_dummy_hash()
+    verified = await verify_password_async(password, hashed_password)
+    if not user:
+        _login_stats["unknown_user"] += 1
+    if not user or not verified:
+        _login_stats["verified_failure"] += 1
+        raise HTTPException(status_code=401, detail="아이디 또는 비밀번호를 확인해주세요.")
+    _login_stats["verified_success"] += 1
+    # 저장된 해시의 cost 가 현재 정책과 다르면 평문을 알고 있는 지금 백그라운드에서 다시 해싱
+    schedule_rehash(user.id, password, user.hashed_password)
 
     # 로그인 성공 시 반환
     return {
         "message": "로그인 성공",
         "redirect_to": "/posts",
+        # 이후 요청은 Authorization: Bearer <token> 으로 인증합니다
+        "token": issue_token(user.id, user.email, user.token_version),
+        "expires_in": SESSION_TTL,
         "user": {
             "id": user.id,
             "email": user.email,
             "nickname": user.nickname,
-            "profile_image": user.profile_image
+            "profile_image": user.profile_image,
+            "profile_image_variants": variant_urls(user.profile_image_variants)
         }
     }
@@ -1,77 +1,253 @@
-from typing import List
-from sqlmodel import select
+import base64
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, tuple_
+from sqlmodel import select, update, delete
 from Models.makepost_model import Post
-from Schemas.makepost_schemas import PostCreate, PostResponse
-from Database.database import get_session
+from Schemas.makepost_schemas import PostCreate, POST_FIELDS, post_payload, post_payloads
+from Database.database import get_session, get_read_session, get_async_session, get_async_read_session
+from Controllers.counter_controller import bump_counter, log_change, VIEWS_COUNTER
+from utils.blob_store import release_blob, release_blob_async
+from utils import post_cache
+from utils.event_hub import publish
 
-def create_post_in_db(post_in: PostCreate) -> Post:
+def publish_new_post(post: Post):
+    """실시간 피드(/posts/stream)에 새 게시글 요약을 보냅니다 (본문 제외)."""
+    publish("post", {
+        "id": post.id,
+        "title": post.title,
+        "image_filename": post.image_filename,
+        "created_at": post.created_at.isoformat(),
+    })
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# 목록/상세 응답에 필요한 컬럼만 튜플로 조회합니다 - ORM 객체를 만들지 않고 post_payloads() 로 바로 dict 변환
+POST_COLUMNS = tuple(getattr(Post, name) for name in POST_FIELDS)
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    """
+    (created_at, id) 위치를 클라이언트에게 불투명한 문자열로 인코딩합니다.
+    """
+    raw = f"{created_at.isoformat()}|{post_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    encode_cursor의 역변환. 잘못된 커서는 400으로 거절합니다.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, post_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(post_id)
+    except Exception:
+        from fastapi import HTTPException
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _page_statement(cursor: Optional[str], limit: int):
+    statement = select(*POST_COLUMNS).order_by(Post.created_at.desc(), Post.id.desc())
+    if cursor:
+        created_at, post_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(Post.created_at, Post.id) < (created_at, post_id))
+    # 다음 페이지 존재 여부를 알기 위해 한 행 더 조회
+    return statement.limit(limit + 1)
+
+def _split_page(rows: list, limit: int) -> Tuple[List[dict], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return post_payloads(rows), next_cursor
+
+def _detail_statement(post_id: int):
+    return select(*POST_COLUMNS, Post.version, Post.updated_at).where(Post.id == post_id)
+
+def get_post_row(post_id: int):
+    """
+    상세 응답용 컬럼 Row (POST_COLUMNS + version, updated_at) - 없으면 404
+    """
+    with get_read_session() as session:
+        row = session.exec(_detail_statement(post_id)).first()
+    if row is None:
+        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="Post not found")
+    return row
+
+def load_post_detail(post_id: int) -> Tuple[int, datetime, dict]:
     """
-    Inserts a post into DB and returns the DB model (Post).
+    상세 응답 payload 를 만들어 post_cache 에 넣고 (version, last_modified, payload) 를 반환합니다.
+    payload 는 PostResponse 필드 + liked(False) + 댓글 첫 페이지 (조회수는 DB 값 - 버퍼 증가분은 라우트에서 더함)
     """
+    from Controllers.comment_controller import comment_page_statement, split_comment_page, DEFAULT_COMMENT_PAGE_SIZE
+
+    # 읽기 전 무효화 세대 - 읽는 사이에 쓰기 + invalidate() 가 끼어들면 put 이 거절합니다 (오래된 version 을 캐시하지 않도록)
+    since = post_cache.generation()
+    with get_read_session() as session:
+        row = session.exec(_detail_statement(post_id)).first()
+        if row is None:
+            from fastapi import HTTPException
+            raise HTTPException(status_code=404, detail="Post not found")
+        # 댓글은 첫 페이지만 - 나머지는 GET /posts/{id}/comments?cursor=comments_next_cursor
+        comment_rows = session.exec(comment_page_statement(post_id, None, DEFAULT_COMMENT_PAGE_SIZE)).all()
+    # views/likes/comments_count are counter columns
+    payload = post_payload(row)
+    # 캐시는 모든 독자가 공유하므로 liked 는 False - 로그인 사용자는 라우트에서 본인 값으로 바꿉니다
+    payload['liked'] = False
+    payload['comments'], payload['comments_next_cursor'] = split_comment_page(comment_rows, DEFAULT_COMMENT_PAGE_SIZE)
+    last_modified = row.updated_at or row.created_at
+    post_cache.put(post_id, row.version, last_modified, payload, since=since)
+    return row.version, last_modified, payload
+
+def warm_post_cache(limit: int) -> int:
+    """
+    최신 게시글 limit 개의 상세 payload 를 미리 캐시합니다 (lifespan, 워커마다).
+    새로 시작한 워커의 첫 상세 조회들이 모두 miss 가 되지 않도록. 채운 개수를 반환합니다.
+    """
+    if limit <= 0:
+        return 0
+    with get_read_session() as session:
+        post_ids = session.exec(
+            select(Post.id).order_by(Post.created_at.desc(), Post.id.desc()).limit(min(limit, post_cache.POST_CACHE_SIZE))
+        ).all()
+    for post_id in post_ids:
+        load_post_detail(post_id)
+    return len(post_ids)
+
+def get_post_version(post_id: int) -> Optional[Tuple[int, datetime]]:
+    """
+    (version, last_modified) of a post without loading the full row, or None if missing
+    """
+    with get_read_session() as session:
+        row = session.exec(
+            select(Post.version, Post.updated_at, Post.created_at).where(Post.id == post_id)
+        ).first()
+    if not row:
+        return None
+    version, updated_at, created_at = row
+    return version, updated_at or created_at
+
+def add_views_in_db(deltas: Dict[int, int]):
+    """
+    Apply buffered view increments {post_id: delta} in one transaction
+    (UPDATE ... SET views = views + :delta, executemany)
+    같은 트랜잭션에서 조회수 epoch 를 올려 피드 ETag 가 바뀌게 합니다 (게시글 version 은 그대로)
+    """
+    posts = Post.__table__
+    statement = (
+        update(posts)
+        .where(posts.c.id == bindparam("post_id"))
+        .values(views=posts.c.views + bindparam("delta"))
+    )
     with get_session() as session:
-        post = Post(
-            title=post_in.title,
-            content=post_in.content,
-            image_filename=post_in.image_filename
+        session.connection().execute(
+            statement, [{"post_id": post_id, "delta": delta} for post_id, delta in deltas.items()]
         )
-        session.add(post)
+        session.exec(bump_counter(VIEWS_COUNTER))
         session.commit()
-        session.refresh(post)
-        return post
 
-def list_posts_from_db() -> List[Post]:
-    with get_session() as session:
-        statement = select(Post).order_by(Post.created_at.desc())
-        results = session.exec(statement).all()
-        return results
+def post_images_missing_variants() -> List[str]:
+    """변형이 기록되지 않은 게시글 이미지 (시작 시 다시 예약 - 종료로 잃은 작업 복구)"""
+    with get_read_session() as session:
+        return session.exec(
+            select(Post.image_filename)
+            .where(Post.image_filename.is_not(None), Post.image_variants.is_(None))
+            .distinct()
+        ).all()
 
-def get_post_from_db(post_id: int) -> Post:
+def set_post_image_variants(image_filename: str, variants_json: str):
     """
-    Get a single post from database by ID
+    Record generated variant filenames for every post using image_filename
+    (called from the image worker pool)
     """
     with get_session() as session:
-        post = session.get(Post, post_id)
-        if not post:
-            from fastapi import HTTPException
-            raise HTTPException(status_code=404, detail="Post not found")
-        return post
+        post_ids = session.exec(select(Post.id).where(Post.image_filename == image_filename)).all()
+        session.exec(
+            update(Post)
+            .where(Post.image_filename == image_filename)
+            .values(image_variants=variants_json, version=Post.version + 1, updated_at=datetime.utcnow())
+        )
+        session.exec(bump_counter())
+        for post_id in post_ids:
+            session.exec(log_change(post_id))
+        session.commit()
+    for post_id in post_ids:
+        post_cache.invalidate(post_id)
 
-def update_post_in_db(post_id: int, title: str, content: str, image_filename: str = None) -> Post:
+def delete_post_in_db(post_id: int):
     """
-    Update an existing post in the database
+    Delete a post with its comments and likes, then release its image reference
     """
+    from Models.comment_model import Comment
+    from Models.like_model import Like
+
     with get_session() as session:
         post = session.get(Post, post_id)
         if not post:
             from fastapi import HTTPException
             raise HTTPException(status_code=404, detail="Post not found")
-        
-        post.title = title
-        post.content = content
-        if image_filename:
-            post.image_filename = image_filename
-        
-        session.add(post)
+        image_filename = post.image_filename
+        session.exec(delete(Comment).where(Comment.post_id == post_id))
+        session.exec(delete(Like).where(Like.post_id == post_id))
+        session.delete(post)
+        session.exec(bump_counter())
+        session.exec(log_change(post_id))
         session.commit()
-        session.refresh(post)
-        return post
+    post_cache.invalidate(post_id)
+    release_blob(image_filename)
+    return {"message": "Post deleted"}
+
+# ==========================
+# Async variants (async def 라우트에서 await)
+# ==========================
+async def create_post_in_db_async(post_in: PostCreate) -> Post:
+    async with get_async_session() as session:
+        post = Post(
+            title=post_in.title,
+            content=post_in.content,
+            image_filename=post_in.image_filename
+        )
+        session.add(post)
+        await session.exec(bump_counter())
+        await session.commit()
+        await session.refresh(post)
+    publish_new_post(post)
+    return post
 
-def update_post_in_db(post_id: int, title: str, content: str, image_filename: str = None) -> Post:
+async def list_posts_page_async(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[dict], Optional[str]]:
     """
-    Update an existing post in the database
+    Keyset pagination over (created_at DESC, id DESC).
+    Returns (post payloads, next_cursor); next_cursor is None on the last page.
+    OFFSET을 쓰지 않으므로 스크롤 깊이와 상관없이 ix_posts_created_at_id 인덱스 범위 스캔만 수행합니다.
     """
-    with get_session() as session:
-        post = session.get(Post, post_id)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    async with get_async_read_session() as session:
+        results = (await session.exec(_page_statement(cursor, limit))).all()
+    return _split_page(results, limit)
+
+async def update_post_in_db_async(post_id: int, title: str, content: str, image_filename: str = None) -> Post:
+    async with get_async_session() as session:
+        post = await session.get(Post, post_id)
         if not post:
             from fastapi import HTTPException
             raise HTTPException(status_code=404, detail="Post not found")
-        
+
+        previous_image = post.image_filename
         post.title = title
         post.content = content
         if image_filename:
             post.image_filename = image_filename
-        
+            post.image_variants = None  # 새 이미지의 변형은 백그라운드에서 다시 생성
+        post.version += 1
+        post.updated_at = datetime.utcnow()
+
         session.add(post)
-        session.commit()
-        session.refresh(post)
-        return post
+        await session.exec(bump_counter())
+        await session.exec(log_change(post_id))
+        await session.commit()
+        await session.refresh(post)
+    post_cache.invalidate(post_id)
+    if image_filename:
+        await release_blob_async(previous_image)  # 교체된 이미지의 참조 반환
+    return post
@@ -1,9 +1,24 @@
 from fastapi import HTTPException
-from typing import List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Set, Tuple
 from pydantic import BaseModel
 from datetime import datetime
+from utils.event_hub import publish
+from Controllers.comment_controller import DEFAULT_COMMENT_PAGE_SIZE, MAX_COMMENT_PAGE_SIZE, encode_comment_cursor, decode_comment_cursor
 
-# 데이터 모델 정의
+# ==========================
+# 메모리 게시글/댓글 저장소 (DB 에 없는 게시글의 하위 호환 경로)
+# ==========================
+# 레코드는 __slots__ 객체로 보관하고 (Pydantic 모델보다 작고 만들기 빠름) 세 개의 dict 로 색인합니다.
+# - posts_db         : post_id -> PostRecord
+# - comments_db      : comment_id -> CommentRecord
+# - comments_by_post : post_id -> [comment_id, ...]  (id 는 증가하므로 추가만 해도 정렬 유지)
+# 조회/댓글 수는 O(1), 댓글 페이지는 커서 위치를 bisect 로 찾아 O(log n + 페이지 크기) 입니다.
+# 댓글 삭제는 bisect 로 찾아 리스트에서 빼므로 게시글 하나의 댓글 수에 비례합니다 (C 수준 memmove).
+# 게시글의 댓글 목록은 응답을 만들 때만 꺼냅니다.
+# 아래 Post/Comment 모델은 응답 스키마(response_model)로만 씁니다 - 레코드에서 속성으로 읽어 검증합니다.
+
+# 데이터 모델 정의 (응답 스키마)
 class Comment(BaseModel):
     id: int
     post_id: int
@@ -20,35 +35,97 @@ class Post(BaseModel):
     liked: bool = False
     comments: List[Comment] = []
 
+
+class CommentRecord:
+    __slots__ = ("id", "post_id", "content", "created_at", "updated_at")
+
+    def __init__(self, id: int, post_id: int, content: str, created_at: datetime, updated_at: Optional[datetime] = None):
+        self.id = id
+        self.post_id = post_id
+        self.content = content
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def to_dict(self) -> dict:
+        """Comment 와 같은 모양 (datetime 은 ISO 문자열)"""
+        return {
+            "id": self.id,
+            "post_id": self.post_id,
+            "content": self.content,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class PostRecord:
+    __slots__ = ("id", "title", "content", "views", "liked_by")
+
+    def __init__(self, id: int, title: str, content: str):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.views = 0
+        # 좋아요한 user_id 집합 - 좋아요 수는 집합 크기라 따로 증감하지 않습니다
+        self.liked_by: Set[int] = set()
+
+    @property
+    def likes(self) -> int:
+        return len(self.liked_by)
+
+    @property
+    def comments(self) -> List[CommentRecord]:
+        """이 게시글의 댓글 (작성 순) - 응답을 만들 때만 목록으로 꺼냅니다"""
+        return [comments_db[comment_id] for comment_id in comments_by_post.get(self.id, ())]
+
+    def to_dict(self, user_id: Optional[int] = None) -> dict:
+        """Post 와 같은 모양 - DB 상세 응답처럼 댓글은 첫 페이지 + comments_next_cursor, liked 는 user_id 기준"""
+        comments, next_cursor = list_comments_page(self.id)
+        return {
+            "id": self.id,
+            "title": self.title,
+            "content": self.content,
+            "views": self.views,
+            "likes": self.likes,
+            "liked": user_id in self.liked_by,
+            "comments": comments,
+            "comments_next_cursor": next_cursor,
+        }
+
+
 # 임시 DB
-posts_db = []
-comments_db = []
+posts_db: Dict[int, PostRecord] = {}
+comments_db: Dict[int, CommentRecord] = {}
+comments_by_post: Dict[int, List[int]] = {}
 post_id_seq = 1
 comment_id_seq = 1
 
 # 컨트롤러 함수
-def get_post(post_id: int) -> Post:
-    for post in posts_db:
-        if post.id == post_id:
-            return post
-    raise HTTPException(status_code=404, detail="Post not found")
+def get_post(post_id: int) -> PostRecord:
+    post = posts_db.get(post_id)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
 
-def create_post(title: str, content: str) -> Post:
+def create_post(title: str, content: str) -> PostRecord:
     global post_id_seq
-    post = Post(id=post_id_seq, title=title, content=content)
-    posts_db.append(post)
+    post = PostRecord(id=post_id_seq, title=title, content=content)
+    posts_db[post.id] = post
+    comments_by_post[post.id] = []
     post_id_seq += 1
     return post
 
-def update_post(post_id: int, title: str, content: str) -> Post:
+def update_post(post_id: int, title: str, content: str) -> PostRecord:
     post = get_post(post_id)
     post.title = title
     post.content = content
     return post
 
 def delete_post(post_id: int):
-    post = get_post(post_id)
-    posts_db.remove(post)
+    get_post(post_id)
+    del posts_db[post_id]
+    # 게시글의 댓글도 함께 삭제 (댓글 수만큼)
+    for comment_id in comments_by_post.pop(post_id, ()):
+        del comments_db[comment_id]
     return {"message": "Post deleted"}
 
 def increment_views(post_id: int):
@@ -56,38 +133,68 @@ def increment_views(post_id: int):
     post.views += 1
     return post.views
 
-def toggle_like(post_id: int):
+# 좋아요 - Controllers.like_controller 와 같은 의미 (set/unset 은 멱등, 바뀐 경우에만 이벤트)
+def set_like(post_id: int, user_id: int) -> Tuple[int, bool]:
+    post = get_post(post_id)
+    changed = user_id not in post.liked_by
+    post.liked_by.add(user_id)
+    if changed:
+        publish("like", {"post_id": post_id, "likes": post.likes})
+    return post.likes, changed
+
+def unset_like(post_id: int, user_id: int) -> Tuple[int, bool]:
     post = get_post(post_id)
-    if post.liked:
-        post.likes -= 1
-    else:
-        post.likes += 1
-    post.liked = not post.liked
-    return post.likes
+    changed = user_id in post.liked_by
+    post.liked_by.discard(user_id)
+    if changed:
+        publish("like", {"post_id": post_id, "likes": post.likes})
+    return post.likes, changed
+
+def toggle_like(post_id: int, user_id: int):
+    if user_id in get_post(post_id).liked_by:
+        return unset_like(post_id, user_id)[0]
+    return set_like(post_id, user_id)[0]
 
 # 댓글 관련
-def add_comment(post_id: int, content: str) -> Comment:
+def count_comments(post_id: int) -> int:
+    return len(comments_by_post.get(post_id, ()))
+
+def list_comments_page(post_id: int, cursor: Optional[str] = None,
+                       limit: int = DEFAULT_COMMENT_PAGE_SIZE) -> Tuple[List[dict], Optional[str]]:
+    """Controllers.comment_controller.list_comments_page_in_db 와 같은 커서/응답 (id 순)"""
+    get_post(post_id)
+    limit = max(1, min(limit, MAX_COMMENT_PAGE_SIZE))
+    comment_ids = comments_by_post[post_id]
+    # id 가 증가 순으로 들어 있으므로 커서 다음 위치를 이분 탐색으로 찾습니다
+    start = bisect_right(comment_ids, decode_comment_cursor(cursor)) if cursor else 0
+    page = comment_ids[start:start + limit + 1]
+    next_cursor = encode_comment_cursor(page[limit - 1]) if len(page) > limit else None
+    return [comments_db[comment_id].to_dict() for comment_id in page[:limit]], next_cursor
+
+def add_comment(post_id: int, content: str) -> CommentRecord:
     global comment_id_seq
-    post = get_post(post_id)
-    comment = Comment(id=comment_id_seq, post_id=post_id, content=content, created_at=datetime.now())
-    comments_db.append(comment)
-    post.comments.append(comment)
+    get_post(post_id)
+    comment = CommentRecord(id=comment_id_seq, post_id=post_id, content=content, created_at=datetime.now())
+    comments_db[comment.id] = comment
+    comments_by_post[post_id].append(comment.id)
     comment_id_seq += 1
+    publish("comment", {"post_id": post_id, "comment": comment.to_dict()})
     return comment
 
-def update_comment(comment_id: int, content: str) -> Comment:
-    for comment in comments_db:
-        if comment.id == comment_id:
-            comment.content = content
-            comment.updated_at = datetime.now()
-            return comment
-    raise HTTPException(status_code=404, detail="Comment not found")
+def update_comment(comment_id: int, content: str) -> CommentRecord:
+    comment = comments_db.get(comment_id)
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    comment.content = content
+    comment.updated_at = datetime.now()
+    return comment
 
 def delete_comment(comment_id: int):
-    for comment in comments_db:
-        if comment.id == comment_id:
-            post = get_post(comment.post_id)
-            post.comments = [c for c in post.comments if c.id != comment_id]
-            comments_db.remove(comment)
-            return {"message": "Comment deleted"}
-    raise HTTPException(status_code=404, detail="Comment not found")
+    comment = comments_db.pop(comment_id, None)
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    comment_ids = comments_by_post[comment.post_id]
+    index = bisect_left(comment_ids, comment_id)
+    if index < len(comment_ids) and comment_ids[index] == comment_id:
+        del comment_ids[index]
+    return {"message": "Comment deleted"}
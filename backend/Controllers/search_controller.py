@@ -0,0 +1,240 @@
+import base64
+import html
+import os
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlmodel import select
+
+from Database.database import engine, get_async_read_session
+from Models.makepost_model import Post
+from Schemas.makepost_schemas import post_payload
+from Controllers.makepost_controller import POST_COLUMNS
+
+# ==========================
+# 게시글 전문 검색 (SQLite FTS5)
+# ==========================
+# posts_fts 는 posts 를 원본으로 하는 external-content FTS5 테이블입니다 (본문을 두 번 저장하지 않음).
+# 동기화는 트리거가 맡으므로 sync/async 컨트롤러, 스크립트 등 어떤 경로로 써도 색인이 따라갑니다.
+# trigram 토크나이저는 형태소 분석 없이 3글자 단위로 색인하므로 한국어 부분 일치에 잘 맞습니다.
+# 단, 3글자 미만 검색어는 색인을 쓸 수 없어 LIKE 로 보충합니다 ("사과" 같은 두 글자 단어).
+# 3글자 이상 단어가 함께 있으면 LIKE 는 색인으로 찾은 후보에만 적용되고, 짧은 단어뿐인 검색은
+# 최신 SEARCH_SHORT_TERM_WINDOW 개 id 범위만 훑습니다 - 그보다 오래된 글은 짧은 단어만으로는 찾을 수 없습니다.
+SEARCH_TABLE = "posts_fts"
+MIN_TRIGRAM_LENGTH = 3
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+SNIPPET_TOKENS = 16
+# 아주 흔한 단어는 거의 모든 글과 일치해 bm25 정렬 비용이 글 수에 비례합니다.
+# 일치하는 글 중 최신 SEARCH_MAX_CANDIDATES 개만 관련도 순으로 정렬합니다 (0 이면 전부).
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "5000"))
+# 색인 없이 LIKE 로만 찾는 검색(짧은 단어뿐이거나 FTS5 없음)이 훑는 최신 게시글 id 범위 (0 이면 전체 테이블)
+SEARCH_SHORT_TERM_WINDOW = int(os.getenv("SEARCH_SHORT_TERM_WINDOW", "10000"))
+
+# 하이라이트 구분자 - 사용자 입력이 HTML 로 해석되지 않도록 이스케이프한 뒤 <mark> 로 바꿉니다
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+_fts_available: Optional[bool] = None
+
+
+def ensure_search_index():
+    """posts_fts 와 동기화 트리거를 만들고, 처음 만들 때는 기존 게시글을 색인합니다 (init_db 에서 호출)."""
+    global _fts_available
+    if engine.dialect.name != "sqlite":
+        _fts_available = False
+        return
+    with engine.begin() as conn:
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+        ).first()
+        try:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                "title, content, content='posts', content_rowid='id', tokenize='trigram')"
+            )
+        except Exception:
+            # FTS5/trigram 을 지원하지 않는 SQLite (3.34 미만) - LIKE 검색으로 동작
+            print("FTS5 trigram tokenizer is not available, falling back to LIKE search")
+            _fts_available = False
+            return
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+                INSERT INTO {SEARCH_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END""")
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+                INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END""")
+        # 조회수/좋아요 등 카운터 UPDATE 는 색인을 건드리지 않도록 title/content 변경에만 반응
+        conn.exec_driver_sql(f"""
+            CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+                INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO {SEARCH_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END""")
+        if not exists:
+            conn.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+    _fts_available = True
+
+
+def rebuild_search_index():
+    """색인을 posts 에서 다시 만듭니다 (트리거 없이 직접 수정한 데이터 복구용)."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def _split_terms(q: str) -> Tuple[List[str], List[str]]:
+    """검색어 -> (색인 가능한 3글자 이상 단어, 그보다 짧은 단어)"""
+    terms = [term for term in q.split() if term]
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+    return long_terms, short_terms
+
+
+def _match_expression(terms: List[str]) -> str:
+    # 각 단어를 문자열 리터럴로 감싸 FTS5 연산자(AND, NEAR, *, : 등)로 해석되지 않게 합니다 (단어끼리 AND)
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def encode_search_cursor(rank: float, post_id: int) -> str:
+    # repr 은 float 를 정확히 되돌릴 수 있게 표현합니다
+    return base64.urlsafe_b64encode(f"{rank!r}|{post_id}".encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, post_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return float(rank), int(post_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _like_filters(terms: List[str], params: dict) -> List[str]:
+    filters = []
+    for term in terms:
+        name = f"like{len(params)}"
+        params[name] = _like_pattern(term)
+        filters.append(f"(p.title LIKE :{name} ESCAPE '\\' OR p.content LIKE :{name} ESCAPE '\\')")
+    return filters
+
+
+def _rank_statement(long_terms: List[str], short_terms: List[str], cursor: Optional[str], limit: int,
+                    min_rowid: Optional[int]):
+    """관련도 순으로 (id, rank) 만 고릅니다. 하이라이트는 고른 페이지에 대해서만 따로 만듭니다."""
+    params = {"limit": limit + 1}
+    if _fts_available and long_terms:
+        # bm25 는 작을수록 관련도가 높습니다. 제목에 더 큰 가중치를 줍니다.
+        rank = f"bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, {CONTENT_WEIGHT})"
+        params["match"] = _match_expression(long_terms)
+        sql = f"SELECT {SEARCH_TABLE}.rowid AS id, {rank} AS rank FROM {SEARCH_TABLE}"
+        # 짧은 단어가 있을 때만 posts 를 조인해 LIKE 로 거릅니다
+        if short_terms:
+            sql += f" JOIN posts AS p ON p.id = {SEARCH_TABLE}.rowid"
+        sql += f" WHERE {SEARCH_TABLE} MATCH :match"
+        filters = _like_filters(short_terms, params)
+        id_column = f"{SEARCH_TABLE}.rowid"
+        order_by = f"rank, {id_column} DESC"
+    else:
+        # 짧은 단어뿐이거나 FTS5 를 쓸 수 없을 때 - 최신순 LIKE 스캔 (rank 는 모두 0)
+        rank = "0.0"
+        sql = "SELECT p.id AS id, 0.0 AS rank FROM posts AS p WHERE 1 = 1"
+        filters = _like_filters(short_terms if _fts_available else short_terms + long_terms, params)
+        id_column = "p.id"
+        # rank 가 상수이므로 PK 역순으로 훑다가 limit 개를 찾거나 min_rowid (최신 창의 끝) 에 닿으면 멈춥니다
+        order_by = "p.id DESC"
+    if min_rowid is not None:
+        params["min_rowid"] = min_rowid
+        filters.append(f"{id_column} >= :min_rowid")
+    if cursor:
+        params["cursor_rank"], params["cursor_id"] = decode_search_cursor(cursor)
+        filters.append(f"({rank} > :cursor_rank OR ({rank} = :cursor_rank AND {id_column} < :cursor_id))")
+    for condition in filters:
+        sql += f" AND {condition}"
+    sql += f" ORDER BY {order_by} LIMIT :limit"
+    return text(sql), params
+
+
+def _candidate_floor_statement(long_terms: List[str]):
+    """일치하는 게시글 중 최신 SEARCH_MAX_CANDIDATES 번째의 id (그보다 적게 일치하면 결과 없음)"""
+    return text(
+        f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match "
+        "ORDER BY rowid DESC LIMIT 1 OFFSET :offset"
+    ), {"match": _match_expression(long_terms), "offset": SEARCH_MAX_CANDIDATES - 1}
+
+
+def _window_floor_statement():
+    """LIKE 만으로 찾는 검색이 훑을 가장 오래된 id (최신 SEARCH_SHORT_TERM_WINDOW 개 id - PK 인덱스 끝 한 번 조회)"""
+    return text("SELECT MAX(id) - :window + 1 FROM posts"), {"window": SEARCH_SHORT_TERM_WINDOW}
+
+
+def _highlight_statement(long_terms: List[str], post_ids: List[int]):
+    params = {"match": _match_expression(long_terms), "start": _MARK_START, "end": _MARK_END}
+    placeholders = []
+    for i, post_id in enumerate(post_ids):
+        params[f"id{i}"] = post_id
+        placeholders.append(f":id{i}")
+    return text(f"""
+        SELECT rowid AS id,
+               highlight({SEARCH_TABLE}, 0, :start, :end) AS title_highlight,
+               snippet({SEARCH_TABLE}, 1, :start, :end, '…', {SNIPPET_TOKENS}) AS snippet
+        FROM {SEARCH_TABLE}
+        WHERE {SEARCH_TABLE} MATCH :match AND rowid IN ({", ".join(placeholders)})
+    """), params
+
+
+def _render_highlight(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return html.escape(value).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+async def search_posts_async(q: str, cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    관련도 순 검색 결과 한 페이지와 next_cursor 를 반환합니다.
+    각 항목은 PostResponse 필드 + title_highlight / snippet (<mark> 로 강조, HTML 이스케이프됨)
+    3글자 미만 단어뿐인 검색은 최신 SEARCH_SHORT_TERM_WINDOW 개 id 안에서 최신순으로 찾습니다.
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요.")
+    long_terms, short_terms = _split_terms(q)
+    use_fts = bool(_fts_available and long_terms)
+    async with get_async_read_session() as session:
+        min_rowid = None
+        if use_fts and SEARCH_MAX_CANDIDATES > 0:
+            min_rowid = (await session.execute(*_candidate_floor_statement(long_terms))).scalar()
+        elif not use_fts and SEARCH_SHORT_TERM_WINDOW > 0:
+            min_rowid = (await session.execute(*_window_floor_statement())).scalar()
+        statement, params = _rank_statement(long_terms, short_terms, cursor, limit, min_rowid)
+        hits = (await session.execute(statement, params)).all()
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+        posts, highlights = {}, {}
+        if hits:
+            post_ids = [hit.id for hit in hits]
+            rows = await session.exec(select(*POST_COLUMNS).where(Post.id.in_(post_ids)))
+            posts = {post.id: post for post in rows.all()}
+            if use_fts:
+                rows = await session.execute(*_highlight_statement(long_terms, post_ids))
+                highlights = {row.id: row for row in rows.all()}
+
+    items = []
+    for hit in hits:
+        post = posts.get(hit.id)
+        if post is None:
+            continue
+        item = post_payload(post)
+        highlight = highlights.get(hit.id)
+        item["title_highlight"] = _render_highlight(highlight.title_highlight) if highlight else html.escape(post.title)
+        item["snippet"] = _render_highlight(highlight.snippet) if highlight else None
+        items.append(item)
+    next_cursor = encode_search_cursor(hits[-1].rank, hits[-1].id) if has_more else None
+    return items, next_cursor
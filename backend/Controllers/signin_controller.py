@@ -1,81 +1,27 @@
 import re
-from pathlib import Path
-from uuid import uuid4
 from datetime import datetime
+from typing import List, Optional
 
-from passlib.context import CryptContext
-from sqlmodel import select
+from fastapi import HTTPException
+from sqlmodel import select, update
 
-from Database.database import get_session
+from Database.database import get_session, get_async_session
 from Models.signin_model import User
 from Schemas.signin_schemas import UserRegister, UserResponse
-
-UPLOAD_DIR = Path("uploaded_images")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# --- 유틸리티: 비밀번호 해시 ---
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-# --- 파일 저장 (동기) ---
-def save_image_file(upload_file) -> str | None:
-    if not upload_file:
-        return None
-    filename_lower = upload_file.filename.lower()
-    if not filename_lower.endswith((".png", ".jpg", ".jpeg", ".gif")):
-        raise ValueError("이미지 파일만 업로드 가능합니다.")
-    ext = Path(upload_file.filename).suffix or ""
-    filename = f"{uuid4().hex}{ext}"
-    dest = UPLOAD_DIR / filename
-    # UploadFile in FastAPI may be SpooledTemporaryFile with .file attribute.
-    # We assume caller passes UploadFile (async) but here used in router after await read.
-    # We'll accept bytes or file-like object. Expect bytes passed in 'content' param typically.
-    if hasattr(upload_file, "read"):  # file-like / UploadFile object
-        content = upload_file.read()
-    else:
-        content = upload_file  # already bytes
-    with open(dest, "wb") as f:
-        f.write(content)
-    return filename
+from Controllers.counter_controller import log_change
+from utils.password_hasher import hash_password_async
+from utils.blob_store import release_blob_async
+from utils.session_tokens import SessionUser, issue_token, forget_user
 
 # --- 검증 및 DB 저장 함수 ---
-def edit_profile_db(image_bytes_or_upload, email: str, password: str = None, password_confirm: str = None, nickname: str = None) -> dict:
+async def edit_profile_db(profile_image: Optional[str], email: str, password: str = None, password_confirm: str = None, nickname: str = None, session_user: Optional[SessionUser] = None) -> dict:
     """
-    - image_bytes_or_upload: raw bytes OR an object with .read() returning bytes
+    - profile_image: 라우터에서 utils.uploads.save_upload 로 이미 저장한 파일명 (없으면 None)
+    - session_user: 세션 토큰의 사용자. 이미 있는 계정을 수정할 때는 그 계정의 토큰이어야 합니다 (없으면 401)
     - Returns dict like {"success": bool, "message": str, "data": {...}}
     """
-    # 1) 이미지 검사 (optional)
-    filename = None
-    if image_bytes_or_upload:
-        # We cannot check content_type here because router will pass bytes; router checks mime
-        # For safety, require router to check filename; here we accept bytes and filename separately.
-        # If image_bytes_or_upload is tuple (filename, bytes), handle that.
-        if isinstance(image_bytes_or_upload, tuple) and len(image_bytes_or_upload) == 2:
-            orig_name, content_bytes = image_bytes_or_upload
-            name_low = orig_name.lower()
-            if not name_low.endswith((".png", ".jpg", ".jpeg", ".gif")):
-                return {"success": False, "message": "이미지 파일만 업로드 가능합니다."}
-            # save
-            ext = Path(orig_name).suffix or ""
-            filename = f"{uuid4().hex}{ext}"
-            dest = UPLOAD_DIR / filename
-            with open(dest, "wb") as f:
-                f.write(content_bytes)
-        else:
-            # fallback: try to read .read() or treat as bytes
-            try:
-                content = image_bytes_or_upload.read()
-            except Exception:
-                content = image_bytes_or_upload
-            if not content:
-                filename = None
-            else:
-                # we cannot know original extension; default to .bin (but router sends filename too)
-                filename = f"{uuid4().hex}.bin"
-                with open(UPLOAD_DIR / filename, "wb") as f:
-                    f.write(content)
+    # 1) 이미지는 라우터에서 스트리밍 저장 + 형식/크기 검사를 마친 상태
+    filename = profile_image
 
     # 2) 이메일 형식 검사
     if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
@@ -109,22 +55,31 @@ def edit_profile_db(image_bytes_or_upload, email: str, password: str = None, pas
 
     # 6) DB 중복 이메일 검사 및 저장 (또는 업데이트)
     try:
-        with get_session() as session:
+        # 해싱은 세션을 열기 전에 워커 풀에서 처리
+        hashed = await hash_password_async(password) if password else None
+        async with get_async_session() as session:
             statement = select(User).where(User.email == email)
-            existing = session.exec(statement).first()
+            existing = (await session.exec(statement)).first()
             
             if existing:
-                # Update existing user profile
+                # Update existing user profile - 본인 세션만 수정 가능
+                if session_user is None or session_user.id != existing.id:
+                    raise HTTPException(
+                        status_code=401, detail="로그인이 필요합니다.", headers={"WWW-Authenticate": "Bearer"}
+                    )
                 updated = False
-                if password:
-                    hashed = hash_password(password)
+                if hashed:
                     existing.hashed_password = hashed
+                    existing.token_version += 1  # 비밀번호가 바뀌면 기존 세션 토큰 폐기
+                    await session.exec(log_change(existing.id, entity="user"))
                     updated = True
                 if nickname and nickname.strip():
                     existing.nickname = nickname.strip()
                     updated = True
+                previous_image = existing.profile_image
                 if filename:
                     existing.profile_image = filename
+                    existing.profile_image_variants = None  # 새 이미지의 변형은 백그라운드에서 다시 생성
                     updated = True
                 
                 if not updated:
@@ -134,11 +89,17 @@ def edit_profile_db(image_bytes_or_upload, email: str, password: str = None, pas
                 
                 existing.updated_at = datetime.utcnow()
                 session.add(existing)
-                session.commit()
-                session.refresh(existing)
+                await session.commit()
+                await session.refresh(existing)
+                if filename:
+                    await release_blob_async(previous_image)  # 교체된 이미지의 참조 반환
                 
                 user_data = UserResponse.model_validate(existing).model_dump(mode='json')
-                return {"success": True, "message": "프로필이 업데이트되었습니다.", "data": user_data}
+                result = {"success": True, "message": "프로필이 업데이트되었습니다.", "data": user_data}
+                if hashed:
+                    forget_user(existing.id)
+                    result["token"] = issue_token(existing.id, existing.email, existing.token_version)
+                return result
             else:
                 # User doesn't exist - this should not happen for profile updates
                 # If trying to update but user doesn't exist, return error
@@ -149,7 +110,6 @@ def edit_profile_db(image_bytes_or_upload, email: str, password: str = None, pas
                 if not nickname or not nickname.strip():
                     return {"success": False, "message": "닉네임을 입력해주세요"}
                 
-                hashed = hash_password(password)
                 now = datetime.utcnow()
                 user = User(
                     email=email,
@@ -160,14 +120,33 @@ def edit_profile_db(image_bytes_or_upload, email: str, password: str = None, pas
                     updated_at=now
                 )
                 session.add(user)
-                session.commit()
-                session.refresh(user)
+                await session.commit()
+                await session.refresh(user)
 
                 # Build response data - use mode='json' to serialize datetime to ISO format strings
                 user_data = UserResponse.model_validate(user).model_dump(mode='json')
                 return {"success": True, "message": "회원가입이 완료되었습니다.", "data": user_data}
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
         print(f"Database error in edit_profile_db: {error_trace}")
         return {"success": False, "message": f"데이터베이스 오류가 발생했습니다: {str(e)}"}
+
+# --- 이미지 변형 기록 (이미지 워커 풀에서 호출) ---
+def profile_images_missing_variants() -> List[str]:
+    """변형이 기록되지 않은 프로필 이미지 (시작 시 다시 예약)"""
+    with get_session() as session:
+        return session.exec(
+            select(User.profile_image)
+            .where(User.profile_image.is_not(None), User.profile_image_variants.is_(None))
+            .distinct()
+        ).all()
+
+def set_profile_image_variants(profile_image: str, variants_json: str):
+    with get_session() as session:
+        session.exec(
+            update(User).where(User.profile_image == profile_image).values(profile_image_variants=variants_json)
+        )
+        session.commit()
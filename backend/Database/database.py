@@ -1,11 +1,170 @@
+import asyncio
+import os
+from typing import Optional
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine, SQLModel, Session
-from contextlib import contextmanager
+from sqlmodel.ext.asyncio.session import AsyncSession
+from contextlib import asynccontextmanager, contextmanager
+from utils.metrics import instrument_engine
 
-DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+# ==========================
+# 설정 (환경 변수)
+# ==========================
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+# 읽기 전용 엔진 URL - 지정하지 않으면 같은 DB 파일을 query_only 연결로 엽니다 (복제본 등으로 교체 가능)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", DATABASE_URL)
 
-def init_db():
+def to_async_url(url: str) -> str:
+    """sqlite:/// -> sqlite+aiosqlite:/// (다른 DB 는 ASYNC_DATABASE_URL 로 직접 지정)"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL", to_async_url(DATABASE_READ_URL))
+DB_ECHO = os.getenv("DB_ECHO", "0") == "1"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# 시작 시 엔진마다 미리 열어 둘 연결 수 (첫 요청들이 연결/PRAGMA 비용을 내지 않도록)
+DB_WARM_CONNECTIONS = int(os.getenv("DB_WARM_CONNECTIONS", "2"))
+
+# SQLite 연결마다 적용할 PRAGMA
+SQLITE_PRAGMAS = {
+    # WAL: 읽기가 쓰기를 기다리지 않습니다
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    # WAL 에서는 NORMAL 이면 커밋마다 fsync 하지 않아도 DB 가 깨지지 않습니다
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # 쓰기 락을 바로 실패시키지 않고 잠시 기다립니다 (ms)
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+    # 음수는 KiB 단위 (-20000 = 약 20MB)
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-20000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+
+def _engine_kwargs(url: str, pool_size: int) -> dict:
+    kwargs = {
+        "echo": DB_ECHO,
+        "pool_size": pool_size,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        kwargs["pool_pre_ping"] = True
+    return kwargs
+
+
+def _install_sqlite_pragmas(sync_engine, read_only: bool):
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def create_db_engine(url: str, pool_size: int = DB_POOL_SIZE, read_only: bool = False):
+    """
+    Engine factory. SQLite URL이면 연결마다 PRAGMA를 적용하고, 그 외 DB(PostgreSQL 등)는
+    드라이버 기본값에 pool 설정만 적용합니다. 컨트롤러는 URL과 무관하게 get_session()만 사용합니다.
+    """
+    db_engine = create_engine(url, **_engine_kwargs(url, pool_size))
+    if url.startswith("sqlite"):
+        _install_sqlite_pragmas(db_engine, read_only)
+    instrument_engine(db_engine)  # 요청별 DB 시간 (/metrics)
+    return db_engine
+
+
+def create_async_db_engine(url: str, pool_size: int = DB_POOL_SIZE, read_only: bool = False):
+    """create_db_engine 의 async 버전 (SQLite 는 aiosqlite 드라이버)"""
+    db_engine = create_async_engine(url, **_engine_kwargs(url, pool_size))
+    if url.startswith("sqlite"):
+        _install_sqlite_pragmas(db_engine.sync_engine, read_only)
+    instrument_engine(db_engine.sync_engine)
+    return db_engine
+
+
+# 엔진 객체만 만들고 연결은 열지 않습니다 (import 시 I/O 없음) - 연결은 lifespan 의 warm_up_pools() 또는 첫 사용 때
+engine = create_db_engine(DATABASE_URL)
+read_engine = create_db_engine(DATABASE_READ_URL, pool_size=DB_READ_POOL_SIZE, read_only=True)
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+async_read_engine = create_async_db_engine(ASYNC_DATABASE_READ_URL, pool_size=DB_READ_POOL_SIZE, read_only=True)
+
+
+async def warm_up_pools(connections: int = DB_WARM_CONNECTIONS):
+    """엔진마다 connections 개의 연결을 동시에 열었다가 풀에 돌려 놓습니다."""
+    if connections <= 0:
+        return
+
+    def count(pool) -> int:
+        # 풀 크기를 넘겨 연 연결은 반환할 때 닫히므로 풀 크기까지만 엽니다
+        size = getattr(pool, "size", None)
+        return min(connections, size()) if callable(size) else 1
+
+    def warm_sync(db_engine):
+        opened = [db_engine.connect() for _ in range(count(db_engine.pool))]
+        for conn in opened:
+            conn.execute(text("SELECT 1"))
+            conn.close()
+
+    async def warm_async(db_engine):
+        opened = []
+        try:
+            for _ in range(count(db_engine.sync_engine.pool)):
+                conn = await db_engine.connect()
+                opened.append(conn)
+                await conn.execute(text("SELECT 1"))
+        finally:
+            for conn in opened:
+                await conn.close()
+
+    await asyncio.gather(
+        asyncio.to_thread(warm_sync, engine),
+        asyncio.to_thread(warm_sync, read_engine),
+        warm_async(async_engine),
+        warm_async(async_read_engine),
+    )
+
+
+async def dispose_engines():
+    """종료 시 모든 풀의 연결을 닫습니다 (SQLite 는 마지막 연결이 닫힐 때 WAL 체크포인트)."""
+    await async_read_engine.dispose()
+    await async_engine.dispose()
+    read_engine.dispose()
+    engine.dispose()
+
+def init_db(run_migrations: Optional[bool] = None):
+    """
+    없는 테이블을 만들고 대기 중인 스키마 마이그레이션을 실행합니다 (Database/migrate.py).
+    run_migrations 를 생략하면 MIGRATE_ON_STARTUP 을 따릅니다. 실행하지 않는데 대기 중인 마이그레이션이 있으면
+    시작을 거부합니다 - 모델이 아직 없는 컬럼을 조회해 요청마다 실패하는 것보다 낫습니다.
+    """
+    from Database.migrate import MIGRATE_ON_STARTUP, import_models, migrate, pending_migrations
+
+    import_models()
+    # create_all 은 새 테이블만 만듭니다 - 기존 테이블의 컬럼/인덱스 변경은 마이그레이션이 담당
     SQLModel.metadata.create_all(engine)
+    if MIGRATE_ON_STARTUP if run_migrations is None else run_migrations:
+        migrate()
+    else:
+        pending = pending_migrations()
+        if pending:
+            names = ", ".join(f"{m.version:04d}_{m.name}" for m in pending)
+            raise RuntimeError(f"Migrations pending ({names}) - run: python -m Database.migrate")
+
+    from Controllers.counter_controller import ensure_counters
+    ensure_counters()
+
+    from Controllers.search_controller import ensure_search_index
+    ensure_search_index()
 
 @contextmanager
 def get_session():
@@ -19,3 +178,38 @@ def get_session():
         yield session
     finally:
         session.close()
+
+@contextmanager
+def get_read_session():
+    """
+    Read-only session on read_engine. Use for pure SELECT paths:
+    with get_read_session() as session:
+        ...
+    """
+    session = Session(read_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+@asynccontextmanager
+async def get_async_session():
+    """
+    Async session for `async def` routes:
+    async with get_async_session() as session:
+        ...
+    커밋 후에도 객체 속성을 읽을 수 있도록 expire_on_commit=False 로 엽니다.
+    """
+    session = AsyncSession(async_engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+@asynccontextmanager
+async def get_async_read_session():
+    session = AsyncSession(async_read_engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,324 @@
+import argparse
+import importlib
+import os
+import re
+import socket
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, select, delete, insert, update
+
+from Database.database import engine, get_session
+from Models.migration_model import SchemaMigration, MigrationLock
+
+# ==========================
+# 스키마 마이그레이션
+# ==========================
+# create_all 은 없는 테이블만 만들고 기존 테이블은 바꾸지 않습니다. 기존 테이블의 컬럼/인덱스 추가와
+# 데이터 보정은 Database/migrations/NNNN_이름.py 스크립트로 하고, 적용한 버전은 schema_migrations 에 남깁니다.
+#   cd backend
+#   python -m Database.migrate status      # 적용/대기 목록
+#   python -m Database.migrate             # 대기 중인 마이그레이션 실행
+# MIGRATE_ON_STARTUP=1 이면 앱 시작(lifespan) 때도 실행합니다. 오래 걸리는 마이그레이션은
+# 배포 전에 CLI 로 돌리면 기존 서버가 계속 요청을 처리하는 동안 끝낼 수 있습니다.
+#
+# 스크립트 규칙
+# - 모듈에 upgrade() 함수 하나, 모듈 docstring 첫 줄이 설명입니다.
+# - 새 DB 는 create_all 이 최신 모델로 만든 뒤 모든 스크립트를 실행하므로, 각 단계는 여러 번 실행해도
+#   같은 결과여야 합니다 - 아래 add_column / create_index / backfill_in_batches 가 그렇게 동작합니다.
+# - 새 인덱스는 모델에도 같은 이름으로 선언합니다 (새 DB 는 create_all 이 만들고 스크립트는 건너뜀).
+#
+# 잠금: SQLite 는 쓰기 락이 DB 전체라 한 트랜잭션을 짧게 유지합니다.
+# - 인덱스 하나 = 트랜잭션 하나. WAL 이라 인덱스를 만드는 동안에도 읽기는 막히지 않습니다
+#   (PostgreSQL 은 CREATE INDEX CONCURRENTLY).
+# - 백필은 MIGRATION_BATCH_SIZE 행씩 따로 커밋하고 MIGRATION_BATCH_PAUSE 초 쉬어 다른 쓰기가 끼어들 수 있게 합니다.
+# - 여러 워커가 동시에 시작해도 migration_lock 행을 얻은 한 프로세스만 실행하고, 나머지는 끝나기를 기다립니다.
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") == "1"
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+MIGRATION_BATCH_PAUSE = float(os.getenv("MIGRATION_BATCH_PAUSE", "0.05"))
+# 다른 프로세스의 마이그레이션을 기다리는 최대 시간 / 하트비트가 이만큼 멈춘 잠금은 죽은 프로세스 것으로 보고 가져옵니다
+MIGRATION_LOCK_TIMEOUT = float(os.getenv("MIGRATION_LOCK_TIMEOUT", "600"))
+MIGRATION_LOCK_STALE = float(os.getenv("MIGRATION_LOCK_STALE", "120"))
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+MIGRATIONS_PACKAGE = "Database.migrations"
+_SCRIPT_NAME = re.compile(r"^(?P<version>\d{4})_(?P<name>\w+)\.py$")
+_LOCK_NAME = "schema"
+_LOCK_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Migration:
+    __slots__ = ("version", "name", "module")
+
+    def __init__(self, version: int, name: str, module: str):
+        self.version = version
+        self.name = name
+        self.module = module
+
+    @property
+    def description(self) -> str:
+        doc = importlib.import_module(self.module).__doc__ or ""
+        return doc.strip().splitlines()[0] if doc.strip() else self.name
+
+    def upgrade(self):
+        importlib.import_module(self.module).upgrade()
+
+
+def import_models():
+    # 모든 테이블 모델을 metadata 에 등록
+    from Models import editpost_model, makepost_model, signin_model, comment_model, like_model, blob_model, counter_model, changelog_model, rate_limit_model, migration_model  # noqa: F401
+
+
+def discover_migrations() -> List[Migration]:
+    """migrations/ 의 NNNN_이름.py 를 버전 순으로. 같은 버전이 둘이면 오류입니다."""
+    migrations = {}
+    for path in sorted(MIGRATIONS_DIR.glob("*.py")):
+        match = _SCRIPT_NAME.match(path.name)
+        if not match:
+            continue
+        version = int(match.group("version"))
+        if version in migrations:
+            raise RuntimeError(f"Duplicate migration version {version}: {path.name}")
+        migrations[version] = Migration(version, match.group("name"), f"{MIGRATIONS_PACKAGE}.{path.stem}")
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def applied_versions() -> dict:
+    """version -> applied_at"""
+    with get_session() as session:
+        return dict(session.exec(select(SchemaMigration.version, SchemaMigration.applied_at)).all())
+
+
+def pending_migrations() -> List[Migration]:
+    applied = applied_versions()
+    return [migration for migration in discover_migrations() if migration.version not in applied]
+
+
+# ==========================
+# 잠금 (migration_lock 테이블)
+# ==========================
+def _try_lock() -> bool:
+    with get_session() as session:
+        try:
+            session.add(MigrationLock(name=_LOCK_NAME, owner=_LOCK_OWNER))
+            session.commit()
+            return True
+        except IntegrityError:
+            session.rollback()
+        # 하트비트가 멈춘 잠금은 지우고 다음 시도에서 가져옵니다
+        cutoff = datetime.utcnow() - timedelta(seconds=MIGRATION_LOCK_STALE)
+        removed = session.exec(
+            delete(MigrationLock).where(MigrationLock.name == _LOCK_NAME, MigrationLock.heartbeat_at < cutoff)
+        ).rowcount
+        session.commit()
+        if removed:
+            print(f"Migrations: removed stale lock (no heartbeat for {MIGRATION_LOCK_STALE:.0f}s)")
+        return False
+
+
+def heartbeat():
+    """긴 단계 중간에 호출해 잠금이 오래된 것으로 보이지 않게 합니다 (backfill_in_batches 가 배치마다 호출)."""
+    with get_session() as session:
+        session.exec(
+            update(MigrationLock)
+            .where(MigrationLock.name == _LOCK_NAME, MigrationLock.owner == _LOCK_OWNER)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        session.commit()
+
+
+def _unlock():
+    with get_session() as session:
+        session.exec(delete(MigrationLock).where(MigrationLock.name == _LOCK_NAME, MigrationLock.owner == _LOCK_OWNER))
+        session.commit()
+
+
+def _acquire_lock(timeout: float) -> bool:
+    """잠금을 얻으면 True. 다른 프로세스가 실행 중이면 끝날 때까지 기다립니다."""
+    deadline = time.monotonic() + timeout
+    waited = False
+    while True:
+        if _try_lock():
+            return True
+        if not waited:
+            print("Migrations: another process is migrating, waiting")
+            waited = True
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.5)
+
+
+# ==========================
+# 실행
+# ==========================
+def migrate(target: Optional[int] = None, lock_timeout: float = MIGRATION_LOCK_TIMEOUT) -> List[int]:
+    """
+    target 버전까지(없으면 전부) 대기 중인 마이그레이션을 순서대로 실행하고 실행한 버전 목록을 반환합니다.
+    schema_migrations / migration_lock 테이블은 create_all 로 먼저 만들어 두어야 합니다 (init_db).
+    """
+    candidates = [m for m in pending_migrations() if target is None or m.version <= target]
+    if not candidates:
+        return []
+    if not _acquire_lock(lock_timeout):
+        raise RuntimeError(f"Timed out after {lock_timeout:.0f}s waiting for the migration lock")
+    executed = []
+    try:
+        # 기다리는 동안 다른 프로세스가 적용했을 수 있으니 다시 확인합니다
+        for migration in pending_migrations():
+            if target is not None and migration.version > target:
+                break
+            started = time.perf_counter()
+            print(f"Migrations: applying {migration.version:04d}_{migration.name}")
+            migration.upgrade()
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            with get_session() as session:
+                session.add(SchemaMigration(version=migration.version, name=migration.name, duration_ms=duration_ms))
+                session.commit()
+            heartbeat()
+            print(f"Migrations: applied {migration.version:04d}_{migration.name} in {duration_ms} ms")
+            executed.append(migration.version)
+    finally:
+        _unlock()
+    return executed
+
+
+# ==========================
+# 스크립트용 도우미 - 모두 여러 번 실행해도 안전합니다
+# ==========================
+def _is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def has_column(table: str, column: str) -> bool:
+    inspector = inspect(engine)
+    return inspector.has_table(table) and column in {c["name"] for c in inspector.get_columns(table)}
+
+
+def add_column(table: str, column: str, ddl: str) -> bool:
+    """
+    ALTER TABLE ADD COLUMN (컬럼이 이미 있으면 건너뜀). NOT NULL 컬럼은 DEFAULT 가 있어야 합니다.
+    SQLite 의 ADD COLUMN 은 기존 행을 다시 쓰지 않아 테이블 크기와 상관없이 바로 끝납니다.
+    """
+    if has_column(table, column):
+        return False
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl}')
+    return True
+
+
+def create_index(name: str, table: str, columns: Sequence[str], unique: bool = False) -> bool:
+    """인덱스 하나를 자기 트랜잭션에서 만듭니다 (이미 있으면 건너뜀). 만들었으면 True."""
+    if name in {index["name"] for index in inspect(engine).get_indexes(table)}:
+        return False
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    unique_sql = "UNIQUE " if unique else ""
+    if _is_postgres():
+        # CONCURRENTLY 는 트랜잭션 밖에서만 실행할 수 있습니다
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(
+                f'CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" ({column_list})'
+            )
+        return True
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f'CREATE {unique_sql}INDEX IF NOT EXISTS "{name}" ON "{table}" ({column_list})')
+    return True
+
+
+def backfill_in_batches(
+    table: str,
+    apply_batch: Callable[[object, int, int], int],
+    batch_size: Optional[int] = None,
+    pause: Optional[float] = None,
+) -> Tuple[int, int]:
+    """
+    table 의 id 범위를 batch_size 씩 나눠 apply_batch(conn, first_id, last_id) 를 각자 트랜잭션에서 호출합니다.
+    apply_batch 는 바꾼 행 수를 반환합니다. (배치 수, 바꾼 행 수) 를 반환합니다.
+    범위는 시작 시점의 MAX(id) 까지입니다 - 그 뒤에 생긴 행은 앱이 처음부터 올바른 값으로 씁니다.
+    """
+    batch_size = batch_size or MIGRATION_BATCH_SIZE
+    pause = MIGRATION_BATCH_PAUSE if pause is None else pause
+    with engine.connect() as conn:
+        low, high = conn.exec_driver_sql(f'SELECT MIN(id), MAX(id) FROM "{table}"').one()
+    if low is None:
+        return 0, 0
+    batches = changed = 0
+    for first_id in range(low, high + 1, batch_size):
+        with engine.begin() as conn:
+            changed += apply_batch(conn, first_id, min(first_id + batch_size - 1, high)) or 0
+        batches += 1
+        heartbeat()
+        if pause:
+            time.sleep(pause)
+    return batches, changed
+
+
+# posts.likes / comments_count 를 likes/comments 테이블에서 다시 센 값과 비교합니다 (views 는 원본 기록이 없어 제외)
+_MISMATCHED_POST_COUNTERS = text("""
+    SELECT id, actual_likes, actual_comments FROM (
+        SELECT p.id, p.likes, p.comments_count,
+               (SELECT COUNT(*) FROM likes l WHERE l.post_id = p.id) AS actual_likes,
+               (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id) AS actual_comments
+        FROM posts p
+        WHERE p.id BETWEEN :first_id AND :last_id
+    ) AS counted
+    WHERE likes != actual_likes OR comments_count != actual_comments
+""")
+
+
+def recount_post_counters(conn, first_id: int, last_id: int) -> int:
+    """
+    backfill_in_batches("posts", recount_post_counters) 용 배치 - 카운터가 틀린 게시글만 고치고 고친 수를 반환합니다.
+    같은 트랜잭션에서 version 을 올리고 change_log 에 남겨 ETag 와 다른 워커의 상세 캐시도 새 값을 보게 합니다.
+    """
+    from Controllers.counter_controller import bump_counter
+    from Models.changelog_model import ChangeLog
+    from Models.makepost_model import Post
+
+    rows = conn.execute(_MISMATCHED_POST_COUNTERS, {"first_id": first_id, "last_id": last_id}).all()
+    if not rows:
+        return 0
+    now = datetime.utcnow()
+    conn.execute(
+        update(Post)
+        .where(Post.id == bindparam("post_id"))
+        .values(likes=bindparam("actual_likes"), comments_count=bindparam("actual_comments"),
+                version=Post.version + 1, updated_at=now),
+        [{"post_id": post_id, "actual_likes": likes, "actual_comments": comments} for post_id, likes, comments in rows],
+    )
+    conn.execute(insert(ChangeLog), [{"entity": "post", "entity_id": row[0], "created_at": now} for row in rows])
+    conn.execute(bump_counter())
+    return len(rows)
+
+
+# ==========================
+# CLI
+# ==========================
+def print_status():
+    applied = applied_versions()
+    for migration in discover_migrations():
+        state = f"applied {applied[migration.version]:%Y-%m-%d %H:%M:%S}" if migration.version in applied else "pending"
+        print(f"{migration.version:04d}  {migration.name:<32} {state:<28} {migration.description}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run schema migrations")
+    parser.add_argument("command", nargs="?", choices=("upgrade", "status"), default="upgrade")
+    parser.add_argument("--target", type=int, help="stop after this version")
+    args = parser.parse_args(argv)
+
+    import_models()
+    SQLModel.metadata.create_all(engine)
+    if args.command == "status":
+        print_status()
+        return 0
+    executed = migrate(target=args.target)
+    print(f"Migrations: {len(executed)} applied" + (f" ({', '.join(f'{v:04d}' for v in executed)})" if executed else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
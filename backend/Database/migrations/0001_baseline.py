@@ -0,0 +1,23 @@
+"""Columns added to posts/user before migrations existed (replaces add_missing_columns)"""
+from Database.migrate import add_column, create_index
+
+# 처음 배포된 스키마(posts, user, edit_posts) 이후 모델에 추가된 컬럼들입니다.
+# 이전에는 init_db 가 모델과 테이블을 비교해 매번 ALTER TABLE 했는데, 그 시점의 DB 를 이 버전으로 맞춥니다.
+# 새 DB 는 create_all 이 이미 모두 만들어 두었으므로 전부 건너뜁니다.
+LEGACY_COLUMNS = [
+    ("posts", "image_variants", "VARCHAR"),
+    ("posts", "updated_at", "DATETIME"),
+    ("posts", "version", "INTEGER NOT NULL DEFAULT 0"),
+    ("posts", "views", "INTEGER NOT NULL DEFAULT 0"),
+    ("posts", "likes", "INTEGER NOT NULL DEFAULT 0"),
+    ("posts", "comments_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("user", "profile_image_variants", "VARCHAR"),
+    ("user", "token_version", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+
+def upgrade():
+    for table, column, ddl in LEGACY_COLUMNS:
+        add_column(table, column, ddl)
+    # 피드 keyset 인덱스 - 예전 init_db 가 기존 posts 테이블에 따로 만들던 것
+    create_index("ix_posts_created_at_id", "posts", ["created_at", "id"])
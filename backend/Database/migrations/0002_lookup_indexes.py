@@ -0,0 +1,19 @@
+"""Indexes for image variant write-back and edit_posts lookups"""
+from Database.migrate import create_index
+
+# 모델에도 같은 이름으로 선언되어 있습니다 (새 DB 는 create_all 이 만듦).
+# - posts.image_filename / user.profile_image : 이미지 워커가 변형 파일명을 기록할 때의 UPDATE ... WHERE
+#   (없으면 쓰기 락을 잡은 채 테이블 전체를 훑습니다)
+# - edit_posts (file_name, version) : 같은 파일의 버전 조회
+# - comments.post_id : 이전 init_db 가 만들었지만 그 전에 생긴 DB 를 위해 한 번 더 보장
+INDEXES = [
+    ("ix_posts_image_filename", "posts", ["image_filename"]),
+    ("ix_user_profile_image", "user", ["profile_image"]),
+    ("ix_edit_posts_file_name_version", "edit_posts", ["file_name", "version"]),
+    ("ix_comments_post_id", "comments", ["post_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        create_index(name, table, columns)
@@ -0,0 +1,10 @@
+"""Recount posts.likes and posts.comments_count from the likes/comments tables"""
+from Database.migrate import backfill_in_batches, recount_post_counters
+
+# 카운터 컬럼은 나중에 DEFAULT 0 으로 추가되었으므로, 그 전에 있던 좋아요/댓글이 반영되지 않은 게시글을 바로잡습니다.
+# 배치마다 값이 다른 게시글만 고칩니다 (Database.migrate.recount_post_counters).
+
+
+def upgrade():
+    batches, changed = backfill_in_batches("posts", recount_post_counters)
+    print(f"Migrations: recounted posts in {batches} batches, {changed} corrected")
@@ -0,0 +1,49 @@
+"""Unique (post_id, user_id) on likes, after removing duplicate per-user and anonymous likes"""
+from sqlalchemy import text
+
+from Database.database import engine
+from Database.migrate import backfill_in_batches, recount_post_counters
+
+# 이전 토글은 "지우고 없으면 추가" 라 같은 사용자의 동시 요청이 같은 좋아요를 두 번 넣을 수 있었습니다.
+# 가장 오래된 행만 남기고 지운 뒤 유니크 인덱스를 만들고, 지운 행이 있으면 posts.likes 를 다시 셉니다.
+# 비로그인 좋아요(user_id NULL)는 모든 방문자가 공유하던 게시글당 한 행이라 함께 지웁니다.
+# 정리는 id 범위 배치로 커밋하고, 마지막 짧은 트랜잭션에서 그 사이에 들어온 행만 다시 정리한 뒤 인덱스를 만듭니다
+# (정리와 인덱스 생성 사이에 새 중복이 들어오면 인덱스 생성이 실패하므로).
+_DELETE_ANONYMOUS = text("""
+    DELETE FROM likes
+    WHERE id BETWEEN :first_id AND :last_id AND user_id IS NULL
+""")
+_DELETE_DUPLICATES = text("""
+    DELETE FROM likes
+    WHERE id BETWEEN :first_id AND :last_id
+      AND id > (SELECT MIN(l.id) FROM likes l WHERE l.post_id = likes.post_id AND l.user_id = likes.user_id)
+""")
+
+
+def upgrade():
+    removed = {"anonymous": 0, "duplicates": 0, "max_id": 0}
+
+    def delete_batch(conn, first_id: int, last_id: int) -> int:
+        bounds = {"first_id": first_id, "last_id": last_id}
+        anonymous = conn.execute(_DELETE_ANONYMOUS, bounds).rowcount
+        duplicates = conn.execute(_DELETE_DUPLICATES, bounds).rowcount
+        removed["anonymous"] += anonymous
+        removed["duplicates"] += duplicates
+        removed["max_id"] = conn.exec_driver_sql('SELECT MAX(id) FROM "likes"').scalar() or 0
+        return anonymous + duplicates
+
+    with engine.connect() as conn:
+        high = conn.exec_driver_sql('SELECT MAX(id) FROM "likes"').scalar() or 0
+    backfill_in_batches("likes", delete_batch)
+    # 배치 중에 이전 버전 앱이 넣은 행은 id 가 high 보다 크고, 마지막 배치 뒤에 넣은 행은 그 배치 직후 MAX(id) 보다 큽니다
+    # (rowid 는 재사용될 수 있어 high 만으로는 부족) - 마지막 트랜잭션은 그 뒤의 행만 정리합니다
+    after = min(high, removed["max_id"])
+    with engine.begin() as conn:
+        delete_batch(conn, after + 1, conn.exec_driver_sql('SELECT MAX(id) FROM "likes"').scalar() or 0)
+        conn.exec_driver_sql('CREATE UNIQUE INDEX IF NOT EXISTS "ux_likes_post_id_user_id" ON "likes" ("post_id", "user_id")')
+    if removed["anonymous"] or removed["duplicates"]:
+        _, changed = backfill_in_batches("posts", recount_post_counters)
+        print(
+            f"Migrations: removed {removed['anonymous']} anonymous and {removed['duplicates']} duplicate likes, "
+            f"{changed} posts recounted"
+        )
@@ -0,0 +1,12 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class Blob(SQLModel, table=True):
+    __tablename__ = "blobs"
+
+    sha256: str = Field(primary_key=True)
+    filename: str  # uploaded_images/ 기준 상대 경로 (ab/cd/<sha256>.<ext>)
+    size: int
+    ref_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
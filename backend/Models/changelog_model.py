@@ -0,0 +1,12 @@
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class ChangeLog(SQLModel, table=True):
+    __tablename__ = "change_log"
+
+    # 워커들이 "id > 마지막으로 본 id" 로 폴링합니다
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity: str  # "post"
+    entity_id: int
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,9 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class Counter(SQLModel, table=True):
+    __tablename__ = "counters"
+
+    name: str = Field(primary_key=True)
+    value: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,9 +1,10 @@
 from typing import Optional
 from datetime import datetime
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Index
 
 class Post(SQLModel, table=True):
     __tablename__ = "edit_posts"
+    __table_args__ = (Index("ix_edit_posts_file_name_version", "file_name", "version"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     file_name: str
@@ -0,0 +1,13 @@
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field, Index
+
+class Like(SQLModel, table=True):
+    __tablename__ = "likes"
+    # 사용자당 게시글 하나에 좋아요 한 번 - 동시 요청/재시도의 중복 INSERT 를 DB 가 막습니다
+    __table_args__ = (Index("ux_likes_post_id_user_id", "post_id", "user_id", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    post_id: int = Field(foreign_key="posts.id", index=True)
+    user_id: int = Field(foreign_key="user.id")  # 좋아요는 로그인 사용자만 (비로그인 좋아요는 0004 마이그레이션에서 삭제)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
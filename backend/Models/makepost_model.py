@@ -1,12 +1,22 @@
 from typing import Optional
 from datetime import datetime
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Index
 
 class Post(SQLModel, table=True):
     __tablename__ = "posts"
+    # 피드 keyset 페이지네이션 (created_at DESC, id DESC) 용 복합 인덱스
+    __table_args__ = (Index("ix_posts_created_at_id", "created_at", "id"),)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=26)
     content: str
-    image_filename: Optional[str] = None
+    image_filename: Optional[str] = Field(default=None, index=True)  # 이미지 변형 기록 시 조회
+    image_variants: Optional[str] = None  # 리사이즈 변형 파일명 JSON {"thumb": ..., "detail": ...}
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # 조건부 GET 용 - 내용/좋아요/댓글이 바뀔 때마다 증가 (조회수는 제외)
+    updated_at: Optional[datetime] = None
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # 비정규화 카운터 - 상세 페이지가 댓글/좋아요를 집계하지 않고 바로 읽습니다.
+    views: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    likes: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    comments_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
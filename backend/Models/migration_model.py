@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class SchemaMigration(SQLModel, table=True):
+    __tablename__ = "schema_migrations"
+
+    # Database/migrations/NNNN_name.py 의 NNNN
+    version: int = Field(primary_key=True)
+    name: str
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
+    duration_ms: float = 0
+
+class MigrationLock(SQLModel, table=True):
+    __tablename__ = "migration_lock"
+
+    # 한 번에 한 프로세스만 마이그레이션을 실행합니다 (행이 있으면 잠김)
+    name: str = Field(primary_key=True)
+    owner: str
+    heartbeat_at: datetime = Field(default_factory=datetime.utcnow)
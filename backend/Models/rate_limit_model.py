@@ -0,0 +1,10 @@
+from sqlmodel import SQLModel, Field
+
+class RateLimit(SQLModel, table=True):
+    __tablename__ = "rate_limits"
+
+    # 워커 여러 개가 같은 버킷을 쓰도록 하는 공유 저장소 (LOGIN_RATE_STORE=sqlite)
+    key: str = Field(primary_key=True)  # "ip:1.2.3.4" / "email:user@example.com"
+    tokens: float
+    updated_at: float = Field(index=True)  # time.time()
+    allowed: bool = True  # 마지막 요청이 토큰을 얻었는지
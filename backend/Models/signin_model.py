@@ -7,6 +7,9 @@ class User(SQLModel, table=True):
     email: str = Field(index=True, unique=True)
     hashed_password: str
     nickname: str
-    profile_image: Optional[str] = None  # 파일명 또는 경로
+    profile_image: Optional[str] = Field(default=None, index=True)  # 파일명 또는 경로
+    profile_image_variants: Optional[str] = None  # 리사이즈 변형 파일명 JSON {"avatar": ...}
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # 올리면 이전에 발급된 세션 토큰이 모두 무효가 됩니다 (비밀번호 변경 등)
+    token_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
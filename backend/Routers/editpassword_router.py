@@ -1,21 +1,36 @@
-from fastapi import APIRouter, Form
+from typing import Optional
+from fastapi import APIRouter, Depends, Form, HTTPException
 from fastapi.responses import JSONResponse
 from Controllers.editpassword_controller import change_password
+from utils.session_tokens import SessionUser, require_session
 
 router = APIRouter(prefix="/user", tags=['user'])
 
 @router.post("/change")
 async def change_password_route(
-    email: str = Form(...),
     password: str = Form(...),
-    password_confirm: str = Form(...)
+    password_confirm: str = Form(...),
+    email: Optional[str] = Form(None),
+    session_user: SessionUser = Depends(require_session)
 ):
+    """
+    세션 토큰의 사용자 비밀번호를 바꿉니다. 성공하면 기존 토큰은 폐기되고 응답의 token 을 써야 합니다.
+    (email 은 예전 클라이언트 호환용 - 보내면 토큰의 이메일과 같아야 합니다)
+    """
     try:
-        result = change_password(email, password, password_confirm)
+        if email and email.strip() != session_user.email:
+            raise HTTPException(status_code=403, detail="본인 계정만 변경할 수 있습니다.")
+        result = await change_password(session_user.id, password, password_confirm)
         if result.get("success"):
             return JSONResponse(status_code=200, content=result)
         else:
             return JSONResponse(status_code=400, content=result)
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"success": False, "message": e.detail},
+            headers=e.headers
+        )
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
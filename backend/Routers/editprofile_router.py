@@ -1,23 +1,31 @@
-from fastapi import APIRouter, Form, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Form, HTTPException
 from fastapi.responses import JSONResponse
-from Controllers.editprofile_controller import delete_user
+from Controllers.editprofile_controller import delete_user_async
+from utils.session_tokens import SessionUser, require_session
 
 router = APIRouter(prefix="/user", tags=["user"])
 
 # 회원 탈퇴
 @router.post("/delete")
-def delete(email: str = Form(...), confirm: bool = Form(...)):
+async def delete(
+    confirm: bool = Form(...),
+    email: Optional[str] = Form(None),
+    session_user: SessionUser = Depends(require_session)
+):
     """
-    Delete user account from database
+    Delete the account of the session token's user (its tokens stop working)
     """
     try:
+        if email and email.strip() != session_user.email:
+            raise HTTPException(status_code=403, detail="본인 계정만 탈퇴할 수 있습니다.")
         if not confirm:
             return JSONResponse(
                 status_code=200,
                 content={"message": "탈퇴가 취소되었습니다.", "success": False}
             )
         
-        result = delete_user(email)
+        result = await delete_user_async(session_user.email)
         return JSONResponse(status_code=200, content=result)
     except HTTPException as e:
         return JSONResponse(
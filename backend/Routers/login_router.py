@@ -1,26 +1,39 @@
-from fastapi import APIRouter, Form, HTTPException
+import os
+from fastapi import APIRouter, Form, HTTPException, Request
 from fastapi.responses import JSONResponse
 from Controllers.login_controller import login_user
 
 router = APIRouter(prefix="/auth", tags=["Login"])
 
+# 리버스 프록시 뒤에서만 켜세요 - 켜면 X-Forwarded-For 의 첫 주소를 클라이언트 IP 로 씁니다
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "0") == "1"
+
+def client_ip(request: Request):
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
 # ==========================
 # 로그인 라우트
 # ==========================
 @router.post("/login")
 async def login(
+    request: Request,
     email: str = Form(...),
     password: str = Form(...)
 ):
     """
     1. 이메일/비밀번호 유효성 검사
     2. 로그인 성공 시 게시글 목록(/posts)로 이동
+    IP/이메일별 시도 한도를 넘으면 비밀번호를 검증하지 않고 429
     """
     try:
-        result = login_user(email, password)
+        result = await login_user(email, password, client_ip(request))
         return JSONResponse(status_code=200, content=result)
     except HTTPException as e:
-        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+        return JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
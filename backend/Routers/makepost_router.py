@@ -1,35 +1,27 @@
-from fastapi import APIRouter, Form, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, Form, UploadFile, File, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from pathlib import Path
-from uuid import uuid4
-from datetime import datetime
 
-from Controllers.makepost_controller import create_post_in_db, list_posts_from_db, get_post_from_db
-from Schemas.makepost_schemas import PostCreate, PostResponse
-from Database.database import init_db
-
-UPLOAD_DIR = Path("uploaded_images")
-UPLOAD_DIR.mkdir(exist_ok=True)
+from Controllers.makepost_controller import (
+    create_post_in_db_async, list_posts_page_async,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+)
+from Schemas.makepost_schemas import PostCreate, PostResponse, PostPage, SearchPage
+from Controllers.search_controller import search_posts_async
+from Controllers.counter_controller import get_feed_version_async
+from Controllers.like_controller import liked_post_ids_async
+from utils.uploads import save_upload, discard_upload
+from utils.image_variants import schedule_post_variants
+from utils.event_hub import subscribe
+from utils.http_cache import make_etag, cache_headers, is_not_modified, not_modified, FEED_CACHE_CONTROL
+from utils.json_response import FastJSONResponse
+from utils.session_tokens import SessionUser, require_session
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
-# create DB tables on import/startup (you can move to app startup event if preferred)
-init_db()
-
 async def save_upload_file(file: UploadFile) -> Optional[str]:
-    if not file:
-        return None
-    # 허용되는 MIME 타입 검사 (필요시 확장)
-    if file.content_type not in ["image/png", "image/jpeg", "image/jpg", "image/gif"]:
-        raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
-    ext = Path(file.filename).suffix or ""
-    filename = f"{uuid4().hex}{ext}"
-    dest = UPLOAD_DIR / filename
-    # UploadFile.read() is async
-    content = await file.read()
-    with open(dest, "wb") as f:
-        f.write(content)
-    return filename  # DB에는 파일명(또는 경로)을 저장
+    # 청크 단위 스트리밍 저장 + 크기 제한(413) + magic bytes 검사
+    return await save_upload(file)  # DB에는 파일명(또는 경로)을 저장
 
 @router.post("/", response_model=PostResponse)
 async def add_post(
@@ -46,26 +38,90 @@ async def add_post(
     # 이미지 저장 (비동기)
     image_filename = await save_upload_file(image) if image else None
 
-    # DB DTO (Pydantic)
-    post_in = PostCreate(title=title, content=content, image_filename=image_filename)
-
-    # DB 저장 (동기 controller)
-    post = create_post_in_db(post_in)
+    # DB DTO (Pydantic) + DB 저장 (async controller) - 실패하면 업로드한 이미지 참조 반환
+    try:
+        post_in = PostCreate(title=title, content=content, image_filename=image_filename)
+        post = await create_post_in_db_async(post_in)
+    except Exception:
+        await discard_upload(image_filename)
+        raise
+    # 썸네일/상세용 변형은 응답을 기다리게 하지 않고 백그라운드에서 생성
+    schedule_post_variants(image_filename)
     return post  # response_model=PostResponse로 자동 직렬화
 
-@router.get("/", response_model=List[PostResponse])
-def get_posts():
+@router.get("/stream")
+async def stream_posts(last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events - 새 게시글/댓글/좋아요 변경분을 실시간으로 보냅니다.
+    EventSource 가 재연결할 때 보내는 Last-Event-ID 이후의 이벤트는 재전송 버퍼에서 다시 보냅니다.
+    """
+    return StreamingResponse(
+        subscribe(last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 가 스트림을 버퍼링하지 않도록
+        },
+    )
+
+@router.get("/search", response_model=SearchPage)
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=100),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    Full-text search over title/content, most relevant first
+    - q: 공백으로 구분된 단어는 모두 포함(AND). 3글자 미만 단어는 색인 대신 LIKE 로 검사
+    - cursor: 이전 응답의 next_cursor
+    """
+    items, next_cursor = await search_posts_async(q, cursor, limit)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+
+@router.get("/liked")
+async def get_liked_posts(
+    ids: str = Query(..., max_length=1000, description="comma-separated post ids, e.g. one feed page"),
+    session_user: SessionUser = Depends(require_session)
+):
+    """
+    Which of these posts the current user has liked - one query for a whole feed page
+    피드 응답은 공유 캐시용이라 사용자별 좋아요 여부를 넣지 않고 이 요청으로 따로 받습니다.
+    """
+    try:
+        post_ids = {int(part) for part in ids.split(",") if part.strip()}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if len(post_ids) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PAGE_SIZE} ids")
+    liked = await liked_post_ids_async(session_user.id, post_ids)
+    return FastJSONResponse({"liked": sorted(liked)}, headers={"Cache-Control": "private, no-store"})
+
+@router.get("/", response_model=PostPage)
+async def get_posts(
+    request: Request,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
     """
-    Get all posts from database
+    Get one page of posts from database (newest first)
+    - cursor: 이전 응답의 next_cursor (첫 페이지는 생략)
+    - limit: 페이지 크기 (최대 MAX_PAGE_SIZE)
+    - If-None-Match / If-Modified-Since 가 최신이면 게시글을 조회하지 않고 304
     """
     try:
-        posts = list_posts_from_db()
-        # FastAPI will automatically serialize using response_model
-        # Return empty list if no posts
-        return list(posts) if posts else []
+        # 전역 변경 카운터 + 조회수 epoch (카운터 두 행 조회 한 번)로 피드 버전을 판단
+        feed_version, views_epoch, last_modified = await get_feed_version_async()
+        headers = cache_headers(make_etag("feed", feed_version, views_epoch), last_modified, FEED_CACHE_CONTROL)
+        if is_not_modified(request, headers["ETag"], last_modified):
+            return not_modified(headers)
+        # 컬럼 튜플 -> dict -> orjson 으로 바로 인코딩 (response_model 검증/직렬화를 거치지 않음)
+        posts, next_cursor = await list_posts_page_async(cursor, limit)
+        return FastJSONResponse({"items": posts, "next_cursor": next_cursor}, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
         print(f"Error in get_posts: {error_trace}")
-        # Return empty list on error instead of crashing
-        return []
+        # Return empty page on error instead of crashing
+        return {"items": [], "next_cursor": None}
@@ -1,46 +1,86 @@
-from fastapi import APIRouter, Form, UploadFile, File, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Form, UploadFile, File, HTTPException, Request, Query
+from typing import List, Optional
 from fastapi.responses import JSONResponse
 from Controllers.post_controller import (
     get_post, create_post, update_post, delete_post,
-    increment_views, toggle_like, add_comment, update_comment, delete_comment,
+    increment_views, toggle_like, set_like, unset_like, add_comment, update_comment, delete_comment, list_comments_page,
     Post, Comment
 )
+from Controllers.comment_controller import (
+    add_comment_in_db, update_comment_in_db, delete_comment_in_db, list_comments_page_in_db,
+    DEFAULT_COMMENT_PAGE_SIZE, MAX_COMMENT_PAGE_SIZE
+)
+from Controllers.like_controller import toggle_like_in_db, set_like_in_db, unset_like_in_db, is_liked_in_db
+from Schemas.comment_schemas import CommentResponse, CommentPage
+from Schemas.makepost_schemas import post_payload
+from utils.view_counter import record_view
+from utils import post_cache
+from utils.image_variants import schedule_post_variants
+from utils.http_cache import make_etag, cache_headers, is_not_modified, not_modified, POST_CACHE_CONTROL, PRIVATE_CACHE_CONTROL
+from utils.session_tokens import SessionUser, optional_session, require_session
+from utils.json_response import FastJSONResponse
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+def _detail_headers(post_id: int, version: int, last_modified, session_user: Optional[SessionUser]) -> dict:
+    """
+    로그인 사용자의 상세 응답에는 본인 좋아요 여부가 들어가므로 사용자별 ETag + 공유 캐시 금지.
+    비로그인 응답도 Vary: Authorization 으로 CDN 이 로그인 요청에 재사용하지 않게 합니다.
+    """
+    if session_user is None:
+        headers = cache_headers(make_etag("post", post_id, version), last_modified, POST_CACHE_CONTROL)
+    else:
+        headers = cache_headers(make_etag("post", post_id, version, "u", session_user.id), last_modified, PRIVATE_CACHE_CONTROL)
+    headers["Vary"] = "Authorization"
+    return headers
+
 # 게시글 CRUD
 @router.post("/", response_model=Post)
 def api_create_post(title: str = Form(...), content: str = Form(...)):
     return create_post(title, content)
 
 @router.get("/{post_id}")
-def api_get_post(post_id: int):
+def api_get_post(post_id: int, request: Request, session_user: Optional[SessionUser] = Depends(optional_session)):
     """
     Get a single post - try database first, fallback to in-memory
+    If-None-Match / If-Modified-Since 가 최신이면 본문/댓글을 조회하지 않고 304
+    직렬화된 응답은 utils.post_cache 에 보관되어 수정/삭제/좋아요/댓글 시 무효화됩니다
+    캐시된 liked 는 비로그인 기준 - 로그인 사용자는 본인 좋아요 여부로 바꾸고 private 캐시로 보냅니다
     """
-    from Controllers.makepost_controller import get_post_from_db
-    from Schemas.makepost_schemas import PostResponse
-    from fastapi.responses import JSONResponse
+    from Controllers.makepost_controller import load_post_detail, get_post_version
     from fastapi import HTTPException
     
     try:
-        # Try to get from database first
-        post = get_post_from_db(post_id)
-        # Convert to response schema
-        post_response = PostResponse.model_validate(post).model_dump(mode='json')
-        # Add default values for views, likes, comments
-        post_response['views'] = 0
-        post_response['likes'] = 0
-        post_response['liked'] = False
-        post_response['comments'] = []
-        return JSONResponse(status_code=200, content=post_response)
+        cached = post_cache.get(post_id)
+        if cached is not None:
+            version, last_modified, payload = cached
+        else:
+            # 버전만 먼저 조회 (PK 조회, 좁은 컬럼)
+            version_row = get_post_version(post_id)
+            if version_row is None:
+                raise HTTPException(status_code=404, detail="Post not found")
+            version, last_modified = version_row
+            payload = None
+        headers = _detail_headers(post_id, version, last_modified, session_user)
+        if is_not_modified(request, headers["ETag"], last_modified):
+            record_view(post_id)
+            return not_modified(headers)
+
+        if payload is None:
+            # Try to get from database first (컬럼 튜플 조회 -> 검증 없이 dict, 캐시에 저장)
+            version, last_modified, payload = load_post_detail(post_id)
+            headers = _detail_headers(post_id, version, last_modified, session_user)
+        # 조회수는 버퍼에 기록 - 저장된 값 + 아직 반영되지 않은 증가분 (캐시된 payload 는 복사해서 수정)
+        post_response = dict(payload)
+        post_response['views'] = payload['views'] + record_view(post_id)
+        if session_user is not None:
+            post_response['liked'] = is_liked_in_db(post_id, session_user.id)
+        return FastJSONResponse(status_code=200, content=post_response, headers=headers)
     except HTTPException:
         # If not found in database, try in-memory (for backward compatibility)
         try:
             increment_views(post_id)
-            post = get_post(post_id)
-            return post
+            return get_post(post_id).to_dict(session_user.id if session_user else None)
         except:
             raise HTTPException(status_code=404, detail="Post not found")
 
@@ -54,24 +94,28 @@ async def api_update_post(
     """
     Update an existing post in the database
     """
-    from Controllers.makepost_controller import update_post_in_db
-    from Schemas.makepost_schemas import PostResponse
+    from Controllers.makepost_controller import update_post_in_db_async
     from fastapi.responses import JSONResponse
     from Routers.makepost_router import save_upload_file
+    from utils.uploads import discard_upload
     from typing import Optional
     
+    image_filename: Optional[str] = None
     try:
         # Save new image if provided
-        image_filename: Optional[str] = None
         if image:
             image_filename = await save_upload_file(image)
         
         # Update post in database
-        post = update_post_in_db(post_id, title, content, image_filename)
+        try:
+            post = await update_post_in_db_async(post_id, title, content, image_filename)
+        except Exception:
+            await discard_upload(image_filename)  # 업로드한 이미지 참조 반환
+            raise
+        schedule_post_variants(image_filename)
         
-        # Convert to response schema
-        post_response = PostResponse.model_validate(post).model_dump(mode='json')
-        return JSONResponse(status_code=200, content=post_response)
+        # Convert to response schema (PostResponse 모양, 검증/이중 인코딩 없이)
+        return FastJSONResponse(status_code=200, content=post_payload(post))
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
     except Exception as e:
@@ -85,22 +129,85 @@ async def api_update_post(
 
 @router.delete("/{post_id}")
 def api_delete_post(post_id: int):
-    return delete_post(post_id)
+    """
+    Delete a post - database first, fallback to in-memory
+    """
+    from Controllers.makepost_controller import delete_post_in_db
+
+    try:
+        return delete_post_in_db(post_id)
+    except HTTPException:
+        return delete_post(post_id)
+
+# 좋아요 - DB 게시글 우선, 없으면 메모리 저장소 (하위 호환)
+# PUT/DELETE 는 멱등 (같은 요청을 다시 보내도 좋아요 수가 바뀌지 않음) - 재시도해도 안전합니다
+@router.put("/{post_id}/like")
+def api_like_post(post_id: int, session_user: SessionUser = Depends(require_session)):
+    try:
+        likes, changed = set_like_in_db(post_id, session_user.id)
+    except HTTPException:
+        likes, changed = set_like(post_id, session_user.id)
+    return {"likes": likes, "liked": True, "changed": changed}
+
+@router.delete("/{post_id}/like")
+def api_unlike_post(post_id: int, session_user: SessionUser = Depends(require_session)):
+    try:
+        likes, changed = unset_like_in_db(post_id, session_user.id)
+    except HTTPException:
+        likes, changed = unset_like(post_id, session_user.id)
+    return {"likes": likes, "liked": False, "changed": changed}
+
+@router.post("/{post_id}/like", deprecated=True)
+def api_toggle_like(post_id: int, session_user: SessionUser = Depends(require_session)):
+    """토글 (하위 호환) - 재시도하면 되돌아가므로 PUT/DELETE 를 쓰세요"""
+    try:
+        return {"likes": toggle_like_in_db(post_id, session_user.id)}
+    except HTTPException:
+        return {"likes": toggle_like(post_id, session_user.id)}
+
+# 댓글 - DB 게시글 우선, 없으면 메모리 저장소 (하위 호환)
+@router.get("/{post_id}/comments", response_model=CommentPage)
+def api_list_comments(
+    post_id: int,
+    request: Request,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_COMMENT_PAGE_SIZE, ge=1, le=MAX_COMMENT_PAGE_SIZE)
+):
+    """
+    One page of comments, oldest first
+    - cursor: 이전 응답(또는 상세 응답의 comments_next_cursor)의 next_cursor
+    - 댓글이 바뀌면 게시글 version 이 오르므로 같은 ETag 로 304
+    """
+    from Controllers.makepost_controller import get_post_version
 
-# 좋아요
-@router.post("/{post_id}/like")
-def api_toggle_like(post_id: int):
-    return {"likes": toggle_like(post_id)}
+    version_row = get_post_version(post_id)
+    if version_row is None:
+        comments, next_cursor = list_comments_page(post_id, cursor, limit)
+        return FastJSONResponse({"items": comments, "next_cursor": next_cursor})
+    version, last_modified = version_row
+    headers = cache_headers(make_etag("comments", post_id, version, cursor or "", limit), last_modified, POST_CACHE_CONTROL)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+    comments, next_cursor = list_comments_page_in_db(post_id, cursor, limit)
+    return FastJSONResponse({"items": comments, "next_cursor": next_cursor}, headers=headers)
 
-# 댓글
-@router.post("/{post_id}/comments", response_model=Comment)
+@router.post("/{post_id}/comments", response_model=CommentResponse)
 def api_add_comment(post_id: int, content: str = Form(...)):
-    return add_comment(post_id, content)
+    try:
+        return add_comment_in_db(post_id, content)
+    except HTTPException:
+        return add_comment(post_id, content)
 
-@router.put("/comments/{comment_id}", response_model=Comment)
+@router.put("/comments/{comment_id}", response_model=CommentResponse)
 def api_update_comment(comment_id: int, content: str = Form(...)):
-    return update_comment(comment_id, content)
+    try:
+        return update_comment_in_db(comment_id, content)
+    except HTTPException:
+        return update_comment(comment_id, content)
 
 @router.delete("/comments/{comment_id}")
 def api_delete_comment(comment_id: int):
-    return delete_comment(comment_id)
+    try:
+        return delete_comment_in_db(comment_id)
+    except HTTPException:
+        return delete_comment(comment_id)
@@ -1,17 +1,16 @@
-from fastapi import APIRouter, Form, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, Form, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
 from typing import Optional
 from pathlib import Path
 import traceback
 
 from Controllers.signin_controller import edit_profile_db
-from Database.database import init_db
+from utils.uploads import save_upload, discard_upload
+from utils.image_variants import schedule_profile_variants
+from utils.session_tokens import SessionUser, optional_session
 
 router = APIRouter(prefix="/user", tags=["user"])
 
-# DB 테이블 생성 (앱 시작 시)
-init_db()
-
 @router.post("/edit")
 async def edit_profile_route(
     image: UploadFile = File(None),
@@ -19,41 +18,45 @@ async def edit_profile_route(
     password: str = Form(default=""),
     password_confirm: str = Form(default=""),
     nickname: str = Form(default=""),
+    session_user: Optional[SessionUser] = Depends(optional_session),
 ):
+    """
+    새 이메일이면 회원가입, 이미 있는 이메일이면 프로필 수정 (그 계정의 세션 토큰 필요)
+    """
+    image_filename = None
     try:
-        # 이미지가 업로드 되었다면 파일명과 bytes를 튜플로 넘깁니다.
-        image_payload = None
-        if image and hasattr(image, 'filename') and image.filename and image.filename.strip():
-            # mime/type 검사: 안전을 위해 라우터에서 검사
-            if image.content_type and image.content_type not in ["image/png", "image/jpeg", "image/jpg", "image/gif"]:
-                return JSONResponse(
-                    status_code=400,
-                    content={"success": False, "message": "이미지 파일만 업로드 가능합니다."}
-                )
-            try:
-                content = await image.read()  # bytes
-                if content:
-                    image_payload = (image.filename, content)
-            except Exception as img_error:
-                print(f"Error reading image file: {img_error}")
-                # Continue without image if there's an error reading it
+        # 이미지가 업로드 되었다면 스트리밍으로 저장하고 파일명만 넘깁니다.
+        # (형식은 magic bytes 로, 크기는 MAX_UPLOAD_BYTES 로 검사 - 실패 시 400/413)
+        if image and image.filename and image.filename.strip():
+            image_filename = await save_upload(image)
 
         # Handle empty strings or None - convert to None for profile updates
         password_val = password if (password and password.strip()) else None
         password_confirm_val = password_confirm if (password_confirm and password_confirm.strip()) else None
         nickname_val = nickname if (nickname and nickname.strip()) else None
         
-        result = edit_profile_db(image_payload, email, password_val, password_confirm_val, nickname_val)
+        result = await edit_profile_db(image_filename, email, password_val, password_confirm_val, nickname_val, session_user)
         
         if not result.get("success"):
+            await discard_upload(image_filename)
             return JSONResponse(
                 status_code=400,
                 content={"success": False, "message": result.get("message", "회원가입에 실패했습니다.")}
             )
         
+        # 아바타 변형은 응답을 기다리게 하지 않고 백그라운드에서 생성
+        schedule_profile_variants(image_filename)
         return JSONResponse(status_code=200, content=result)
-    
+
+    except HTTPException as e:
+        await discard_upload(image_filename)
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"success": False, "message": e.detail},
+            headers=e.headers
+        )
     except Exception as e:
+        await discard_upload(image_filename)
         # Log the error for debugging
         error_trace = traceback.format_exc()
         print(f"Error in edit_profile_route: {error_trace}")
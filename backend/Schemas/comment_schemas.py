@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class CommentResponse(BaseModel):
+    id: int
+    post_id: int
+    content: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
+
+# CommentResponse 필드 순서 - 컬럼 튜플을 이 순서로 조회하면 comment_payloads() 로 바로 dict 변환
+COMMENT_FIELDS = ("id", "post_id", "content", "created_at", "updated_at")
+
+def comment_payloads(rows) -> List[dict]:
+    """CommentResponse 와 같은 모양의 dict 목록 (검증 없이)"""
+    return [dict(zip(COMMENT_FIELDS, row)) for row in rows]
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field, constr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, constr, field_validator
+from typing import Dict, Optional
 from datetime import datetime
+from utils.image_variants import variant_urls
 
 class UserRegister(BaseModel):
     email: EmailStr
@@ -14,8 +15,11 @@ class UserResponse(BaseModel):
     email: EmailStr
     nickname: str
     profile_image: Optional[str] = None
+    profile_image_variants: Optional[Dict[str, str]] = None  # {"avatar": URL}, 생성 전에는 None
     created_at: datetime
     updated_at: datetime
 
+    _variant_urls = field_validator("profile_image_variants", mode="before")(variant_urls)
+
     class Config:
         from_attributes = True
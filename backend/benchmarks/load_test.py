@@ -0,0 +1,487 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# ==========================
+# API 부하 테스트 / 벤치마크
+# ==========================
+# main.app 을 같은 프로세스에서 (httpx ASGITransport) 임시 SQLite 파일로 띄우고
+# 사용자/게시글/댓글을 시드한 뒤, 정해진 동시성으로 시나리오를 섞어 실행합니다.
+#
+#   cd backend
+#   python -m benchmarks.load_test --duration 30 --concurrency 32 --out bench.json
+#   python -m benchmarks.load_test --duration 30 --concurrency 32 --baseline bench.json
+#
+# 결과는 엔드포인트(라우트 템플릿)별 처리량과 p50/p95/p99 (ms) 를 담은 JSON 입니다.
+# --baseline 을 주면 저장된 결과와 비교해 p95 가 --threshold 보다 느려졌거나 처리량이 줄어든
+# 엔드포인트를 regressions 에 담고 종료 코드 1 로 끝납니다 (CI 에서 그대로 사용).
+#
+# 부하 생성기와 서버가 한 이벤트 루프를 나눠 쓰므로 절대값보다 같은 옵션으로 잰 결과끼리의
+# 비교에 쓰세요. 실제 배포 형태(uvicorn 워커 N 개)의 용량은 외부 도구로 따로 재야 합니다.
+#
+# 시나리오 (--mix 로 가중치 조절, 0 이면 제외)
+# - feed    : /posts/ 첫 페이지부터 next_cursor 를 따라 1~3 페이지 스크롤
+# - detail  : /posts/{id} - 상위 10% 게시글에 조회의 80% 가 몰리도록
+# - login   : /auth/login 연속 2~5회 (bcrypt 비용 그대로, 한도는 벤치마크 동안 해제)
+# - create  : /posts/ multipart 로 JPEG 첨부 게시글 작성
+# - comment : 소수의 인기 게시글에 댓글 몰아 쓰기
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MIX = "feed=40,detail=35,login=5,create=5,comment=15"
+PASSWORD = "Bench!2345"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="In-process load test for the community API")
+    parser.add_argument("--users", type=int, default=200, help="seeded users")
+    parser.add_argument("--posts", type=int, default=5000, help="seeded posts")
+    parser.add_argument("--comments-per-post", type=int, default=5, help="average seeded comments per post")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds run before measuring (not recorded)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1, help="random seed for data and scenario choice")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="override PASSWORD_BCRYPT_ROUNDS")
+    parser.add_argument("--out", help="write the JSON result here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against a result saved with --out")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before a regression (0.10 = 10%%)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary database directory")
+    return parser.parse_args(argv)
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+        weights[name] = float(weight or 1)
+    weights = {name: weight for name, weight in weights.items() if weight > 0}
+    if not weights:
+        raise SystemExit("--mix has no scenario with a positive weight")
+    return weights
+
+
+def prepare_environment(args, workdir: Path):
+    """
+    앱 모듈은 import 시점에 환경 변수를 읽으므로 import 전에 호출합니다.
+    업로드/세션 키/프로파일 파일이 임시 디렉터리에 생기도록 작업 디렉터리도 옮깁니다.
+    """
+    db_url = f"sqlite:///{workdir / 'bench.db'}"
+    os.environ["DATABASE_URL"] = db_url
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("ASYNC_DATABASE_READ_URL", None)
+    os.environ.setdefault("SESSION_SECRET", "benchmark-secret")
+    # 한도 초과(429)가 아니라 실제 로그인 비용을 재도록 한도를 풉니다
+    for name in ("LOGIN_RATE_IP_BURST", "LOGIN_RATE_EMAIL_BURST", "LOGIN_RATE_IP_PER_MINUTE", "LOGIN_RATE_EMAIL_PER_MINUTE"):
+        os.environ.setdefault(name, "1000000000")
+    if args.bcrypt_rounds is not None:
+        os.environ["PASSWORD_BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(workdir)
+
+
+# ==========================
+# 시드 데이터
+# ==========================
+def seed(args, rng: random.Random) -> dict:
+    """사용자/게시글/댓글을 한 트랜잭션씩 bulk insert 합니다 (앱 API 를 거치지 않음)."""
+    from sqlalchemy import insert, update
+    from Database.database import engine
+    from Models.signin_model import User
+    from Models.makepost_model import Post
+    from Models.comment_model import Comment
+    from Controllers.counter_controller import bump_counter
+    from utils.password_hasher import hash_password
+
+    started = time.perf_counter()
+    # 모든 사용자가 같은 비밀번호 - 해시는 한 번만 계산
+    hashed = hash_password(PASSWORD)
+    now = datetime.utcnow()
+    users = [
+        {"email": f"bench{i}@example.com", "hashed_password": hashed, "nickname": f"bench{i}",
+         "created_at": now, "updated_at": now}
+        for i in range(args.users)
+    ]
+    words = ["커뮤니티", "게시글", "benchmark", "python", "sqlite", "fastapi", "latency", "오늘", "질문", "공유"]
+    posts = []
+    for i in range(args.posts):
+        created_at = now - timedelta(seconds=(args.posts - i) * 30)
+        posts.append({
+            "title": f"post {i} {rng.choice(words)}"[:26],
+            "content": " ".join(rng.choice(words) for _ in range(rng.randint(20, 120))),
+            "created_at": created_at,
+            "views": rng.randint(0, 1000),
+        })
+    with engine.begin() as conn:
+        if users:
+            conn.execute(insert(User), users)
+        if posts:
+            conn.execute(insert(Post), posts)
+        post_ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM posts ORDER BY id")]
+        comments = []
+        counts = defaultdict(int)
+        for _ in range(len(post_ids) * args.comments_per_post):
+            post_id = rng.choice(post_ids)
+            counts[post_id] += 1
+            comments.append({"post_id": post_id, "content": " ".join(rng.choice(words) for _ in range(8)), "created_at": now})
+        for start in range(0, len(comments), 10000):
+            conn.execute(insert(Comment), comments[start:start + 10000])
+        for post_id, count in counts.items():
+            conn.execute(update(Post).where(Post.id == post_id).values(comments_count=count))
+        conn.execute(bump_counter())
+    return {"post_ids": post_ids, "emails": [user["email"] for user in users], "seconds": time.perf_counter() - started}
+
+
+def make_images(rng: random.Random, count: int = 32) -> List[bytes]:
+    """업로드용 JPEG - 내용이 모두 달라 blob 저장소에서 중복 제거되지 않습니다 (count 개를 돌려 씀)."""
+    from PIL import Image
+
+    images = []
+    for _ in range(count):
+        image = Image.new("RGB", (800, 600), tuple(rng.randrange(256) for _ in range(3)))
+        for _ in range(20):
+            x, y = rng.randrange(780), rng.randrange(580)
+            image.paste(tuple(rng.randrange(256) for _ in range(3)), (x, y, x + 20, y + 20))
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85)
+        images.append(buffer.getvalue())
+    return images
+
+
+# ==========================
+# 측정
+# ==========================
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.active = False
+
+    async def request(self, client, name: str, method: str, url: str, **kwargs):
+        """name 은 집계 키 (예: "GET /posts/{post_id}"). 측정 구간이 아니면 기록하지 않습니다."""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            if self.active:
+                self.errors[name] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if self.active:
+            self.latencies[name].append(elapsed)
+            self.statuses[name][response.status_code] += 1
+            if response.status_code >= 500:
+                self.errors[name] += 1
+        return response
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, seconds: float) -> dict:
+    endpoints = {}
+    all_latencies = []
+    for name in sorted(set(recorder.latencies) | set(recorder.errors)):
+        values = sorted(recorder.latencies.get(name, []))
+        all_latencies.extend(values)
+        endpoints[name] = _stats(values, seconds)
+        endpoints[name]["errors"] = recorder.errors.get(name, 0)
+        endpoints[name]["status"] = {str(code): count for code, count in sorted(recorder.statuses[name].items())}
+    total = _stats(sorted(all_latencies), seconds)
+    total["errors"] = sum(recorder.errors.values())
+    return {"endpoints": endpoints, "total": total}
+
+
+def _stats(values: List[float], seconds: float) -> dict:
+    return {
+        "count": len(values),
+        "rps": round(len(values) / seconds, 2) if seconds else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+# ==========================
+# 시나리오
+# ==========================
+class Context:
+    def __init__(self, client, recorder: Recorder, data: dict, images: List[bytes], args, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.post_ids = data["post_ids"]
+        self.emails = data["emails"]
+        self.images = images
+        self.page_size = args.page_size
+        self.rng = rng
+        # 댓글 폭주 대상 - 최근 게시글 몇 개
+        self.hot_comment_posts = self.post_ids[-5:]
+
+    def popular_post(self) -> int:
+        # 80% 는 최신 10% 게시글에서, 나머지는 전체에서 고릅니다
+        if self.rng.random() < 0.8:
+            return self.rng.choice(self.post_ids[-max(1, len(self.post_ids) // 10):])
+        return self.rng.choice(self.post_ids)
+
+
+async def scenario_feed(ctx: Context):
+    cursor = None
+    for _ in range(ctx.rng.randint(1, 3)):
+        params = {"limit": ctx.page_size}
+        if cursor:
+            params["cursor"] = cursor
+        response = await ctx.recorder.request(ctx.client, "GET /posts/", "GET", "/posts/", params=params)
+        if response is None or response.status_code != 200:
+            return
+        cursor = response.json().get("next_cursor")
+        if not cursor:
+            return
+
+
+async def scenario_detail(ctx: Context):
+    await ctx.recorder.request(ctx.client, "GET /posts/{post_id}", "GET", f"/posts/{ctx.popular_post()}")
+
+
+async def scenario_login(ctx: Context):
+    if not ctx.emails:
+        return
+    email = ctx.rng.choice(ctx.emails)
+    for _ in range(ctx.rng.randint(2, 5)):
+        await ctx.recorder.request(
+            ctx.client, "POST /auth/login", "POST", "/auth/login", data={"email": email, "password": PASSWORD}
+        )
+
+
+async def scenario_create(ctx: Context):
+    response = await ctx.recorder.request(
+        ctx.client, "POST /posts/", "POST", "/posts/",
+        data={"title": f"bench {ctx.rng.randrange(10 ** 6)}", "content": "load test post " * 20},
+        files={"image": ("bench.jpg", ctx.rng.choice(ctx.images), "image/jpeg")},
+    )
+    if response is not None and response.status_code == 200:
+        ctx.post_ids.append(response.json()["id"])
+
+
+async def scenario_comment(ctx: Context):
+    post_id = ctx.rng.choice(ctx.hot_comment_posts)
+    for _ in range(ctx.rng.randint(1, 3)):
+        await ctx.recorder.request(
+            ctx.client, "POST /posts/{post_id}/comments", "POST", f"/posts/{post_id}/comments",
+            data={"content": "comment storm"},
+        )
+
+
+SCENARIOS = {
+    "feed": scenario_feed,
+    "detail": scenario_detail,
+    "login": scenario_login,
+    "create": scenario_create,
+    "comment": scenario_comment,
+}
+
+
+async def virtual_user(ctx: Context, weights: Dict[str, float], deadline: float, scenario_counts: Dict[str, int]):
+    names = list(weights)
+    cumulative = list(weights.values())
+    while time.perf_counter() < deadline:
+        name = ctx.rng.choices(names, weights=cumulative)[0]
+        if ctx.recorder.active:
+            scenario_counts[name] += 1
+        await SCENARIOS[name](ctx)
+
+
+async def run(args, weights: Dict[str, float]) -> dict:
+    try:
+        import httpx
+    except ImportError:
+        raise SystemExit("the load test needs httpx: pip install httpx")
+
+    startup_started = time.perf_counter()
+    from main import app
+    import_seconds = time.perf_counter() - startup_started
+
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    scenario_counts: Dict[str, int] = defaultdict(int)
+    async with app.router.lifespan_context(app):
+        data = await asyncio.to_thread(seed, args, rng)
+        images = make_images(rng) if "create" in weights else []
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=60) as client:
+            ctx_rngs = [random.Random(args.seed * 1000 + i) for i in range(args.concurrency)]
+            contexts = [Context(client, recorder, data, images, args, ctx_rng) for ctx_rng in ctx_rngs]
+            # 게시글 목록은 모든 가상 사용자가 공유 (새 글도 조회 대상이 되도록)
+            for ctx in contexts[1:]:
+                ctx.post_ids = contexts[0].post_ids
+
+            if args.warmup > 0:
+                deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(*(virtual_user(ctx, weights, deadline, scenario_counts) for ctx in contexts))
+
+            recorder.active = True
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(virtual_user(ctx, weights, deadline, scenario_counts) for ctx in contexts))
+            # 마지막 시나리오가 deadline 을 넘겨 끝날 수 있으므로 실제 경과 시간으로 나눕니다
+            elapsed = time.perf_counter() - started
+            recorder.active = False
+
+    result = summarize(recorder, elapsed)
+    result["scenarios"] = dict(scenario_counts)
+    result["meta"] = {
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "users": args.users,
+        "posts": args.posts,
+        "comments_per_post": args.comments_per_post,
+        "concurrency": args.concurrency,
+        "duration": round(elapsed, 3),
+        "warmup": args.warmup,
+        "mix": weights,
+        "page_size": args.page_size,
+        "seed": args.seed,
+        "bcrypt_rounds": int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12")),
+        "app_import_seconds": round(import_seconds, 3),
+        "seed_seconds": round(data["seconds"], 3),
+    }
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ==========================
+# 기준 결과와 비교
+# ==========================
+def compare(result: dict, baseline: dict, threshold: float) -> dict:
+    """
+    엔드포인트별로 p50/p95/p99 와 rps 의 변화율을 계산합니다.
+    p95 가 threshold 보다 느려지거나 rps 가 threshold 보다 줄면 regression 으로 표시합니다.
+    """
+    comparison = {}
+    regressions = []
+    for name, current in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            comparison[name] = {"new": True}
+            continue
+        row = {}
+        for key in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            row[key] = {"baseline": before[key], "current": current[key], "change": _change(before[key], current[key])}
+        slower = row["p95_ms"]["change"] is not None and row["p95_ms"]["change"] > threshold
+        fewer = row["rps"]["change"] is not None and row["rps"]["change"] < -threshold
+        row["regression"] = slower or fewer
+        if row["regression"]:
+            regressions.append(name)
+        comparison[name] = row
+    mismatched = {
+        key: {"baseline": baseline.get("meta", {}).get(key), "current": result["meta"][key]}
+        for key in ("users", "posts", "concurrency", "mix", "page_size", "bcrypt_rounds")
+        if baseline.get("meta", {}).get(key) != result["meta"][key]
+    }
+    return {
+        "baseline_commit": baseline.get("meta", {}).get("git_commit"),
+        "threshold": threshold,
+        "endpoints": comparison,
+        "regressions": regressions,
+        # 옵션이 다르면 비교 자체가 의미 없을 수 있습니다
+        "settings_differ": mismatched,
+    }
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    if not before:
+        return None
+    return round((after - before) / before, 4)
+
+
+def print_table(result: dict):
+    """사람이 읽는 요약은 stderr 로 (stdout 은 JSON 전용)"""
+    comparison = result.get("comparison", {}).get("endpoints", {})
+    print(f"{'endpoint':<34} {'count':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}  vs baseline (p95)", file=sys.stderr)
+    for name, row in sorted(result["endpoints"].items()):
+        note = ""
+        compared = comparison.get(name)
+        if compared and not compared.get("new"):
+            change = compared["p95_ms"]["change"]
+            note = f"{change:+.1%}" if change is not None else "-"
+            if compared["regression"]:
+                note += "  REGRESSION"
+        print(
+            f"{name:<34} {row['count']:>7} {row['rps']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+            f"{row['p99_ms']:>8} {row['errors']:>5}  {note}",
+            file=sys.stderr,
+        )
+    total = result["total"]
+    print(f"{'total':<34} {total['count']:>7} {total['rps']:>8} {total['p50_ms']:>8} {total['p95_ms']:>8} {total['p99_ms']:>8} {total['errors']:>5}", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    weights = parse_mix(args.mix)
+    out_path = Path(args.out).resolve() if args.out else None
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+
+    cwd = os.getcwd()
+    workdir = Path(tempfile.mkdtemp(prefix="community-bench-"))
+    prepare_environment(args, workdir)
+    try:
+        result = asyncio.run(run(args, weights))
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"kept {workdir}", file=sys.stderr)
+        else:
+            import shutil
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if baseline is not None:
+        result["comparison"] = compare(result, baseline, args.threshold)
+    print_table(result)
+
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if out_path:
+        out_path.write_text(output + "\n")
+    else:
+        print(output)
+    if baseline is not None and result["comparison"]["regressions"]:
+        print(f"regressions: {', '.join(result['comparison']['regressions'])}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
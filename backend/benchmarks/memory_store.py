@@ -0,0 +1,223 @@
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+# ==========================
+# 메모리 게시글/댓글 저장소 벤치마크 (before / after)
+# ==========================
+#   cd backend
+#   python -m benchmarks.memory_store --posts 10000 --comments 1000000
+#
+# - before : 이전 Controllers/post_controller.py - Pydantic 모델을 리스트에 보관하고 선형 탐색
+#            (아래 ListStore 에 그 동작을 그대로 옮겨 두었습니다)
+# - after  : 현재 Controllers/post_controller.py - __slots__ 레코드 + id/post_id dict 색인
+# 두 저장소를 같은 데이터로 채운 뒤 (채우는 시간과 tracemalloc 로 잰 메모리),
+# 무작위 id 로 get_post / add_comment / update_comment / delete_comment / 댓글 수 / 상세 응답을 잽니다 (op 당 µs 중앙값).
+
+
+class _Comment(BaseModel):
+    id: int
+    post_id: int
+    content: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class _Post(BaseModel):
+    id: int
+    title: str
+    content: str
+    views: int = 0
+    likes: int = 0
+    liked: bool = False
+    comments: List[_Comment] = []
+
+
+class ListStore:
+    """이전 구현 (이벤트 발행만 뺌)"""
+
+    def __init__(self):
+        self.posts_db = []
+        self.comments_db = []
+        self.post_id_seq = 1
+        self.comment_id_seq = 1
+
+    def get_post(self, post_id: int):
+        for post in self.posts_db:
+            if post.id == post_id:
+                return post
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    def create_post(self, title: str, content: str):
+        post = _Post(id=self.post_id_seq, title=title, content=content)
+        self.posts_db.append(post)
+        self.post_id_seq += 1
+        return post
+
+    def add_comment(self, post_id: int, content: str):
+        post = self.get_post(post_id)
+        comment = _Comment(id=self.comment_id_seq, post_id=post_id, content=content, created_at=datetime.now())
+        self.comments_db.append(comment)
+        post.comments.append(comment)
+        self.comment_id_seq += 1
+        return comment
+
+    def update_comment(self, comment_id: int, content: str):
+        for comment in self.comments_db:
+            if comment.id == comment_id:
+                comment.content = content
+                comment.updated_at = datetime.now()
+                return comment
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    def delete_comment(self, comment_id: int):
+        for comment in self.comments_db:
+            if comment.id == comment_id:
+                post = self.get_post(comment.post_id)
+                post.comments = [c for c in post.comments if c.id != comment_id]
+                self.comments_db.remove(comment)
+                return {"message": "Comment deleted"}
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    def count_comments(self, post_id: int) -> int:
+        return len(self.get_post(post_id).comments)
+
+    def bulk_add_comments(self, post_ids: List[int]):
+        # add_comment 는 게시글을 선형 탐색하므로 채울 때는 위치로 바로 붙입니다 (게시글 id = 순번)
+        for post_id in post_ids:
+            comment = _Comment(id=self.comment_id_seq, post_id=post_id, content=f"comment {self.comment_id_seq}",
+                               created_at=datetime.now())
+            self.comments_db.append(comment)
+            self.posts_db[post_id - 1].comments.append(comment)
+            self.comment_id_seq += 1
+
+    def detail(self, post_id: int) -> dict:
+        return self.get_post(post_id).model_dump(mode="json")
+
+
+class IndexedStore:
+    """현재 Controllers.post_controller 모듈 함수를 같은 인터페이스로"""
+
+    def __init__(self):
+        from Controllers import post_controller
+        self.module = post_controller
+        post_controller.posts_db.clear()
+        post_controller.comments_db.clear()
+        post_controller.comments_by_post.clear()
+        post_controller.post_id_seq = 1
+        post_controller.comment_id_seq = 1
+        # 이벤트 발행은 before 와 같게 빼고 잽니다
+        post_controller.publish = lambda event, data: None
+
+    def create_post(self, title: str, content: str):
+        return self.module.create_post(title, content)
+
+    def add_comment(self, post_id: int, content: str):
+        return self.module.add_comment(post_id, content)
+
+    def get_post(self, post_id: int):
+        return self.module.get_post(post_id)
+
+    def update_comment(self, comment_id: int, content: str):
+        return self.module.update_comment(comment_id, content)
+
+    def delete_comment(self, comment_id: int):
+        return self.module.delete_comment(comment_id)
+
+    def count_comments(self, post_id: int) -> int:
+        return self.module.count_comments(post_id)
+
+    def bulk_add_comments(self, post_ids: List[int]):
+        for post_id in post_ids:
+            self.module.add_comment(post_id, f"comment {self.module.comment_id_seq}")
+
+    def detail(self, post_id: int) -> dict:
+        return self.module.get_post(post_id).to_dict()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="In-memory post store benchmark")
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=50, help="timed calls per operation")
+    parser.add_argument("--only", choices=("before", "after"), help="run one store only")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the JSON result here (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def fill(store, args, rng: random.Random) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(args.posts):
+        store.create_post(f"post {i}", "content")
+    store.bulk_add_comments([rng.randint(1, args.posts) for _ in range(args.comments)])
+    seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"fill_seconds": round(seconds, 2), "memory_mb": round(current / 1024 / 1024, 1),
+            "bytes_per_comment": round(current / max(args.comments, 1))}
+
+
+def measure(fn, ids, ops: int) -> float:
+    samples = []
+    for target in ids[:ops]:
+        started = time.perf_counter()
+        fn(target)
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1_000_000, 2)
+
+
+def run_store(name: str, store, args) -> dict:
+    rng = random.Random(args.seed)
+    result = fill(store, args, rng)
+    post_ids = [rng.randint(1, args.posts) for _ in range(args.ops)]
+    # 뒤쪽 id 도 고르게 - 선형 탐색 비용이 위치에 따라 달라서
+    comment_ids = rng.sample(range(1, args.comments + 1), args.ops)
+    ops = {
+        "get_post_us": measure(store.get_post, post_ids, args.ops),
+        "count_comments_us": measure(store.count_comments, post_ids, args.ops),
+        "detail_us": measure(store.detail, post_ids, args.ops),
+        "add_comment_us": measure(lambda post_id: store.add_comment(post_id, "new"), post_ids, args.ops),
+        "update_comment_us": measure(lambda comment_id: store.update_comment(comment_id, "edited"), comment_ids, args.ops),
+        "delete_comment_us": measure(store.delete_comment, comment_ids, args.ops),
+    }
+    result.update(ops)
+    print(f"{name:<7} fill {result['fill_seconds']:>7} s  {result['memory_mb']:>8} MB  "
+          f"({result['bytes_per_comment']} B/comment)", file=sys.stderr)
+    for op, value in ops.items():
+        print(f"        {op:<20} {value:>12} µs", file=sys.stderr)
+    return result
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    result = {"meta": {"posts": args.posts, "comments": args.comments, "ops": args.ops}}
+    if args.only != "after":
+        result["before"] = run_store("before", ListStore(), args)
+    gc.collect()
+    if args.only != "before":
+        result["after"] = run_store("after", IndexedStore(), args)
+
+    output = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as fp:
+            fp.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.load_test import prepare_environment, seed
+
+# ==========================
+# 목록/상세 응답 직렬화 벤치마크 (before / after)
+# ==========================
+#   cd backend
+#   python -m benchmarks.serialization --page-size 1000 --comments 200
+#
+# 같은 임시 DB 에서 두 경로를 번갈아 실행해 단계별 중앙값(ms)을 비교합니다.
+# - before : select(Post) ORM 객체 -> PostResponse 검증 -> model_dump(mode="json") -> json.dumps
+#            (response_model 과 JSONResponse 를 거치던 이전 경로)
+# - before_dump_json : ORM 객체 -> PostPage 검증 -> model_dump_json (FastAPI 최신 버전의 response_model 경로)
+# - after  : POST_COLUMNS 튜플 조회 -> post_payloads() dict -> FastJSONResponse (orjson)
+# API 는 한 페이지 최대 MAX_PAGE_SIZE 개라 컨트롤러 함수를 직접 호출해 큰 페이지를 잽니다.
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Feed/detail serialization benchmark")
+    parser.add_argument("--page-size", type=int, default=1000, help="posts per feed page")
+    parser.add_argument("--comments", type=int, default=200, help="comments on the detail post")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--out", help="write the JSON result here (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(samples) * 1000, 3), "min_ms": round(min(samples) * 1000, 3)}, result
+
+
+def run(args) -> dict:
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import insert
+    from sqlmodel import select
+    from Database.database import engine, init_db, get_read_session
+    from Models.makepost_model import Post
+    from Models.comment_model import Comment
+    from Schemas.makepost_schemas import PostResponse, PostPage
+    from Schemas.comment_schemas import CommentResponse
+    from Schemas.makepost_schemas import post_payload
+    from Schemas.comment_schemas import comment_payloads
+    from Controllers.makepost_controller import _page_statement, _split_page, get_post_row
+    from Controllers.comment_controller import list_comments_from_db
+    from utils.json_response import FastJSONResponse, orjson
+
+    init_db()
+    data = seed(SimpleNamespace(users=1, posts=args.page_size + 1, comments_per_post=0), random.Random(1))
+    detail_id = data["post_ids"][-1]
+    with engine.begin() as conn:
+        conn.execute(insert(Comment), [{"post_id": detail_id, "content": f"comment {i}"} for i in range(args.comments)])
+
+    limit = args.page_size
+    order = (Post.created_at.desc(), Post.id.desc())
+
+    # ---- feed ----
+    def feed_query_before():
+        with get_read_session() as session:
+            return session.exec(select(Post).order_by(*order).limit(limit + 1)).all()[:limit]
+
+    def feed_query_after():
+        with get_read_session() as session:
+            return session.exec(_page_statement(None, limit)).all()
+
+    results = {"feed": {}, "detail": {}}
+    feed = results["feed"]
+    feed["query_orm"], posts = timed(feed_query_before, args.repeat)
+    feed["query_columns"], rows = timed(feed_query_after, args.repeat)
+    feed["validate_model_dump"], dumped = timed(
+        lambda: [PostResponse.model_validate(post).model_dump(mode="json") for post in posts], args.repeat
+    )
+    feed["encode_stdlib_json"], body_before = timed(
+        lambda: JSONResponse({"items": dumped, "next_cursor": None}).body, args.repeat
+    )
+    feed["validate_dump_json"], _ = timed(
+        lambda: PostPage.model_validate({"items": posts, "next_cursor": None}).model_dump_json(), args.repeat
+    )
+    feed["build_payload"], payloads = timed(lambda: _split_page(rows, limit)[0], args.repeat)
+    feed["encode_fast_json"], body_after = timed(
+        lambda: FastJSONResponse({"items": payloads, "next_cursor": None}).body, args.repeat
+    )
+    feed["before_total_ms"] = round(
+        feed["query_orm"]["median_ms"] + feed["validate_model_dump"]["median_ms"] + feed["encode_stdlib_json"]["median_ms"], 3
+    )
+    feed["before_dump_json_total_ms"] = round(feed["query_orm"]["median_ms"] + feed["validate_dump_json"]["median_ms"], 3)
+    feed["after_total_ms"] = round(
+        feed["query_columns"]["median_ms"] + feed["build_payload"]["median_ms"] + feed["encode_fast_json"]["median_ms"], 3
+    )
+    feed["same_output"] = json.loads(body_before) == json.loads(body_after)
+    feed["bytes"] = len(body_after)
+
+    # ---- detail ----
+    detail = results["detail"]
+
+    def detail_before():
+        with get_read_session() as session:
+            post = session.get(Post, detail_id)
+            comments = session.exec(select(Comment).where(Comment.post_id == detail_id).order_by(Comment.id)).all()
+        payload = PostResponse.model_validate(post).model_dump(mode="json")
+        payload["comments"] = [CommentResponse.model_validate(comment).model_dump(mode="json") for comment in comments]
+        return JSONResponse(payload).body
+
+    def detail_after():
+        payload = post_payload(get_post_row(detail_id))
+        payload["comments"] = comment_payloads(list_comments_from_db(detail_id))
+        return FastJSONResponse(payload).body
+
+    detail["before"], body_before = timed(detail_before, args.repeat)
+    detail["after"], body_after = timed(detail_after, args.repeat)
+    detail["same_output"] = json.loads(body_before) == json.loads(body_after)
+    detail["comments"] = args.comments
+
+    results["meta"] = {"page_size": limit, "repeat": args.repeat, "orjson": orjson is not None}
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    out_path = Path(args.out).resolve() if args.out else None
+    workdir = Path(tempfile.mkdtemp(prefix="community-bench-"))
+    prepare_environment(SimpleNamespace(bcrypt_rounds=4), workdir)
+    try:
+        result = run(args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    feed, detail = result["feed"], result["detail"]
+    print(f"feed page of {args.page_size} posts ({feed['bytes']} bytes, same output: {feed['same_output']})", file=sys.stderr)
+    for stage in ("query_orm", "validate_model_dump", "encode_stdlib_json", "validate_dump_json",
+                  "query_columns", "build_payload", "encode_fast_json"):
+        print(f"  {stage:<22} {feed[stage]['median_ms']:>10} ms", file=sys.stderr)
+    print(f"  {'before':<22} {feed['before_total_ms']:>10} ms", file=sys.stderr)
+    print(f"  {'before (dump_json)':<22} {feed['before_dump_json_total_ms']:>10} ms", file=sys.stderr)
+    print(f"  {'after':<22} {feed['after_total_ms']:>10} ms", file=sys.stderr)
+    print(f"detail with {args.comments} comments (same output: {detail['same_output']})", file=sys.stderr)
+    print(f"  {'before':<22} {detail['before']['median_ms']:>10} ms", file=sys.stderr)
+    print(f"  {'after':<22} {detail['after']['median_ms']:>10} ms", file=sys.stderr)
+
+    output = json.dumps(result, indent=2)
+    if out_path:
+        out_path.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict
 from fastapi import FastAPI, Request, status
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
@@ -13,8 +16,80 @@ from Routers.post_router import router as post_router  # 라우터 import
 from Routers.posts_router import router as posts_router  # 라우터 import
 from Routers.signin_router import router as signin_router  # 라우터 import
 from Routers.makepost_router import router as makepost_router  # 라우터 import
+from utils.view_counter import start_view_flusher, stop_view_flusher
+from utils import post_cache
+from utils.event_hub import start_event_hub, stop_event_hub, hub_stats
+from utils.password_hasher import pool_stats
+from Controllers.login_controller import login_stats, warm_up_login
+from utils.metrics import MetricsMiddleware, render_metrics
+from utils.profiler import start_profiler, stop_profiler, profiler_stats
+from utils.compression import CompressionMiddleware
+from utils.static_assets import CompressedStaticFiles, STATIC_PRECOMPRESS, index_response, precompress_directory
+from utils.blob_store import UPLOAD_DIR, ensure_upload_dirs
+from utils.image_variants import reschedule_missing_variants, stop_variant_workers
+from utils.session_tokens import load_session_secret
+from Database.database import init_db, warm_up_pools, dispose_engines
+from Controllers.makepost_controller import warm_post_cache
 
-app = FastAPI(title="Community Web")
+# ==========================
+# 시작 / 종료
+# ==========================
+# import 는 I/O 없이 끝나고, DB 스키마/디렉터리/연결/캐시 준비는 모두 여기서 합니다.
+# 단계별 소요 시간은 로그와 /stats/startup 으로 확인합니다.
+_startup_timings: Dict[str, float] = {}
+
+
+@contextmanager
+def _timed(step: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup_timings[step] = round((time.perf_counter() - started) * 1000, 1)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _startup_timings.clear()
+    started = time.perf_counter()
+    with _timed("schema"):
+        await asyncio.to_thread(init_db)
+    with _timed("upload_dirs"):
+        ensure_upload_dirs()
+    with _timed("session_secret"):
+        load_session_secret()
+    with _timed("pool_warm_up"):
+        await warm_up_pools()
+    with _timed("post_cache"):
+        # 변경 추적을 먼저 시작해야 미리 채우는 동안의 변경도 무효화됩니다
+        post_cache.start_cache_sync()
+        await asyncio.to_thread(warm_post_cache, post_cache.POST_CACHE_WARM)
+    with _timed("background_tasks"):
+        start_view_flusher()
+        start_event_hub()
+        warm_up_login()
+        start_profiler()
+    with _timed("image_variants"):
+        # 지난 종료 때 취소되었거나 잃은 변형 작업을 다시 예약 (작업 자체는 워커 풀에서)
+        await asyncio.to_thread(reschedule_missing_variants)
+    if STATIC_PRECOMPRESS and frontend_dir.exists():
+        with _timed("static_precompress"):
+            # frontend 자산의 .br/.gz 를 (바뀐 파일만) 만들어 둡니다 - 배포 단계에서 미리 해도 됩니다
+            await asyncio.to_thread(precompress_directory, frontend_dir)
+    _startup_timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    print("Startup: " + ", ".join(f"{step} {ms} ms" for step, ms in _startup_timings.items()))
+    yield
+    stop_profiler()
+    # 열린 SSE 스트림을 먼저 닫아야 서버가 종료를 기다리지 않습니다
+    await stop_event_hub()
+    await post_cache.stop_cache_sync()
+    # 종료 시 버퍼에 남은 조회수를 DB에 반영
+    await stop_view_flusher()
+    # 실행 중인 이미지 변형 작업이 DB 에 기록을 마친 뒤 엔진을 닫습니다
+    await asyncio.to_thread(stop_variant_workers)
+    await dispose_engines()
+
+app = FastAPI(title="Community Web", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -25,6 +100,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# JSON/HTML 응답 압축 (COMPRESS_MIN_SIZE 이상) - 정적 파일은 미리 압축된 파일을 그대로 보냅니다
+app.add_middleware(CompressionMiddleware)
+
+# 요청 계측 (/metrics) - 마지막에 추가한 미들웨어가 가장 바깥이므로 CORS 처리까지 포함해 잽니다
+app.add_middleware(MetricsMiddleware)
+
 # Global exception handlers to return JSON instead of HTML
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -52,16 +133,20 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 # Serve uploaded images as static files
-upload_dir = Path("uploaded_images")
-upload_dir.mkdir(exist_ok=True)
-app.mount("/uploaded_images", StaticFiles(directory=str(upload_dir)), name="uploaded_images")
+# 디렉터리는 lifespan 의 ensure_upload_dirs() 가 만듭니다 (check_dir=False - 첫 요청 때 확인)
+# 파일명이 내용 해시(또는 uuid)라 내용이 바뀌지 않으므로 immutable 로 캐시합니다
+app.mount(
+    "/uploaded_images",
+    CompressedStaticFiles(directory=str(UPLOAD_DIR), immutable=True, check_dir=False),
+    name="uploaded_images",
+)
 
 # Serve frontend as static files
 frontend_dir = Path("../frontend")
 if not frontend_dir.exists():
     frontend_dir = Path("frontend")
 if frontend_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(frontend_dir)), name="static")
+    app.mount("/static", CompressedStaticFiles(directory=str(frontend_dir)), name="static")
 
 
 routers = [
@@ -80,10 +165,43 @@ for r in routers:
     app.include_router(r)
 
 @app.get("/")
-def read_root():
+def read_root(request: Request):
     frontend_path = Path("../frontend/index.html")
     if not frontend_path.exists():
         frontend_path = Path("frontend/index.html")
     if frontend_path.exists():
-        return FileResponse(str(frontend_path))
+        # 자산 URL 을 /static/...?v=<해시> 로 바꿔 보냅니다 (자산은 immutable 캐시)
+        return index_response(request, frontend_path)
     return {"message": "Welcome to Community Web"}
+
+@app.get("/stats/post-cache")
+def read_post_cache_stats():
+    """게시글 상세 캐시 hit/miss/eviction 카운터 (워커별 값)"""
+    return post_cache.stats()
+
+@app.get("/stats/stream")
+def read_stream_stats():
+    """/posts/stream 구독자 수와 발행 이벤트 수 (워커별 값)"""
+    return hub_stats()
+
+@app.get("/stats/login")
+def read_login_stats():
+    """로그인 시도 중 한도 초과로 거절된 수와 bcrypt 로 검증한 수 (워커별 값)"""
+    return {**login_stats(), "hasher": pool_stats()}
+
+@app.get("/stats/startup")
+def read_startup_stats():
+    """이 워커의 시작 단계별 소요 시간 (ms)"""
+    return _startup_timings
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """Prometheus text format - 라우트별 지연 시간/DB 시간/응답 크기 히스토그램과 내부 통계"""
+    extra = {
+        "post_cache": post_cache.stats(),
+        "stream": hub_stats(),
+        "login": login_stats(),
+        "password_hasher": pool_stats(),
+        "profiler": profiler_stats(),
+    }
+    return PlainTextResponse(render_metrics(extra), media_type="text/plain; version=0.0.4")
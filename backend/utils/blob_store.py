@@ -0,0 +1,208 @@
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select, update, delete, func
+
+from Database.database import get_session, get_async_session
+from Models.blob_model import Blob
+
+# ==========================
+# 내용 주소 기반(content-addressed) 이미지 저장소
+# ==========================
+# 파일은 sha256 으로 이름을 짓고 uploaded_images/ab/cd/<sha256>.<ext> 에 저장합니다.
+# 같은 내용을 천 번 올려도 파일은 하나이고, blobs.ref_count 로 참조 수를 셉니다.
+# - 업로드(save_upload)  : ref_count + 1
+# - 게시글/프로필 이미지 교체, 게시글 삭제, 회원 탈퇴, 검증 실패 : ref_count - 1
+# - gc_blobs()           : ref_count <= 0 인 파일과 그 변형(_thumb.webp 등)을 삭제
+# 샤딩 이전에 저장된 평탄한(uuid) 파일명은 blobs 에 없으므로 건드리지 않습니다.
+
+UPLOAD_DIR = Path("uploaded_images")
+TMP_DIR = UPLOAD_DIR / ".tmp"
+
+# 참조가 0 이 된 뒤 이 시간 동안은 지우지 않습니다 (업로드 직후 재참조 대비)
+BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+
+
+def ensure_upload_dirs():
+    """업로드 디렉터리 준비 (main.py lifespan 에서 한 번)"""
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def blob_path(sha256: str, ext: str) -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+def blob_key(filename: Optional[str]) -> Optional[str]:
+    """저장된 파일명/경로 -> sha256 (샤딩된 blob 이 아니면 None)"""
+    if not filename:
+        return None
+    path = Path(filename)
+    if len(path.parts) < 3 or len(path.stem) != 64:
+        return None
+    return path.stem
+
+
+async def acquire_blob_async(sha256: str, filename: str, size: int):
+    """참조 +1 (행이 없으면 생성). 파일을 제자리에 옮기기 전에 호출합니다."""
+    now = datetime.utcnow()
+    for _ in range(2):
+        async with get_async_session() as session:
+            result = await session.exec(
+                update(Blob).where(Blob.sha256 == sha256).values(ref_count=Blob.ref_count + 1, updated_at=now)
+            )
+            if result.rowcount == 0:
+                session.add(Blob(sha256=sha256, filename=filename, size=size, ref_count=1, created_at=now, updated_at=now))
+            try:
+                await session.commit()
+                return
+            except IntegrityError:
+                # 다른 요청이 같은 내용을 동시에 처음 올린 경우 - UPDATE 로 다시 시도
+                await session.rollback()
+    raise RuntimeError(f"Could not register blob {sha256}")
+
+
+def _release_statement(filename: Optional[str]):
+    sha256 = blob_key(filename)
+    if not sha256:
+        return None
+    return (
+        update(Blob)
+        .where(Blob.sha256 == sha256, Blob.ref_count > 0)
+        .values(ref_count=Blob.ref_count - 1, updated_at=datetime.utcnow())
+    )
+
+
+def release_blob(filename: Optional[str]):
+    """참조 -1. 파일은 gc_blobs() 가 지웁니다."""
+    statement = _release_statement(filename)
+    if statement is None:
+        return
+    with get_session() as session:
+        session.exec(statement)
+        session.commit()
+
+
+async def release_blob_async(filename: Optional[str]):
+    statement = _release_statement(filename)
+    if statement is None:
+        return
+    async with get_async_session() as session:
+        await session.exec(statement)
+        await session.commit()
+
+
+def _remove_blob_files(filename: str, sha256: str) -> bool:
+    """
+    파일을 먼저 .gc 로 옮긴 뒤 행이 다시 생겼는지 확인합니다.
+    그 사이 같은 내용이 다시 업로드됐다면 되돌립니다.
+    """
+    path = UPLOAD_DIR / filename
+    trash = path.with_name(path.name + ".gc")
+    try:
+        os.replace(path, trash)
+    except FileNotFoundError:
+        return False
+    with get_session() as session:
+        revived = session.get(Blob, sha256) is not None
+    if revived:
+        if path.exists():
+            trash.unlink(missing_ok=True)
+        else:
+            os.replace(trash, path)
+        return False
+    trash.unlink(missing_ok=True)
+    for variant in path.parent.glob(f"{sha256}_*.webp"):
+        variant.unlink(missing_ok=True)
+    return True
+
+
+def gc_blobs(reconcile: bool = False) -> dict:
+    """
+    참조가 없는 blob 파일을 지웁니다.
+    reconcile=True 이면 먼저 posts/user/edit_posts 를 훑어 ref_count 를 다시 계산합니다
+    (비정상 종료로 어긋난 카운트 복구용, 테이블 전체를 읽으므로 오프라인에서 실행).
+    """
+    if reconcile:
+        reconcile_ref_counts()
+
+    cutoff = datetime.utcnow() - timedelta(seconds=BLOB_GC_GRACE_SECONDS)
+    with get_session() as session:
+        candidates = session.exec(
+            select(Blob.sha256, Blob.filename).where(Blob.ref_count <= 0, Blob.updated_at < cutoff)
+        ).all()
+
+    removed = 0
+    for sha256, filename in candidates:
+        with get_session() as session:
+            # 조건부 DELETE - 그 사이 다시 참조됐다면 0 행
+            result = session.exec(delete(Blob).where(Blob.sha256 == sha256, Blob.ref_count <= 0))
+            session.commit()
+        if result.rowcount and _remove_blob_files(filename, sha256):
+            removed += 1
+
+    orphans = _remove_orphan_files(cutoff)
+    return {"removed_blobs": removed, "removed_orphan_files": orphans}
+
+
+def _remove_orphan_files(cutoff: datetime) -> int:
+    """샤드 디렉터리에 있지만 blobs 행이 없는 파일 (업로드 도중 비정상 종료 등)"""
+    with get_session() as session:
+        known = set(session.exec(select(Blob.sha256)).all())
+    cutoff_ts = cutoff.timestamp()
+    removed = 0
+    for path in UPLOAD_DIR.glob("??/??/*"):
+        sha256 = path.name.split(".")[0].split("_")[0]
+        if sha256 in known or path.stat().st_mtime >= cutoff_ts:
+            continue
+        path.unlink(missing_ok=True)
+        removed += 1
+    for path in TMP_DIR.glob("*.part"):
+        if path.stat().st_mtime < cutoff_ts:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def reconcile_ref_counts():
+    from Models.makepost_model import Post
+    from Models.editpost_model import Post as EditPost
+    from Models.signin_model import User
+
+    counts = {}
+    with get_session() as session:
+        for column in (Post.image_filename, User.profile_image, EditPost.image_url):
+            rows = session.exec(select(column, func.count()).where(column.is_not(None)).group_by(column)).all()
+            for filename, count in rows:
+                sha256 = blob_key(filename)
+                if sha256:
+                    counts[sha256] = counts.get(sha256, 0) + count
+        for blob in session.exec(select(Blob)).all():
+            actual = counts.get(blob.sha256, 0)
+            if blob.ref_count != actual:
+                blob.ref_count = actual
+                blob.updated_at = datetime.utcnow()
+                session.add(blob)
+        session.commit()
+
+
+def storage_stats() -> dict:
+    with get_session() as session:
+        blobs, total_bytes, refs = session.exec(
+            select(func.count(), func.coalesce(func.sum(Blob.size), 0), func.coalesce(func.sum(Blob.ref_count), 0))
+        ).one()
+    return {"unique_blobs": blobs, "stored_bytes": total_bytes, "references": refs}
+
+
+if __name__ == "__main__":
+    # cd backend && python -m utils.blob_store [--reconcile]
+    import sys
+    from Database.database import init_db
+
+    init_db()
+    started = time.perf_counter()
+    print(gc_blobs(reconcile="--reconcile" in sys.argv), f"{time.perf_counter() - started:.2f}s")
+    print(storage_stats())
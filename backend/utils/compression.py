@@ -0,0 +1,136 @@
+import os
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # 없으면 gzip 만 사용합니다
+    brotli = None
+
+# ==========================
+# 응답 압축 (brotli / gzip)
+# ==========================
+# CompressionMiddleware 는 JSON/HTML 같은 동적 응답 중 COMPRESS_MIN_SIZE 바이트 이상인 것만 압축합니다.
+# 작은 응답은 압축해도 줄어드는 양보다 CPU 가 더 듭니다.
+# - 이미 Content-Encoding 이 있는 응답(미리 압축된 정적 파일)과 이미지, SSE 스트림은 건드리지 않습니다.
+# - 동적 응답에는 빠른 압축 수준을 씁니다. 정적 파일은 utils.static_assets 가 최고 수준으로 한 번만 압축합니다.
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = (
+    "text/html", "text/css", "text/plain", "text/javascript", "text/xml", "text/csv",
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+# 선호 순서 - 같은 q 값이면 앞쪽을 고릅니다
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str, supported: Iterable[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """Accept-Encoding 헤더에서 q 값이 가장 높은 지원 인코딩 (없으면 None)"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.partition(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+            self._compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            # wbits=31 -> gzip 헤더/트레일러
+            self._compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        chunk = self._compress(data)
+        return chunk + self._finish() if final else chunk
+
+
+class CompressionMiddleware:
+    """
+    순수 ASGI 미들웨어 - 첫 본문 조각을 보고 압축 여부를 정합니다.
+    한 번에 오는 응답은 Content-Length 를 새로 계산하고, 스트리밍 응답은 조각마다 압축해 보냅니다.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+        encoder: Optional[_Encoder] = None
+
+        async def send_wrapper(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # 헤더는 첫 본문을 본 뒤에 보냅니다
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                # 스트리밍 응답의 나머지 조각 (또는 본문이 아닌 메시지)
+                if start is not None:
+                    await send(start)
+                    start = None
+                if encoder is not None and message["type"] == "http.response.body":
+                    body = encoder.encode(message.get("body", b""), not message.get("more_body", False))
+                    message = {**message, "body": body}
+                await send(message)
+                return
+
+            # 첫 본문 조각 - 압축 여부를 정하고 헤더를 고칩니다
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            compressible = (
+                "content-encoding" not in headers
+                and is_compressible(headers.get("content-type", ""))
+                and start["status"] not in (204, 206, 304)
+            )
+            if compressible:
+                # 크기나 클라이언트에 따라 인코딩이 달라질 수 있음을 공유 캐시에 알립니다
+                headers.add_vary_header("Accept-Encoding")
+            # 스트리밍 응답(FileResponse 등)은 Content-Length 가 있으면 그것으로 크기를 판단합니다
+            size = int(headers["content-length"]) if "content-length" in headers else (None if more_body else len(body))
+            if compressible and encoding is not None and (size is None or size >= self.minimum_size):
+                encoder = _Encoder(encoding)
+                body = encoder.encode(body, not more_body)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Optional, Set
+
+# ==========================
+# 실시간 피드 이벤트 허브 (Server-Sent Events)
+# ==========================
+# GET /posts/stream 에 연결된 클라이언트에게 작은 변경분을 밀어줍니다.
+#   post    : 새 게시글 요약 {id, title, created_at, image_filename}
+#   comment : 새 댓글 {post_id, comment}
+#   like    : 좋아요 수 변경 {post_id, likes}
+#   reset   : 놓친 이벤트를 되살릴 수 없음 - 클라이언트는 목록을 다시 불러와야 합니다
+#
+# 허브는 프로세스마다 하나입니다. 구독자마다 작은 asyncio.Queue 하나만 두므로 유휴 연결은
+# 태스크 하나 + 큐 하나 비용이고, 하트비트도 허브 타이머 하나가 모든 큐에 넣습니다.
+# 워커가 여러 개면 각 워커는 자기 프로세스에서 일어난 쓰기만 내보냅니다.
+#
+# 이벤트 id 는 "<프로세스 epoch>-<순번>" 입니다. 재연결 시 Last-Event-ID 가 같은 epoch 이고
+# 재전송 버퍼(SSE_REPLAY_SIZE) 안에 있으면 이후 이벤트를 다시 보내고, 아니면 reset 을 보냅니다.
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+SSE_REPLAY_SIZE = int(os.getenv("SSE_REPLAY_SIZE", "1000"))
+# 이만큼 밀린 느린 구독자는 끊습니다 (브라우저 EventSource 는 자동 재연결 + Last-Event-ID 로 따라잡음)
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "256"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+
+_HEARTBEAT = (None, ": ping\n\n")
+_CLOSE = None
+
+_epoch = format(int(time.time()), "x")
+_seq = 0
+_replay: deque = deque(maxlen=SSE_REPLAY_SIZE)  # (seq, 인코딩된 이벤트)
+_subscribers: Set[asyncio.Queue] = set()
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_heartbeat_task: Optional[asyncio.Task] = None
+_stats = {"published": 0, "dropped_subscribers": 0}
+
+
+def _encode(event_id: str, event: str, data: dict) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+def _offer(queue: asyncio.Queue, message) -> bool:
+    try:
+        queue.put_nowait(message)
+        return True
+    except asyncio.QueueFull:
+        return False
+
+
+def _dispatch(message: tuple):
+    """이벤트 루프 스레드에서만 실행됩니다."""
+    for queue in list(_subscribers):
+        if not _offer(queue, message):
+            # 버퍼가 가득 찬 구독자는 끊고 재연결 시 재전송 버퍼로 따라잡게 합니다
+            _subscribers.discard(queue)
+            _stats["dropped_subscribers"] += 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_CLOSE)
+
+
+def publish(event: str, data: dict):
+    """
+    이벤트를 모든 구독자에게 보냅니다. 어떤 스레드에서 호출해도 됩니다
+    (동기 컨트롤러는 스레드 풀에서 돌기 때문). 커밋이 끝난 뒤 호출하세요.
+    """
+    global _seq
+    with _lock:
+        _seq += 1
+        message = (_seq, _encode(f"{_epoch}-{_seq}", event, data))
+        _replay.append(message)
+        _stats["published"] += 1
+    loop = _loop
+    if loop is None or loop.is_closed() or not _subscribers:
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        _dispatch(message)
+    else:
+        loop.call_soon_threadsafe(_dispatch, message)
+
+
+def _replay_after(last_event_id: Optional[str]) -> Optional[list]:
+    """재전송할 메시지 목록. 되살릴 수 없으면 None (reset 필요)."""
+    try:
+        epoch, seq = last_event_id.split("-")
+        seq = int(seq)
+    except (AttributeError, ValueError):
+        return None
+    if epoch != _epoch:
+        return None
+    with _lock:
+        if seq >= _seq:
+            return []
+        if not _replay or _replay[0][0] > seq + 1:
+            return None
+        return [message for message in _replay if message[0] > seq]
+
+
+async def subscribe(last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+    """SSE 스트림 본문을 만들어 내는 async generator. 연결이 끊기면 구독을 해제합니다."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+    _subscribers.add(queue)
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        # 구독 직후 다른 스레드에서 발행된 이벤트는 재전송 목록과 큐 양쪽에 있을 수 있어 순번으로 거릅니다
+        sent_upto = 0
+        if last_event_id:
+            missed = _replay_after(last_event_id)
+            if missed is None:
+                yield _encode(f"{_epoch}-{_seq}", "reset", {})
+            else:
+                for seq, message in missed:
+                    sent_upto = seq
+                    yield message
+        else:
+            # 아직 이벤트를 하나도 받지 못한 채 끊겨도 재연결 시 이 지점부터 이어받도록 id 만 보냅니다
+            with _lock:
+                sent_upto = _seq
+            yield f"id: {_epoch}-{sent_upto}\n\n"
+        while True:
+            item = await queue.get()
+            if item is _CLOSE:
+                return
+            seq, message = item
+            if seq is not None and seq <= sent_upto:
+                continue
+            yield message
+    finally:
+        _subscribers.discard(queue)
+
+
+async def _heartbeat_loop():
+    # 프록시/로드밸런서가 유휴 연결을 끊지 않도록 주기적으로 주석 줄을 보냅니다
+    while True:
+        await asyncio.sleep(SSE_HEARTBEAT_INTERVAL)
+        for queue in list(_subscribers):
+            _offer(queue, _HEARTBEAT)
+
+
+def start_event_hub():
+    global _loop, _heartbeat_task
+    _loop = asyncio.get_running_loop()
+    if _heartbeat_task is None:
+        _heartbeat_task = asyncio.create_task(_heartbeat_loop())
+
+
+async def stop_event_hub():
+    """하트비트를 멈추고 열린 스트림을 모두 닫습니다."""
+    global _loop, _heartbeat_task
+    if _heartbeat_task is not None:
+        _heartbeat_task.cancel()
+        try:
+            await _heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        _heartbeat_task = None
+    for queue in list(_subscribers):
+        _offer(queue, _CLOSE)
+    _subscribers.clear()
+    _loop = None
+
+
+def hub_stats() -> dict:
+    return {**_stats, "subscribers": len(_subscribers), "last_event_id": f"{_epoch}-{_seq}"}
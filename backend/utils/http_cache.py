@@ -0,0 +1,65 @@
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# ==========================
+# 조건부 GET (ETag / Last-Modified / 304)
+# ==========================
+# 버전 토큰은 게시글의 version 컬럼과 전역 변경 카운터(counters.posts)에서 만듭니다.
+# 조회수는 매 요청마다 바뀌므로 그대로 넣지 않습니다 (weak ETag). 피드 ETag 에는 조회수 flush 마다 오르는
+# counters.views 를 넣어, 재검증하는 클라이언트도 flush 주기(VIEW_FLUSH_INTERVAL) 안에 새 조회수를 받습니다.
+# 브라우저는 매번 재검증하고(max-age=0), 앞단 CDN 은 s-maxage 동안 공유 캐시로 응답합니다.
+FEED_CACHE_CONTROL = os.getenv("FEED_CACHE_CONTROL", "public, max-age=0, s-maxage=5, stale-while-revalidate=30")
+POST_CACHE_CONTROL = os.getenv("POST_CACHE_CONTROL", "public, max-age=0, s-maxage=10, stale-while-revalidate=60")
+# 로그인 사용자별 내용(좋아요 여부 등)이 들어간 응답 - 브라우저만 보관하고 매번 재검증
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime], cache_control: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # weak 비교: W/ 접두어를 무시하고 태그 값만 비교
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-None-Match 가 있으면 그것만, 없으면 If-Modified-Since 로 판단합니다 (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP 날짜는 초 단위
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
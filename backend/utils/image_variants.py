@@ -0,0 +1,138 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.blob_store import UPLOAD_DIR
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 가 없으면 원본만 제공합니다
+    Image = None
+
+# ==========================
+# 업로드 이미지 리사이즈 변형(variant) 생성
+# ==========================
+# 목록/상세/아바타에서 원본 사진을 그대로 내려주지 않도록 작은 WebP 변형을 만듭니다.
+# 생성은 백그라운드 워커 풀에서 돌고, 끝나면 DB 의 *_variants 컬럼에 파일명을 기록합니다.
+# 기록 전까지 응답의 variant URL 은 null 이고 프론트엔드는 원본을 사용합니다.
+# 종료 시(lifespan) 실행 중인 작업은 끝까지 기다리고 대기 중인 작업은 취소합니다.
+# 취소되었거나 비정상 종료로 잃은 작업은 다음 시작 때 *_variants 가 NULL 인 행을 보고 다시 예약합니다.
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+
+# name -> (최대 가로, 최대 세로, 정사각형 크롭 여부)
+POST_VARIANTS = {
+    "thumb": (480, 480, False),
+    "detail": (1280, 1280, False),
+}
+PROFILE_VARIANTS = {
+    "avatar": (128, 128, True),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _submit(*args):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-variants")
+    _executor.submit(*args)
+
+
+def variant_filename(filename: str, name: str) -> str:
+    # blob 과 같은 샤드 디렉터리에 둡니다 (ab/cd/<sha256>_thumb.webp)
+    path = Path(filename)
+    return str(path.with_name(f"{path.stem}_{name}.webp"))
+
+
+def generate_variants(filename: str, specs: Dict[str, tuple]) -> Dict[str, str]:
+    """
+    원본 파일에서 specs 에 정의된 변형들을 만들고 {variant 이름: 파일명} 을 반환합니다.
+    """
+    if Image is None:
+        return {}
+    variants = {}
+    with Image.open(UPLOAD_DIR / filename) as original:
+        # 휴대폰 사진의 EXIF 회전 정보를 픽셀에 반영
+        source = ImageOps.exif_transpose(original)
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "transparency" in source.info else "RGB")
+        for name, (width, height, crop) in specs.items():
+            out_name = variant_filename(filename, name)
+            variants[name] = out_name
+            # 같은 내용(같은 sha256)의 변형이 이미 있으면 다시 만들지 않습니다
+            if (UPLOAD_DIR / out_name).exists():
+                continue
+            if crop:
+                image = ImageOps.fit(source, (width, height), Image.LANCZOS)
+            else:
+                image = source.copy()
+                image.thumbnail((width, height), Image.LANCZOS)
+            image.save(UPLOAD_DIR / out_name, "WEBP", quality=WEBP_QUALITY, method=4)
+    return variants
+
+
+def _run(filename: str, specs: Dict[str, tuple], record):
+    try:
+        variants = generate_variants(filename, specs)
+        if variants:
+            record(filename, json.dumps(variants))
+    except FileNotFoundError:
+        # 원본이 이미 정리된 이미지 (blob GC 등) - 원본 URL 도 없으므로 만들 변형이 없습니다
+        print(f"Image variants skipped, original is missing: {filename}")
+    except Exception:
+        import traceback
+        print(f"Error generating image variants for {filename}: {traceback.format_exc()}")
+
+
+def schedule_post_variants(image_filename: Optional[str]):
+    """게시글 이미지 변형 생성을 예약합니다 (DB 에 게시글이 저장된 뒤 호출)."""
+    if image_filename:
+        from Controllers.makepost_controller import set_post_image_variants
+        _submit(_run, image_filename, POST_VARIANTS, set_post_image_variants)
+
+
+def schedule_profile_variants(profile_image: Optional[str]):
+    """프로필 이미지 변형 생성을 예약합니다 (DB 에 사용자가 저장된 뒤 호출)."""
+    if profile_image:
+        from Controllers.signin_controller import set_profile_image_variants
+        _submit(_run, profile_image, PROFILE_VARIANTS, set_profile_image_variants)
+
+
+def reschedule_missing_variants() -> int:
+    """
+    이미지는 있는데 변형이 기록되지 않은 게시글/프로필의 변형 생성을 다시 예약합니다 (lifespan 시작 시).
+    예약한 이미지 수를 반환합니다. Pillow 가 없으면 만들 수 없으므로 건너뜁니다.
+    """
+    if Image is None:
+        return 0
+    from Controllers.makepost_controller import post_images_missing_variants
+    from Controllers.signin_controller import profile_images_missing_variants
+
+    post_images = post_images_missing_variants()
+    profile_images = profile_images_missing_variants()
+    for filename in post_images:
+        schedule_post_variants(filename)
+    for filename in profile_images:
+        schedule_profile_variants(filename)
+    return len(post_images) + len(profile_images)
+
+
+def stop_variant_workers():
+    """실행 중인 변형 작업은 끝까지 기다리고 대기 중인 작업은 취소합니다 (다음 시작 때 다시 예약됨)."""
+    global _executor
+    if _executor is None:
+        return
+    executor, _executor = _executor, None
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+def variant_urls(variants_json: Optional[str]) -> Optional[Dict[str, str]]:
+    """DB 에 저장된 JSON 문자열 -> {variant 이름: URL}"""
+    if not variants_json:
+        return None
+    if isinstance(variants_json, dict):
+        return variants_json
+    return {name: f"/uploaded_images/{filename}" for name, filename in json.loads(variants_json).items()}
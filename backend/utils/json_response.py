@@ -0,0 +1,35 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # requirements.txt 에 있지만, 없으면 표준 json 으로 동작합니다
+    orjson = None
+
+# ==========================
+# 빠른 JSON 응답
+# ==========================
+# 목록/상세처럼 응답 dict 를 직접 만드는 라우트용입니다. Pydantic 검증 없이 바로 인코딩하고,
+# datetime 은 ISO 8601 문자열로 (Pydantic 의 mode="json" 과 같은 모양) 바꿉니다.
+# 라우트가 이 응답을 반환하면 FastAPI 는 response_model 검증/직렬화를 건너뜁니다
+# (response_model 은 문서화용으로만 남습니다).
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,202 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# ==========================
+# 요청 계측 (Prometheus 텍스트 형식)
+# ==========================
+# MetricsMiddleware 가 요청마다 라우트별로 다음을 기록하고 GET /metrics 로 내보냅니다.
+# - http_requests_total{method,route,status}
+# - http_request_duration_seconds (히스토그램) / http_requests_in_flight
+# - http_request_db_seconds (히스토그램) - 같은 요청 안에서 실행된 SQL 시간의 합
+#   핸들러 시간 = duration - db 시간 으로 비교합니다
+# - http_response_size_bytes (히스토그램)
+# DB 시간은 Database/database.py 가 엔진을 만들 때 instrument_engine() 으로 단 이벤트 훅이 잽니다.
+# 값은 워커(프로세스)별입니다 - Prometheus 가 워커마다 수집하거나 합산해야 합니다.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# 요청별 DB 시간 누적 [초, 쿼리 수] - 동기 라우트의 스레드 풀에도 context 가 복사되어 같은 리스트를 봅니다
+_request_db: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar("request_db", default=None)
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+_requests: Dict[Tuple[str, str, int], int] = {}
+_durations: Dict[Tuple[str, str], Histogram] = {}
+_db_durations: Dict[Tuple[str, str], Histogram] = {}
+_db_queries: Dict[Tuple[str, str], int] = {}
+_sizes: Dict[Tuple[str, str], Histogram] = {}
+_in_flight = 0
+_db_totals = {"queries": 0, "seconds": 0.0}
+
+
+# ==========================
+# SQLAlchemy 이벤트 훅
+# ==========================
+def instrument_engine(sync_engine):
+    """엔진의 모든 SQL 실행 시간을 재서 전체 합계와 현재 요청의 합계에 더합니다."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        with _lock:
+            _db_totals["queries"] += 1
+            _db_totals["seconds"] += elapsed
+        current = _request_db.get()
+        if current is not None:
+            current[0] += elapsed
+            current[1] += 1
+
+
+# ==========================
+# ASGI 미들웨어
+# ==========================
+def _route_label(scope) -> str:
+    # FastAPI 는 매칭된 라우트를 scope["route"] 에 넣습니다 -> "/posts/{post_id}" 처럼 템플릿으로 묶입니다
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    root = scope.get("root_path", "")
+    path = scope.get("path", "")[len(root):]
+    for mount in ("/static", "/uploaded_images"):
+        if path.startswith(mount + "/"):
+            return mount
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    순수 ASGI 미들웨어 - BaseHTTPMiddleware 와 달리 응답을 버퍼링하지 않아
+    SSE 스트림(/posts/stream)이나 큰 파일 응답에도 영향을 주지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _in_flight
+        from utils import profiler
+
+        status = {"code": 500, "size": 0}
+        db = [0.0, 0]
+        token = _request_db.set(db)
+        started = time.perf_counter()
+        profile = profiler.begin()
+        _in_flight += 1
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                status["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _in_flight -= 1
+            elapsed = time.perf_counter() - started
+            _request_db.reset(token)
+            route = _route_label(scope)
+            _record(scope["method"], route, status["code"], elapsed, db[0], db[1], status["size"])
+            profiler.end(profile, scope["method"], route, elapsed)
+
+
+def _record(method: str, route: str, status: int, elapsed: float, db_seconds: float, db_queries: int, size: int):
+    key = (method, route)
+    with _lock:
+        _requests[(method, route, status)] = _requests.get((method, route, status), 0) + 1
+        _durations.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+        _db_durations.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(db_seconds)
+        _db_queries[key] = _db_queries.get(key, 0) + db_queries
+        _sizes.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(extra: Optional[Dict[str, dict]] = None) -> str:
+    """
+    Prometheus text exposition format (0.0.4).
+    extra: {"post_cache": {"hits": 1, ...}} 형태의 숫자 통계 -> community_stat{source,name}
+    """
+    lines = []
+    with _lock:
+        lines.append("# HELP http_requests_total Requests handled, by route template and status.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in sorted(_requests.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        for name, help_text, histograms in (
+            ("http_request_duration_seconds", "Total request latency.", _durations),
+            ("http_request_db_seconds", "Time spent in SQL per request (handler time = duration - db).", _db_durations),
+            ("http_response_size_bytes", "Response body size.", _sizes),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), histogram in sorted(histograms.items()):
+                lines.extend(histogram.render(name, f'method="{method}",route="{_escape(route)}"'))
+
+        lines.append("# HELP http_request_db_queries_total SQL statements executed while handling requests.")
+        lines.append("# TYPE http_request_db_queries_total counter")
+        for (method, route), count in sorted(_db_queries.items()):
+            lines.append(f'http_request_db_queries_total{{method="{method}",route="{_escape(route)}"}} {count}')
+
+        lines.append("# HELP http_requests_in_flight Requests currently being handled (including open streams).")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        lines.append(f"http_requests_in_flight {_in_flight}")
+
+        lines.append("# HELP db_queries_total SQL statements executed (requests and background tasks).")
+        lines.append("# TYPE db_queries_total counter")
+        lines.append(f"db_queries_total {_db_totals['queries']}")
+        lines.append("# HELP db_query_seconds_total Time spent in SQL (requests and background tasks).")
+        lines.append("# TYPE db_query_seconds_total counter")
+        lines.append(f"db_query_seconds_total {_db_totals['seconds']:.6f}")
+
+    if extra:
+        lines.append("# HELP community_stat Internal counters and gauges (also at /stats/*).")
+        lines.append("# TYPE community_stat gauge")
+        for source, values in extra.items():
+            for name, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                lines.append(f'community_stat{{source="{source}",name="{_escape(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
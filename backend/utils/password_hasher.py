@@ -0,0 +1,188 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+# ==========================
+# 비밀번호 해시 서비스 / 해시 정책
+# ==========================
+# 비밀번호 해싱은 모두 이 모듈의 pwd_context 를 거칩니다 (로그인, 회원가입, 비밀번호 변경).
+# bcrypt 한 번에 100~300ms 의 CPU를 쓰므로 이벤트 루프에서 직접 돌리면 안 됩니다.
+# bcrypt 는 해싱 중 GIL 을 놓기 때문에 스레드 풀로도 코어 수만큼 병렬 처리가 됩니다.
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# 워커가 모두 바쁠 때 대기열에 쌓아둘 수 있는 최대 작업 수. 넘치면 503 으로 거절합니다.
+HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# bcrypt cost (2^rounds 번 반복). 1 올리면 해싱/검증 시간이 두 배 - 아래 calibrate() 로 정합니다.
+# 이 값과 다른 cost 로 저장된 해시는 needs_update() 가 True 가 되어, 다음 로그인 성공 시
+# 백그라운드에서 새 cost 로 다시 해싱합니다 (schedule_rehash). 낮추는 방향도 같습니다.
+BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _acquire_slot():
+    global _pending
+    with _pending_lock:
+        if _pending >= HASH_WORKERS + HASH_MAX_QUEUE:
+            raise HTTPException(
+                status_code=503,
+                detail="요청이 많아 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+
+
+def _release_slot(_future=None):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+async def _run(fn, *args):
+    _acquire_slot()
+    try:
+        future = _executor.submit(fn, *args)
+    except Exception:
+        _release_slot()
+        raise
+    # 요청이 취소되어도 슬롯은 실제 작업이 끝난 뒤에 반환됩니다.
+    future.add_done_callback(_release_slot)
+    return await asyncio.wrap_future(future)
+
+
+def hash_password(password: str) -> str:
+    """동기 버전 - 이벤트 루프 밖(스크립트, 스레드)에서만 사용"""
+    return pwd_context.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """동기 버전 - 이벤트 루프 밖(스크립트, 스레드)에서만 사용"""
+    return pwd_context.verify(password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await _run(pwd_context.verify, password, hashed_password)
+
+
+# ==========================
+# 로그인 시 해시 업그레이드 (rehash-on-login)
+# ==========================
+_rehash_tasks: Set[asyncio.Task] = set()
+_rehash_stats = {"rehashed": 0, "rehash_skipped": 0}
+
+
+def needs_update(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+async def _rehash(user_id: int, password: str, old_hash: str):
+    from sqlmodel import update
+    from Database.database import get_async_session
+    from Models.signin_model import User
+
+    try:
+        new_hash = await hash_password_async(password)
+        async with get_async_session() as session:
+            # 그 사이 비밀번호가 바뀌었다면(old_hash 불일치) 덮어쓰지 않습니다
+            result = await session.exec(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await session.commit()
+        _rehash_stats["rehashed" if result.rowcount else "rehash_skipped"] += 1
+    except HTTPException:
+        # 해시 풀이 가득 참 - 다음 로그인 때 다시 시도
+        _rehash_stats["rehash_skipped"] += 1
+    except Exception:
+        import traceback
+        print(f"Error rehashing password for user {user_id}: {traceback.format_exc()}")
+
+
+def schedule_rehash(user_id: int, password: str, hashed_password: str):
+    """
+    로그인에 성공한 뒤 호출합니다. 해시가 현재 정책(BCRYPT_ROUNDS)과 다르면
+    응답을 기다리게 하지 않고 백그라운드에서 새 해시로 바꿉니다.
+    """
+    if not needs_update(hashed_password):
+        return
+    task = asyncio.create_task(_rehash(user_id, password, hashed_password))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+def pool_stats() -> dict:
+    return {
+        "workers": HASH_WORKERS,
+        "max_queue": HASH_MAX_QUEUE,
+        "pending": _pending,
+        "bcrypt_rounds": BCRYPT_ROUNDS,
+        **_rehash_stats,
+    }
+
+
+# ==========================
+# cost 보정 벤치마크
+# ==========================
+def calibrate(rounds_list=(10, 11, 12, 13, 14), seconds: float = 2.0) -> list:
+    """
+    cost 별로 검증 한 번의 시간과 코어당 초당 검증 수를 잽니다.
+    로그인 처리량 ~= verifies_per_sec_per_core * PASSWORD_HASH_WORKERS (bcrypt 는 GIL 을 놓음)
+    """
+    results = []
+    for rounds in rounds_list:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+        hashed = context.hash("calibration-Passw0rd!")
+        count = 0
+        started = time.perf_counter()
+        while True:
+            context.verify("calibration-Passw0rd!", hashed)
+            count += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= seconds and count >= 2:
+                break
+        per_verify = elapsed / count
+        results.append({
+            "rounds": rounds,
+            "ms_per_verify": round(per_verify * 1000, 1),
+            "verifies_per_sec_per_core": round(1 / per_verify, 1),
+            "verifies_per_sec_pool": round(HASH_WORKERS / per_verify, 1),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    # cd backend && python -m utils.password_hasher [rounds ...] [--seconds N]
+    import sys
+
+    args = sys.argv[1:]
+    seconds = 2.0
+    if "--seconds" in args:
+        index = args.index("--seconds")
+        seconds = float(args[index + 1])
+        del args[index:index + 2]
+    rounds_list = [int(arg) for arg in args] or [10, 11, 12, 13, 14]
+    print(f"current PASSWORD_BCRYPT_ROUNDS={BCRYPT_ROUNDS}, PASSWORD_HASH_WORKERS={HASH_WORKERS}")
+    print(f"{'rounds':>6} {'ms/verify':>10} {'verify/s/core':>14} {'verify/s (pool)':>16}")
+    for row in calibrate(rounds_list, seconds):
+        print(f"{row['rounds']:>6} {row['ms_per_verify']:>10} {row['verifies_per_sec_per_core']:>14} {row['verifies_per_sec_pool']:>16}")
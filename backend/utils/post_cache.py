@@ -0,0 +1,185 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# ==========================
+# 게시글 상세 read-through 캐시 (프로세스 내 LRU + TTL)
+# ==========================
+# 인기 게시글 상세를 볼 때마다 게시글/댓글/좋아요를 다시 조회하고 PostResponse 로
+# 검증하지 않도록 직렬화가 끝난 응답(dict)을 보관합니다.
+# - 이 프로세스의 쓰기(수정/삭제/좋아요/댓글/이미지 변형) : 커밋 직후 invalidate()
+# - 다른 워커의 쓰기 : 같은 트랜잭션에서 change_log 에 한 줄을 남기고,
+#   각 워커가 POST_CACHE_POLL_INTERVAL 마다 새 줄을 읽어 무효화합니다.
+#   따라서 다른 워커에서 일어난 변경은 최대 폴링 주기만큼 늦게 보일 수 있습니다.
+# - 조회수는 캐시에 DB 값만 담고 응답 시 버퍼 증가분을 더합니다 (flush 되면 utils.view_counter 가 invalidate()).
+# 같은 폴링이 entity="user" 줄도 처리합니다 (utils.session_tokens 의 토큰 버전 캐시).
+POST_CACHE_SIZE = int(os.getenv("POST_CACHE_SIZE", "1024"))
+POST_CACHE_TTL = float(os.getenv("POST_CACHE_TTL", "60"))
+POST_CACHE_POLL_INTERVAL = float(os.getenv("POST_CACHE_POLL_INTERVAL", "1"))
+# 시작 시 미리 채울 최신 게시글 수 (Controllers.makepost_controller.warm_post_cache)
+POST_CACHE_WARM = int(os.getenv("POST_CACHE_WARM", "50"))
+# change_log 보관 기간 - 폴링 주기보다 충분히 길어야 합니다
+CHANGE_LOG_RETENTION = int(os.getenv("CHANGE_LOG_RETENTION", "600"))
+
+# post_id -> (만료 시각, version, last_modified, payload)
+_entries: "OrderedDict[int, Tuple[float, int, object, dict]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0, "stale_puts": 0}
+_last_change_id = 0
+_poller_task: Optional[asyncio.Task] = None
+# 무효화 세대 - invalidate()/clear() 마다 오릅니다. 상세를 읽기 시작할 때의 세대를 put(since=) 에 넘기면
+# 읽는 동안 그 게시글이 무효화된 경우 오래된 payload 를 넣지 않습니다.
+# 최근 무효화만 기억하고, 잊은 범위보다 오래된 since 는 안전하게 거절합니다.
+_generation = 0
+_invalidated: "OrderedDict[int, int]" = OrderedDict()  # post_id -> 마지막 무효화 세대
+_INVALIDATED_KEEP = 4096
+_forgotten_generation = 0
+
+
+def get(post_id: int):
+    """(version, last_modified, payload) 또는 None. payload 는 수정하지 말고 복사해서 쓰세요."""
+    with _lock:
+        entry = _entries.get(post_id)
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        expires_at, version, last_modified, payload = entry
+        if expires_at < time.monotonic():
+            del _entries[post_id]
+            _stats["expired"] += 1
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(post_id)
+        _stats["hits"] += 1
+        return version, last_modified, payload
+
+
+def generation() -> int:
+    """읽기 전에 받아 두었다가 put(since=) 에 넘깁니다."""
+    with _lock:
+        return _generation
+
+
+def put(post_id: int, version: int, last_modified, payload: dict, since: Optional[int] = None) -> bool:
+    """
+    캐시에 넣었으면 True. since 이후 이 게시글이 무효화되었거나, 이미 더 새 version 이 들어 있으면 넣지 않습니다
+    (읽는 사이에 커밋 + invalidate() 가 끼어든 경우).
+    """
+    if POST_CACHE_SIZE <= 0:
+        return False
+    with _lock:
+        existing = _entries.get(post_id)
+        if since is not None and (_invalidated.get(post_id, 0) > since or _forgotten_generation > since):
+            _stats["stale_puts"] += 1
+            return False
+        if existing is not None and existing[1] > version:
+            _stats["stale_puts"] += 1
+            return False
+        _entries[post_id] = (time.monotonic() + POST_CACHE_TTL, version, last_modified, payload)
+        _entries.move_to_end(post_id)
+        while len(_entries) > POST_CACHE_SIZE:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+        return True
+
+
+def _next_generation() -> int:
+    global _generation
+    _generation += 1
+    return _generation
+
+
+def invalidate(post_id: int):
+    global _forgotten_generation
+    with _lock:
+        # 항목이 없어도 기록합니다 - 지금 읽고 있는 load 가 나중에 put 할 수 있으므로
+        _invalidated[post_id] = _next_generation()
+        _invalidated.move_to_end(post_id)
+        if len(_invalidated) > _INVALIDATED_KEEP:
+            _, _forgotten_generation = _invalidated.popitem(last=False)
+        if _entries.pop(post_id, None) is not None:
+            _stats["invalidations"] += 1
+
+
+def clear():
+    global _forgotten_generation
+    with _lock:
+        _entries.clear()
+        _invalidated.clear()
+        _forgotten_generation = _next_generation()
+
+
+def stats() -> dict:
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "size": len(_entries),
+            "max_size": POST_CACHE_SIZE,
+            "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+            "last_change_id": _last_change_id,
+        }
+
+
+# ==========================
+# 워커 간 무효화 (change_log 폴링)
+# ==========================
+def poll_changes() -> int:
+    """change_log 의 새 줄을 읽어 해당 게시글을 무효화하고 처리한 줄 수를 반환합니다."""
+    global _last_change_id
+    from Controllers.counter_controller import changes_since
+
+    processed = 0
+    while True:
+        rows = changes_since(_last_change_id)
+        for change_id, entity, entity_id in rows:
+            if entity == "post":
+                invalidate(entity_id)
+            elif entity == "user":
+                # 다른 워커에서 비밀번호 변경/탈퇴 - 세션 토큰 버전 캐시를 비웁니다
+                from utils.session_tokens import forget_user
+                forget_user(entity_id)
+            _last_change_id = change_id
+        processed += len(rows)
+        if len(rows) < 1000:
+            return processed
+
+
+async def _poll_loop():
+    from Controllers.counter_controller import prune_changes
+
+    last_prune = time.monotonic()
+    while True:
+        await asyncio.sleep(POST_CACHE_POLL_INTERVAL)
+        try:
+            await asyncio.to_thread(poll_changes)
+            if time.monotonic() - last_prune > CHANGE_LOG_RETENTION / 2:
+                last_prune = time.monotonic()
+                await asyncio.to_thread(prune_changes, CHANGE_LOG_RETENTION)
+        except Exception:
+            import traceback
+            print(f"Error polling change log: {traceback.format_exc()}")
+
+
+def start_cache_sync():
+    """지금까지의 변경은 건너뛰고(빈 캐시이므로) 이후 변경만 따라갑니다."""
+    global _poller_task, _last_change_id
+    from Controllers.counter_controller import latest_change_id
+
+    if _poller_task is None:
+        _last_change_id = latest_change_id()
+        _poller_task = asyncio.create_task(_poll_loop())
+
+
+async def stop_cache_sync():
+    global _poller_task
+    if _poller_task is not None:
+        _poller_task.cancel()
+        try:
+            await _poller_task
+        except asyncio.CancelledError:
+            pass
+        _poller_task = None
@@ -0,0 +1,142 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+# ==========================
+# 느린 요청 샘플링 프로파일러
+# ==========================
+# PROFILE_SLOW_REQUEST_MS > 0 이면 백그라운드 스레드가 PROFILE_SAMPLE_INTERVAL_MS 마다
+# 모든 스레드의 스택을 찍어 최근 PROFILE_WINDOW_SECONDS 초 분량을 링 버퍼에 둡니다.
+# 이 시간보다 오래 걸린 요청이 끝나면 그 요청이 진행되던 동안의 샘플을 모아
+# PROFILE_DIR/<시각>_<method>_<route>_<ms>ms.folded 로 저장합니다.
+# 형식은 "func;func;func 횟수" (folded stacks) 이라 flamegraph.pl, speedscope 등에 바로 넣을 수 있습니다.
+#
+# 요청과 스레드를 정확히 짝지을 수 없으므로 그 시간 동안 "일하고 있던" 모든 스레드의 샘플을 담습니다
+# (대기 중인 스레드는 제외). 동시 요청이 적을 때 가장 정확합니다. 켜 두면 샘플링 비용이 듭니다.
+PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_WINDOW_SECONDS = float(os.getenv("PROFILE_WINDOW_SECONDS", "30"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+
+# 스택 맨 위가 이 함수들이면 그 스레드는 쉬고 있는 것으로 봅니다
+_IDLE_FUNCTIONS = {
+    "wait", "select", "poll", "epoll", "sleep", "_worker", "accept", "get", "_wait_for_tstate_lock",
+    "_connection_worker_thread",  # aiosqlite 연결 스레드 (큐 대기)
+}
+
+_samples: deque = deque()  # (perf_counter, folded stack)
+_samples_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+# 프로파일 파일은 이 스레드가 씁니다 - 이벤트 루프(요청 처리 중인 미들웨어)에서 파일 I/O 를 하지 않도록
+_writer: Optional[ThreadPoolExecutor] = None
+_stop = threading.Event()
+_enabled = False
+_dumped = 0
+
+
+def _fold(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample_loop():
+    interval = PROFILE_SAMPLE_INTERVAL_MS / 1000
+    me = threading.get_ident()
+    while not _stop.wait(interval):
+        now = time.perf_counter()
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me or frame.f_code.co_name in _IDLE_FUNCTIONS:
+                continue
+            stacks.append(_fold(frame))
+        with _samples_lock:
+            for stack in stacks:
+                _samples.append((now, stack))
+            cutoff = now - PROFILE_WINDOW_SECONDS
+            while _samples and _samples[0][0] < cutoff:
+                _samples.popleft()
+
+
+def start_profiler():
+    """PROFILE_SLOW_REQUEST_MS 가 설정되어 있을 때만 샘플링 스레드를 시작합니다."""
+    global _thread, _enabled, _writer
+    if PROFILE_SLOW_REQUEST_MS <= 0 or _thread is not None:
+        return
+    _stop.clear()
+    _enabled = True
+    _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-writer")
+    _thread = threading.Thread(target=_sample_loop, name="request-profiler", daemon=True)
+    _thread.start()
+
+
+def stop_profiler():
+    global _thread, _enabled, _writer
+    _enabled = False
+    if _thread is not None:
+        _stop.set()
+        _thread.join(timeout=1)
+        _thread = None
+    if _writer is not None:
+        # 대기 중인 프로파일은 마저 씁니다
+        _writer.shutdown(wait=True)
+        _writer = None
+
+
+def begin() -> Optional[float]:
+    return time.perf_counter() if _enabled else None
+
+
+def end(started: Optional[float], method: str, route: str, elapsed: float):
+    """느린 요청이면 그 구간의 샘플을 folded stack 파일로 저장하도록 writer 스레드에 넘깁니다 (바로 반환)."""
+    if started is None or elapsed * 1000 < PROFILE_SLOW_REQUEST_MS:
+        return
+    writer = _writer
+    if writer is None:
+        return
+    try:
+        writer.submit(_dump, started, method, route, elapsed)
+    except RuntimeError:
+        pass  # 종료 중 (shutdown 이후)
+
+
+def _dump(started: float, method: str, route: str, elapsed: float):
+    # 샘플은 PROFILE_WINDOW_SECONDS 동안 남아 있으므로 writer 스레드에서 골라도 됩니다
+    try:
+        _write_profile(started, method, route, elapsed)
+    except Exception:
+        import traceback
+        print(f"Error writing profile: {traceback.format_exc()}")
+
+
+def _write_profile(started: float, method: str, route: str, elapsed: float):
+    global _dumped
+    finished = started + elapsed
+    with _samples_lock:
+        stacks = Counter(stack for at, stack in _samples if started <= at <= finished)
+    if not stacks:
+        return
+    PROFILE_DIR.mkdir(exist_ok=True)
+    safe_route = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+    path = PROFILE_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}_{method}_{safe_route}_{int(elapsed * 1000)}ms.folded"
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    _dumped += 1
+
+
+def profiler_stats() -> dict:
+    return {
+        "enabled": _enabled,
+        "slow_request_ms": PROFILE_SLOW_REQUEST_MS,
+        "buffered_samples": len(_samples),
+        "profiles_written": _dumped,
+    }
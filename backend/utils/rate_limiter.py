@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from sqlalchemy import text
+
+# ==========================
+# 토큰 버킷 rate limiter
+# ==========================
+# 버킷마다 최대 burst 개의 토큰이 있고 초당 rate 개씩 다시 찹니다. 요청 하나가 토큰 하나를 씁니다.
+# 저장소는 두 가지입니다.
+# - memory : 프로세스 안의 dict (기본값). 워커가 N 개면 실제 허용량도 N 배가 됩니다.
+# - sqlite : rate_limits 테이블을 워커들이 공유. 한 번의 UPSERT 로 원자적으로 갱신합니다.
+RATE_LIMIT_STORE = os.getenv("LOGIN_RATE_STORE", "memory")
+# 메모리 저장소에 보관할 최대 키 수 (오래 안 쓰인 키부터 버립니다 - 버려진 키는 가득 찬 버킷과 같음)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+class TokenBucketLimiter:
+    def __init__(self, name: str, burst: float, per_minute: float):
+        self.name = name
+        self.burst = float(burst)
+        self.rate = per_minute / 60.0
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_hits = 0
+
+    def _retry_after(self, tokens: float) -> int:
+        """토큰 하나가 찰 때까지 남은 초 (Retry-After 헤더용)"""
+        if self.rate <= 0:
+            return 60
+        return max(1, int((1 - tokens) / self.rate + 0.999))
+
+    def hit(self, key: str) -> Tuple[bool, int]:
+        """토큰 하나를 쓰려고 시도합니다 -> (허용 여부, 거절 시 Retry-After 초)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > RATE_LIMIT_MAX_KEYS:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else self._retry_after(tokens)
+
+    def hit_shared(self, key: str) -> Tuple[bool, int]:
+        """sqlite 저장소 버전 - 스레드에서 호출합니다 (hit_async)."""
+        from Database.database import engine
+
+        now = time.time()
+        params = {"key": f"{self.name}:{key}", "burst": self.burst, "rate": self.rate, "now": now}
+        # 리필 계산과 차감을 UPSERT 한 문장에서 처리하므로 워커끼리 경쟁해도 토큰이 새지 않습니다
+        refilled = "MIN(:burst, rate_limits.tokens + (:now - rate_limits.updated_at) * :rate)"
+        statement = text(f"""
+            INSERT INTO rate_limits (key, tokens, updated_at, allowed) VALUES (:key, :burst - 1, :now, 1)
+            ON CONFLICT(key) DO UPDATE SET
+                tokens = CASE WHEN {refilled} >= 1 THEN {refilled} - 1 ELSE {refilled} END,
+                allowed = {refilled} >= 1,
+                updated_at = :now
+            RETURNING tokens, allowed
+        """)
+        with engine.begin() as conn:
+            tokens, allowed = conn.execute(statement, params).one()
+        self._shared_hits += 1
+        if self._shared_hits % 1000 == 0:
+            self.prune_shared()
+        return bool(allowed), 0 if allowed else self._retry_after(tokens)
+
+    def prune_shared(self):
+        """다시 가득 찼을 만큼 오래된 버킷 행을 지웁니다 (지워도 결과가 같음)."""
+        from Database.database import engine
+
+        full_after = self.burst / self.rate if self.rate > 0 else 86400
+        with engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM rate_limits WHERE key LIKE :prefix AND updated_at < :cutoff"),
+                {"prefix": f"{self.name}:%", "cutoff": time.time() - full_after},
+            )
+
+    async def hit_async(self, key: str) -> Tuple[bool, int]:
+        if RATE_LIMIT_STORE == "sqlite":
+            return await asyncio.to_thread(self.hit_shared, key)
+        return self.hit(key)
+
@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import Header, HTTPException
+from pydantic import BaseModel
+from sqlmodel import select
+
+from Database.database import get_async_read_session
+from Models.signin_model import User
+
+# ==========================
+# 서명된 세션 토큰
+# ==========================
+# /auth/login 에서 발급하고, 이후 요청은 "Authorization: Bearer <token>" 으로 보냅니다.
+# 토큰 = v1.<payload(base64)>.<HMAC-SHA256 서명(base64)>,  payload = {uid, email, ver, exp}
+# 검증은 HMAC 한 번 + 메모리 캐시 조회라 요청당 수 마이크로초입니다 (bcrypt 는 로그인 때만).
+#
+# 폐기: user.token_version 을 올리면 그 이전에 발급된 토큰은 모두 무효가 됩니다
+# (비밀번호 변경, 회원 탈퇴). token_version 은 워커별로 SESSION_VERSION_CACHE_TTL 초 캐시되고,
+# 변경 시 change_log(entity="user") 로 다른 워커의 캐시도 지웁니다 (utils.post_cache 폴링).
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))
+SESSION_VERSION_CACHE_TTL = float(os.getenv("SESSION_VERSION_CACHE_TTL", "30"))
+SESSION_SECRET_FILE = os.getenv("SESSION_SECRET_FILE", "session_secret.key")
+
+_TOKEN_PREFIX = "v1"
+
+
+def _load_secret() -> bytes:
+    """SESSION_SECRET 환경 변수, 없으면 SESSION_SECRET_FILE (처음 한 번 생성, 워커끼리 공유)."""
+    secret = os.getenv("SESSION_SECRET")
+    if secret:
+        return secret.encode()
+    try:
+        fd = os.open(SESSION_SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(SESSION_SECRET_FILE, "rb") as f:
+            return f.read().strip()
+    secret = base64.urlsafe_b64encode(os.urandom(32))
+    with os.fdopen(fd, "wb") as f:
+        f.write(secret)
+    return secret
+
+
+# import 시 파일을 읽지 않도록 처음 필요할 때 (또는 lifespan 의 load_session_secret()) 읽습니다
+_secret: Optional[bytes] = None
+
+
+def load_session_secret() -> bytes:
+    global _secret
+    if _secret is None:
+        _secret = _load_secret()
+    return _secret
+
+# user_id -> (token_version 또는 None(탈퇴), 만료 시각)
+_versions: Dict[int, Tuple[Optional[int], float]] = {}
+_versions_lock = threading.Lock()
+
+
+class SessionUser(BaseModel):
+    id: int
+    email: str
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(load_session_secret(), f"{_TOKEN_PREFIX}.{payload}".encode(), hashlib.sha256).digest())
+
+
+def issue_token(user_id: int, email: str, token_version: int) -> str:
+    claims = {"uid": user_id, "email": email, "ver": token_version, "exp": int(time.time()) + SESSION_TTL}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{_TOKEN_PREFIX}.{payload}.{_sign(payload)}"
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """서명과 만료만 확인합니다 (폐기 여부는 확인하지 않음). 잘못된 토큰이면 None."""
+    try:
+        prefix, payload, signature = token.split(".")
+    except ValueError:
+        return None
+    if prefix != _TOKEN_PREFIX or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def forget_user(user_id: int):
+    """token_version 캐시를 지웁니다 - 비밀번호 변경/탈퇴 직후, 또는 다른 워커의 변경을 폴링으로 받았을 때."""
+    with _versions_lock:
+        _versions.pop(user_id, None)
+
+
+async def _current_token_version(user_id: int) -> Optional[int]:
+    now = time.monotonic()
+    with _versions_lock:
+        cached = _versions.get(user_id)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    async with get_async_read_session() as session:
+        version = (await session.exec(select(User.token_version).where(User.id == user_id))).first()
+    with _versions_lock:
+        _versions[user_id] = (version, now + SESSION_VERSION_CACHE_TTL)
+    return version
+
+
+def _unauthorized(detail: str = "로그인이 필요합니다.") -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+async def optional_session(authorization: Optional[str] = Header(None)) -> Optional[SessionUser]:
+    """
+    FastAPI dependency - Authorization 헤더가 없으면 None, 있는데 유효하지 않으면 401.
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise _unauthorized()
+    claims = decode_token(token.strip())
+    if claims is None:
+        raise _unauthorized("세션이 만료되었습니다. 다시 로그인해주세요.")
+    version = await _current_token_version(claims["uid"])
+    if version is None or version != claims["ver"]:
+        raise _unauthorized("세션이 만료되었습니다. 다시 로그인해주세요.")
+    return SessionUser(id=claims["uid"], email=claims["email"])
+
+
+async def require_session(authorization: Optional[str] = Header(None)) -> SessionUser:
+    """FastAPI dependency - 유효한 세션 토큰이 없으면 401."""
+    session_user = await optional_session(authorization)
+    if session_user is None:
+        raise _unauthorized()
+    return session_user
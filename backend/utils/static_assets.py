@@ -0,0 +1,214 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from utils.compression import brotli, choose_encoding
+from utils.http_cache import is_not_modified
+
+# ==========================
+# 정적 파일 - 미리 압축한 .br/.gz 와 장기 캐시
+# ==========================
+# precompress_directory() 가 frontend/ 의 텍스트 파일마다 file.js.br / file.js.gz 를 최고 압축 수준으로
+# 한 번 만들어 둡니다 (앱 시작 시 또는 배포 때 `python -m utils.static_assets`).
+# CompressedStaticFiles 는 Accept-Encoding 에 맞는 형제 파일을 그대로 보내므로 요청마다 압축하지 않습니다.
+#
+# 캐시: 파일명이 고정인 frontend 자산은 index.html 에서 ?v=<내용 해시> 를 붙여 참조합니다.
+# 현재 해시와 같은 v 로 요청하면 1년 immutable, 그 외에는 no-cache (ETag 재검증) 입니다.
+# uploaded_images 는 파일명이 내용 해시(또는 고유 uuid)라 항상 immutable 입니다.
+STATIC_PRECOMPRESS = os.getenv("STATIC_PRECOMPRESS", "1") == "1"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+PRECOMPRESS_SUFFIXES = {".html", ".css", ".js", ".json", ".svg", ".txt", ".map", ".xml"}
+PRECOMPRESS_MIN_SIZE = 256
+# 형제 파일 확장자
+_SIBLING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+# path -> (mtime_ns, size, version)
+_versions: Dict[str, Tuple[int, int, str]] = {}
+_versions_lock = threading.Lock()
+
+
+def asset_version(path: Path) -> Optional[str]:
+    """파일 내용 해시 앞 12자리 (mtime/크기가 같으면 캐시된 값). 파일이 없으면 None."""
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    key = str(path)
+    with _versions_lock:
+        cached = _versions.get(key)
+    if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2]
+    version = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    with _versions_lock:
+        _versions[key] = (stat_result.st_mtime_ns, stat_result.st_size, version)
+    return version
+
+
+def _write_atomic(path: Path, data: bytes):
+    # 여러 워커가 동시에 시작해도 반쯤 쓴 파일을 내보내지 않도록 임시 파일 -> rename
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def precompress_directory(directory: Path) -> dict:
+    """
+    directory 아래 텍스트 자산의 .gz (및 brotli 가 있으면 .br) 를 만듭니다.
+    형제 파일이 원본보다 새로우면 건너뜁니다. 압축해도 줄지 않는 파일은 만들지 않습니다.
+    """
+    stats = {"files": 0, "written": 0, "bytes": 0, "gzip_bytes": 0, "br_bytes": 0}
+    directory = Path(directory)
+    if not directory.is_dir():
+        return stats
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix not in PRECOMPRESS_SUFFIXES:
+            continue
+        source_stat = path.stat()
+        if source_stat.st_size < PRECOMPRESS_MIN_SIZE:
+            continue
+        stats["files"] += 1
+        stats["bytes"] += source_stat.st_size
+        data = None
+        for encoding, suffix in _SIBLING_SUFFIX.items():
+            if encoding == "br" and brotli is None:
+                continue
+            sibling = path.with_name(path.name + suffix)
+            if sibling.exists() and sibling.stat().st_mtime_ns >= source_stat.st_mtime_ns:
+                stats[f"{encoding}_bytes"] += sibling.stat().st_size
+                continue
+            if data is None:
+                data = path.read_bytes()
+            if encoding == "br":
+                compressed = brotli.compress(data, quality=11)
+            else:
+                # mtime=0 -> 같은 입력이면 같은 출력 (배포마다 ETag 가 바뀌지 않음)
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(compressed) >= len(data):
+                continue
+            _write_atomic(sibling, compressed)
+            stats["written"] += 1
+            stats[f"{encoding}_bytes"] += len(compressed)
+    return stats
+
+
+class CompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles + 미리 압축된 형제 파일 + Cache-Control.
+    immutable=True 이면 모든 파일을 1년 immutable 로 (내용이 바뀌면 파일명도 바뀌는 디렉터리용).
+    """
+
+    def __init__(self, *args, immutable: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable = immutable
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = Path(full_path)
+        compressible = full_path.suffix in PRECOMPRESS_SUFFIXES
+        media_type = mimetypes.guess_type(full_path.name)[0] or "text/plain"
+
+        path, encoding = full_path, None
+        if compressible:
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""), supported=_SIBLING_SUFFIX)
+            if encoding is not None:
+                sibling = full_path.with_name(full_path.name + _SIBLING_SUFFIX[encoding])
+                try:
+                    sibling_stat = sibling.stat()
+                except OSError:
+                    sibling_stat = None
+                # 원본보다 오래된 형제 파일은 쓰지 않습니다 (배포 후 아직 다시 압축하지 않은 경우)
+                if sibling_stat is not None and sibling_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+                    path, stat_result = sibling, sibling_stat
+                else:
+                    encoding = None
+
+        response = FileResponse(path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        if compressible:
+            response.headers.add_vary_header("Accept-Encoding")
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if self.immutable or self._is_current_version(full_path, scope)
+            else REVALIDATE_CACHE_CONTROL
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _is_current_version(full_path: Path, scope) -> bool:
+        requested = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("v")
+        return bool(requested) and requested[0] == asset_version(full_path)
+
+
+# ==========================
+# index.html - 자산 URL 에 버전을 붙여 메모리에 보관
+# ==========================
+_ASSET_REFERENCE = re.compile(r'(?P<attr>src|href)="(?P<path>(?:css|js)/[^"?#]+)"')
+# {"key": (mtime_ns, size), "rendered": {"etag", "identity", "gzip", "br"}}
+_index_cache: dict = {}
+_index_lock = threading.Lock()
+
+
+def _render_index(index_path: Path, static_prefix: str) -> dict:
+    directory = index_path.parent
+
+    def versioned(match: re.Match) -> str:
+        relative = match.group("path")
+        version = asset_version(directory / relative)
+        url = f"{static_prefix}/{relative}" + (f"?v={version}" if version else "")
+        return f'{match.group("attr")}="{url}"'
+
+    html = _ASSET_REFERENCE.sub(versioned, index_path.read_text(encoding="utf-8")).encode("utf-8")
+    rendered = {"etag": f'"{hashlib.sha256(html).hexdigest()[:16]}"', "identity": html, "gzip": gzip.compress(html, 9, mtime=0)}
+    if brotli is not None:
+        rendered["br"] = brotli.compress(html, quality=11)
+    return rendered
+
+
+def index_response(request: Request, index_path: Path, static_prefix: str = "/static") -> Response:
+    """
+    index.html 을 자산 URL 에 ?v=<해시> 를 붙여 보냅니다 (절대 경로라 / 에서도 자산을 찾음).
+    렌더링/압축 결과는 파일이 바뀔 때까지 메모리에 보관합니다.
+    """
+    stat_result = index_path.stat()
+    key = (stat_result.st_mtime_ns, stat_result.st_size)
+    with _index_lock:
+        rendered = _index_cache.get("rendered") if _index_cache.get("key") == key else None
+    if rendered is None:
+        rendered = _render_index(index_path, static_prefix)
+        with _index_lock:
+            _index_cache.update(key=key, rendered=rendered)
+
+    headers = {"ETag": rendered["etag"], "Cache-Control": REVALIDATE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if is_not_modified(request, rendered["etag"], None):
+        return Response(status_code=304, headers=headers)
+    supported = [name for name in ("br", "gzip") if name in rendered]
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), supported=supported)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(rendered[encoding or "identity"], media_type="text/html", headers=headers)
+
+
+if __name__ == "__main__":
+    # 배포 단계에서: cd backend && python -m utils.static_assets [디렉터리 ...]
+    import sys
+
+    directories = sys.argv[1:] or [str(Path(__file__).resolve().parent.parent.parent / "frontend")]
+    for directory in directories:
+        result = precompress_directory(Path(directory))
+        print(f"{directory}: {result}")
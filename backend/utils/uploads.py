@@ -0,0 +1,92 @@
+import hashlib
+import os
+from typing import Optional
+from uuid import uuid4
+
+import anyio
+from fastapi import HTTPException, UploadFile
+
+from utils.blob_store import UPLOAD_DIR, TMP_DIR, blob_path, acquire_blob_async, release_blob_async
+
+# ==========================
+# 이미지 업로드 파이프라인
+# ==========================
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 64 * 1024
+
+# 파일 앞부분(magic bytes) -> 저장할 확장자
+# content_type 이나 파일명은 클라이언트가 마음대로 보낼 수 있으므로 믿지 않습니다.
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+]
+
+
+def detect_image_ext(head: bytes) -> Optional[str]:
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"이미지 파일은 최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB까지 업로드 가능합니다.",
+    )
+
+
+async def save_upload(file: UploadFile) -> Optional[str]:
+    """
+    UploadFile 을 CHUNK_SIZE 단위로 읽어 디스크에 비동기로 기록하고 저장된 파일명을 반환합니다.
+    - 크기를 알 수 있으면 읽기 전에, 아니면 스트리밍 도중 MAX_UPLOAD_BYTES 를 넘는 순간 413
+    - 첫 청크의 magic bytes 로 이미지 형식을 판별 (아니면 400)
+    - 스트리밍하면서 sha256 을 계산해 blob 저장소(ab/cd/<sha256>.<ext>)에 넣고 참조를 하나 잡습니다.
+      반환된 파일명이 더 이상 쓰이지 않으면 discard_upload / release_blob 으로 참조를 놓아야 합니다.
+    """
+    if not file or not file.filename:
+        return None
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+    head = await file.read(CHUNK_SIZE)
+    if not head:
+        return None
+    ext = detect_image_ext(head)
+    if not ext:
+        raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
+
+    await anyio.Path(TMP_DIR).mkdir(exist_ok=True)
+    partial = TMP_DIR / f"{uuid4().hex}.part"
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        async with await anyio.open_file(partial, "wb") as out:
+            chunk = head
+            while chunk:
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+                chunk = await file.read(CHUNK_SIZE)
+
+        sha256 = digest.hexdigest()
+        filename = blob_path(sha256, ext)
+        dest = UPLOAD_DIR / filename
+        # 참조를 먼저 잡고 파일을 옮겨야 GC 가 새 업로드를 지우지 않습니다.
+        await acquire_blob_async(sha256, filename, written)
+        await anyio.Path(dest.parent).mkdir(parents=True, exist_ok=True)
+        # 같은 내용이 이미 있어도 덮어쓰기(원자적 rename) - 내용이 같으므로 무해합니다.
+        await anyio.Path(partial).replace(dest)
+    except BaseException:
+        await anyio.Path(partial).unlink(missing_ok=True)
+        raise
+    return filename
+
+
+async def discard_upload(filename: Optional[str]):
+    """저장은 됐지만 이후 검증에 실패한 업로드의 참조를 놓습니다 (파일은 GC 가 정리)."""
+    await release_blob_async(filename)
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import threading
+from typing import Dict, Optional
+
+from Controllers.makepost_controller import add_views_in_db
+from utils import post_cache
+
+# ==========================
+# 조회수 write-behind 버퍼
+# ==========================
+# 상세 페이지 조회마다 UPDATE 를 날리면 SQLite 쓰기 락에서 줄을 서게 됩니다.
+# 증가분을 post_id 별로 메모리에 모았다가 한 트랜잭션으로 반영합니다.
+#
+# 유실 한도: 프로세스가 비정상 종료되면 아직 반영되지 않은 증가분만 사라집니다.
+# 즉 최대 VIEW_FLUSH_THRESHOLD 건, 또는 VIEW_FLUSH_INTERVAL 초 동안의 조회수입니다.
+# 정상 종료 시에는 lifespan 에서 stop_view_flusher() 가 남은 값을 모두 반영합니다.
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))
+VIEW_FLUSH_THRESHOLD = int(os.getenv("VIEW_FLUSH_THRESHOLD", "1000"))
+
+_pending: Dict[int, int] = {}
+_pending_total = 0
+# flush 중인 배치 - DB 에 커밋되고 캐시가 무효화될 때까지 조회수에 계속 더합니다 (flush 도중 조회수가 줄어 보이지 않도록)
+_inflight: Dict[int, int] = {}
+_lock = threading.Lock()
+# flush 는 한 번에 하나 (타이머와 임계치 flush 가 겹쳐도 _inflight 는 배치 하나)
+_flush_lock = threading.Lock()
+_flusher_task: Optional[asyncio.Task] = None
+
+
+def record_view(post_id: int) -> int:
+    """
+    조회 1건을 버퍼에 기록하고, 이 게시글의 아직 반영되지 않은 증가분(flush 중인 배치 포함)을 반환합니다.
+    버퍼가 임계치를 넘으면 호출한 스레드에서 바로 flush 합니다.
+    """
+    global _pending_total
+    with _lock:
+        delta = _pending.get(post_id, 0) + 1
+        _pending[post_id] = delta
+        _pending_total += 1
+        should_flush = _pending_total >= VIEW_FLUSH_THRESHOLD
+        unflushed = delta + _inflight.get(post_id, 0)
+    if should_flush:
+        flush_views()
+    return unflushed
+
+
+def pending_views(post_id: int) -> int:
+    with _lock:
+        return _pending.get(post_id, 0) + _inflight.get(post_id, 0)
+
+
+def flush_views() -> int:
+    """
+    버퍼의 증가분을 DB 에 일괄 반영하고 반영한 조회수 합계를 반환합니다.
+    DB 오류 시 증가분을 버퍼로 되돌려 다음 flush 에서 다시 시도합니다.
+    순서: 버퍼 -> _inflight (계속 더해짐) -> DB 커밋 -> 캐시 무효화와 함께 _inflight 비움.
+    캐시에 증가분을 더하지 않고 무효화하므로, 커밋 직후 DB 에서 읽은 payload 에 같은 배치를 두 번 더하지 않습니다.
+    """
+    global _pending, _pending_total, _inflight
+    with _flush_lock:
+        with _lock:
+            if not _pending:
+                return 0
+            batch, total = _pending, _pending_total
+            _pending, _pending_total = {}, 0
+            _inflight = batch
+
+        try:
+            add_views_in_db(batch)
+        except Exception:
+            import traceback
+            print(f"Error flushing view counts: {traceback.format_exc()}")
+            with _lock:
+                for post_id, delta in batch.items():
+                    _pending[post_id] = _pending.get(post_id, 0) + delta
+                _pending_total += total
+                _inflight = {}
+            return 0
+        with _lock:
+            # 캐시된 상세 payload 는 flush 전 DB 조회수라 무효화합니다 - 읽는 중이던 load 도 put 이 거절됩니다
+            for post_id in batch:
+                post_cache.invalidate(post_id)
+            _inflight = {}
+    return total
+
+
+async def _flush_loop():
+    while True:
+        await asyncio.sleep(VIEW_FLUSH_INTERVAL)
+        await asyncio.to_thread(flush_views)
+
+
+def start_view_flusher():
+    global _flusher_task
+    if _flusher_task is None:
+        _flusher_task = asyncio.create_task(_flush_loop())
+
+
+async def stop_view_flusher():
+    """타이머를 멈추고 남은 증가분을 모두 반영합니다."""
+    global _flusher_task
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        try:
+            await _flusher_task
+        except asyncio.CancelledError:
+            pass
+        _flusher_task = None
+    await asyncio.to_thread(flush_views)
@@ -5,10 +5,13 @@ const API = {
     // Generic request method
     async request(endpoint, options = {}) {
         const url = `${this.baseURL}${endpoint}`;
+        // Session token from /auth/login (checked server-side with an HMAC, no password re-check)
+        const token = Auth.getToken();
         const config = {
             ...options,
             headers: {
                 'Accept': 'application/json',
+                ...(token ? { 'Authorization': `Bearer ${token}` } : {}),
                 ...options.headers
             }
         };
@@ -106,14 +109,28 @@ const API = {
     },
 
     // Post endpoints
-    async getPosts(skip = 0, limit = 10) {
-        return this.get(`/posts/?skip=${skip}&limit=${limit}`);
+    async getPosts(cursor = null, limit = 20) {
+        // Keyset pagination: pass the previous page's next_cursor to continue
+        const params = new URLSearchParams({ limit });
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+        return this.get(`/posts/?${params.toString()}`);
     },
 
     async getPost(postId) {
         return this.get(`/posts/${postId}`);
     },
 
+    async getComments(postId, cursor = null, limit = 20) {
+        // The post detail includes the first page; pass its comments_next_cursor to continue
+        const params = new URLSearchParams({ limit });
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+        return this.get(`/posts/${postId}/comments?${params.toString()}`);
+    },
+
     async createPost(title, content, imageFile = null) {
         const formData = new FormData();
         formData.append('title', title);
@@ -135,9 +152,23 @@ const API = {
         return this.delete(`/posts/${postId}`);
     },
 
-    async toggleLike(postId) {
-        // POST request without body
-        return this.request(`/posts/${postId}/like`, { method: 'POST' });
+    // Live feed (Server-Sent Events). EventSource reconnects by itself and resumes with Last-Event-ID
+    openPostStream() {
+        return new EventSource(`${this.baseURL}/posts/stream`);
+    },
+
+    // Likes need a login and are idempotent: repeating a PUT or DELETE does not change the count
+    async likePost(postId) {
+        return this.request(`/posts/${postId}/like`, { method: 'PUT' });
+    },
+
+    async unlikePost(postId) {
+        return this.request(`/posts/${postId}/like`, { method: 'DELETE' });
+    },
+
+    // Which of these posts the current user liked (one request per feed page)
+    async getLikedPosts(postIds) {
+        return this.get(`/posts/liked?ids=${postIds.join(',')}`);
     },
 
     async addComment(postId, content) {
@@ -5,6 +5,7 @@ document.addEventListener('DOMContentLoaded', () => {
     Navigation.init();
     setupEventListeners();
     updateNavigationVisibility();
+    startPostStream();
 });
 
 // Setup all event listeners
@@ -51,7 +52,7 @@ async function handleLogin(e) {
         const result = await API.login(email, password);
         // Store user info - result contains user object
         if (result && result.user) {
-            Auth.setCurrentUser(result.user);
+            Auth.setCurrentUser({ ...result.user, token: result.token });
             showAlert(alertDiv, result.message || 'Login successful!', 'success');
             updateNavigationVisibility();
             setTimeout(() => {
@@ -112,18 +113,26 @@ function handleLogout() {
     Navigation.redirectTo('login');
 }
 
+// Cursor for the next feed page (null when there are no more posts)
+let postsNextCursor = null;
+
 // Load posts
-async function loadPosts() {
+async function loadPosts(append = false) {
     const container = document.getElementById('posts-container');
+    if (!append) {
+        newPostsCount = 0;
+    }
     try {
         // Try the makepost router endpoint first (DB posts)
-        const posts = await API.get('/posts/');
-        if (!posts || posts.length === 0) {
+        const page = await API.getPosts(append ? postsNextCursor : null);
+        const posts = (page && page.items) || [];
+        postsNextCursor = (page && page.next_cursor) || null;
+        if (!append && posts.length === 0) {
             container.innerHTML = '<div class="empty-state"><h3>No posts yet</h3><p>Be the first to create a post!</p></div>';
             return;
         }
         
-        container.innerHTML = posts.map(post => {
+        const postsHtml = posts.map(post => {
             const content = post.content || '';
             const imageUrl = post.image_filename || post.image_url || null;
             return `
@@ -132,8 +141,9 @@ async function loadPosts() {
                         <h3>${escapeHtml(post.title || 'Untitled')}</h3>
                         <div class="post-meta">
                             <span>Created: ${formatDate(post.created_at)}</span>
+                            <span>Likes: <span class="feed-like" id="feed-like-${post.id}">${post.likes || 0}</span></span>
                         </div>
-                        ${imageUrl ? `<img src="http://localhost:8000/uploaded_images/${imageUrl}" class="post-image" alt="Post image">` : ''}
+                        ${imageUrl ? `<img src="${imageSrc(imageUrl, post.image_variants, 'thumb')}" class="post-image" alt="Post image" loading="lazy">` : ''}
                         <p style="margin-top: 1rem; color: #666;">${escapeHtml(content.substring(0, 150))}${content.length > 150 ? '...' : ''}</p>
                     </div>
                     <div class="post-actions" style="margin-top: 0.5rem; display: flex; gap: 0.5rem;">
@@ -142,11 +152,24 @@ async function loadPosts() {
                 </div>
             `;
         }).join('');
+        const loadMoreHtml = postsNextCursor
+            ? '<button id="posts-load-more" class="btn btn-secondary" onclick="loadPosts(true)">Load more</button>'
+            : '';
+        if (append) {
+            const loadMoreBtn = document.getElementById('posts-load-more');
+            if (loadMoreBtn) {
+                loadMoreBtn.remove();
+            }
+            container.insertAdjacentHTML('beforeend', postsHtml + loadMoreHtml);
+        } else {
+            container.innerHTML = postsHtml + loadMoreHtml;
+        }
+        markLikedPosts(posts.map(post => post.id));
     } catch (error) {
         console.error('Error loading posts from makepost router:', error);
         // Fallback to posts_router endpoint
         try {
-            const posts = await API.getPosts();
+            const posts = await API.get('/posts/');
             if (!posts || posts.length === 0) {
                 container.innerHTML = '<div class="empty-state"><h3>No posts yet</h3><p>Be the first to create a post!</p></div>';
                 return;
@@ -185,13 +208,13 @@ async function viewPost(postId) {
             <h1>${escapeHtml(post.title)}</h1>
             <div class="post-stats">
                 <span>Views: ${post.views || 0}</span>
-                <span>Likes: ${post.likes || 0}</span>
+                <span>Likes: <span class="like-count">${post.likes || 0}</span></span>
             </div>
-            ${imageUrl ? `<img src="http://localhost:8000/uploaded_images/${imageUrl}" class="post-image" alt="Post image">` : ''}
+            ${imageUrl ? `<img src="${imageSrc(imageUrl, post.image_variants, 'detail')}" class="post-image" alt="Post image">` : ''}
             <div class="post-content">${escapeHtml(post.content || '')}</div>
             <div class="post-actions">
-                <button class="like-btn ${post.liked ? 'liked' : ''}" onclick="toggleLike(${post.id})">
-                    ${post.liked ? '❤️ Liked' : '🤍 Like'} (${post.likes || 0})
+                <button class="like-btn ${post.liked ? 'liked' : ''}" onclick="toggleLike(${post.id}, ${post.liked ? 'true' : 'false'})">
+                    ${post.liked ? '❤️ Liked' : '🤍 Like'} (<span class="like-count">${post.likes || 0}</span>)
                 </button>
                 <button class="btn btn-secondary" onclick="Navigation.redirectTo('posts')">Back to Posts</button>
             </div>
@@ -202,18 +225,9 @@ async function viewPost(postId) {
                     <button type="submit" class="btn btn-primary" style="margin-top: 0.5rem;">Add Comment</button>
                 </form>
                 <div class="comments-list" id="comments-${post.id}">
-                    ${post.comments && post.comments.length > 0 ? post.comments.map(comment => `
-                        <div class="comment">
-                            <div class="comment-header">
-                                <span>${formatDate(comment.created_at)}</span>
-                                <div class="comment-actions">
-                                    <button onclick="editComment(${comment.id}, '${escapeHtml(comment.content)}')">Edit</button>
-                                    <button onclick="deleteComment(${comment.id}, ${post.id})">Delete</button>
-                                </div>
-                            </div>
-                            <div class="comment-content" id="comment-content-${comment.id}">${escapeHtml(comment.content)}</div>
-                        </div>
-                    `).join('') : '<p>No comments yet</p>'}
+                    ${post.comments && post.comments.length > 0
+                        ? post.comments.map(comment => renderComment(comment, post.id)).join('') + loadMoreCommentsButton(post.id, post.comments_next_cursor)
+                        : '<p>No comments yet</p>'}
                 </div>
             </div>
         `;
@@ -222,10 +236,126 @@ async function viewPost(postId) {
     }
 }
 
+function renderComment(comment, postId) {
+    return `
+        <div class="comment">
+            <div class="comment-header">
+                <span>${formatDate(comment.created_at)}</span>
+                <div class="comment-actions">
+                    <button onclick="editComment(${comment.id}, '${escapeHtml(comment.content)}')">Edit</button>
+                    <button onclick="deleteComment(${comment.id}, ${postId})">Delete</button>
+                </div>
+            </div>
+            <div class="comment-content" id="comment-content-${comment.id}">${escapeHtml(comment.content)}</div>
+        </div>
+    `;
+}
+
+function loadMoreCommentsButton(postId, cursor) {
+    return cursor
+        ? `<button id="comments-load-more" class="btn btn-secondary" onclick="loadMoreComments(${postId}, '${cursor}')">Load more comments</button>`
+        : '';
+}
+
+// Next page of comments (keyset cursor from the previous page)
+async function loadMoreComments(postId, cursor) {
+    const list = document.getElementById(`comments-${postId}`);
+    try {
+        const page = await API.getComments(postId, cursor);
+        const loadMoreBtn = document.getElementById('comments-load-more');
+        if (loadMoreBtn) {
+            loadMoreBtn.remove();
+        }
+        list.insertAdjacentHTML('beforeend',
+            page.items.map(comment => renderComment(comment, postId)).join('') + loadMoreCommentsButton(postId, page.next_cursor));
+    } catch (error) {
+        alert('Failed to load comments: ' + error.message);
+    }
+}
+
+// Live updates from /posts/stream instead of polling /posts/
+let postStream = null;
+let newPostsCount = 0;
+
+function currentPostId() {
+    return Navigation.currentPage === 'post' ? parseInt(sessionStorage.getItem('currentPostId')) : null;
+}
+
+function startPostStream() {
+    if (postStream || !window.EventSource) {
+        return;
+    }
+    postStream = API.openPostStream();
+
+    postStream.addEventListener('post', () => {
+        if (Navigation.currentPage !== 'posts') {
+            return;
+        }
+        newPostsCount += 1;
+        const container = document.getElementById('posts-container');
+        let banner = document.getElementById('posts-new-banner');
+        if (!banner) {
+            container.insertAdjacentHTML('afterbegin',
+                '<button id="posts-new-banner" class="btn btn-primary" onclick="loadPosts()"></button>');
+            banner = document.getElementById('posts-new-banner');
+        }
+        banner.textContent = `Show ${newPostsCount} new post${newPostsCount > 1 ? 's' : ''}`;
+    });
+
+    postStream.addEventListener('like', (e) => {
+        const data = JSON.parse(e.data);
+        if (data.post_id === currentPostId()) {
+            document.querySelectorAll('#post-detail .like-count').forEach(el => {
+                el.textContent = data.likes;
+            });
+        }
+    });
+
+    postStream.addEventListener('comment', (e) => {
+        const data = JSON.parse(e.data);
+        if (data.post_id === currentPostId()) {
+            viewPost(data.post_id);
+        }
+    });
+
+    // Missed events could not be replayed (server restarted or client was away too long)
+    postStream.addEventListener('reset', () => {
+        if (Navigation.currentPage === 'posts') {
+            loadPosts();
+        }
+    });
+}
+
+// Mark the feed posts the logged-in user has liked (the shared feed response has no per-user state)
+async function markLikedPosts(postIds) {
+    if (!Auth.getToken() || postIds.length === 0) {
+        return;
+    }
+    try {
+        const result = await API.getLikedPosts(postIds);
+        result.liked.forEach(postId => {
+            const el = document.getElementById(`feed-like-${postId}`);
+            if (el) {
+                el.classList.add('liked');
+            }
+        });
+    } catch (error) {
+        console.error('Error loading liked posts:', error);
+    }
+}
+
 // Toggle like
-async function toggleLike(postId) {
+async function toggleLike(postId, liked) {
     try {
-        const result = await API.toggleLike(postId);
+        if (!Auth.getToken()) {
+            alert('Please login first');
+            return;
+        }
+        if (liked) {
+            await API.unlikePost(postId);
+        } else {
+            await API.likePost(postId);
+        }
         // Reload post to update UI
         viewPost(postId);
     } catch (error) {
@@ -475,7 +605,7 @@ async function handleEditProfile(e) {
         const result = await API.updateProfile(formData);
         if (result && result.success) {
             // Update stored user data
-            Auth.setCurrentUser({ ...user, nickname: nickname, ...(result.data || {}) });
+            Auth.setCurrentUser({ ...user, nickname: nickname, ...(result.data || {}), ...(result.token ? { token: result.token } : {}) });
             showAlert(alertDiv, result.message || 'Profile updated successfully!', 'success');
             updateNavigationVisibility();
         } else {
@@ -518,6 +648,10 @@ async function handleEditPassword(e) {
         console.log('Calling API.changePassword with email:', email);
         const result = await API.changePassword(email.trim(), password, passwordConfirm);
         if (result.success) {
+            // Old session tokens are revoked by the password change - keep the new one
+            if (result.token) {
+                Auth.setCurrentUser({ ...user, token: result.token });
+            }
             showAlert(alertDiv, result.message || 'Password changed successfully!', 'success');
             setTimeout(() => {
                 Navigation.redirectTo('editprofile');
@@ -613,6 +747,14 @@ function formatDate(dateString) {
     return date.toLocaleDateString() + ' ' + date.toLocaleTimeString();
 }
 
+// Prefer a resized variant (thumb/detail/avatar) once the server has generated it
+function imageSrc(filename, variants, variantName) {
+    if (variants && variants[variantName]) {
+        return `${API.baseURL}${variants[variantName]}`;
+    }
+    return `${API.baseURL}/uploaded_images/${filename}`;
+}
+
 // Override Navigation.showPage to load data when needed
 const originalShowPage = Navigation.showPage;
 Navigation.showPage = function(page) {
@@ -638,7 +780,7 @@ function loadProfile() {
         document.getElementById('editprofile-nickname').value = user.nickname || '';
         if (user.profile_image) {
             const img = document.getElementById('profile-image-preview');
-            img.src = `http://localhost:8000/uploaded_images/${user.profile_image}`;
+            img.src = imageSrc(user.profile_image, user.profile_image_variants, 'avatar');
             img.style.display = 'block';
         }
     }